@@ -0,0 +1,254 @@
+"""Admission control for the read API: per-client rate limits and a DB concurrency gate.
+
+Every GET under /api/ that reaches the handlers (response-cache hits never
+get here) is priced by cost(): 1 for a plain page, more for a `q` search (most
+for LIKE), a deep offset, a large limit, the exact total GET /api/news
+computes on first pages unless include_total=false, history scans and
+exports.
+
+Rate limit (off unless NEWS_RATE_LIMIT > 0): each client has a token bucket
+refilled at NEWS_RATE_LIMIT tokens/s up to NEWS_RATE_BURST. A request costing
+more than is left gets 429 with Retry-After. A client is its X-API-Key when
+that is a known key (the ingest key or one of NEWS_RATE_API_KEYS), else its
+IP; unknown keys are ignored so made-up ones can't mint fresh buckets.
+Behind a reverse proxy set NEWS_TRUST_PROXY=1 so the first X-Forwarded-For
+hop is used, otherwise every visitor shares the proxy's bucket. Buckets are
+per process, so with N workers a client gets up to N times the rate.
+
+Concurrency gate: at most NEWS_DB_CONCURRENCY admitted requests run at
+once per process (default 24, below the 30 connections of
+database.engine so ingest and background writers still get one), and at
+most NEWS_DB_HEAVY_CONCURRENCY of them may cost HEAVY_COST or more, so
+searches can't take every slot from plain listings. Up to NEWS_DB_QUEUE
+requests wait, each for NEWS_DB_QUEUE_TIMEOUT seconds; beyond that they
+get 503 right away instead of queueing on the pool. /healthz, /metrics
+and the live-push streams are never gated.
+"""
+import asyncio
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .schemas import EnvelopeError, MetaError
+
+RATE_LIMIT = float(os.getenv("NEWS_RATE_LIMIT", "0"))
+RATE_BURST = float(os.getenv("NEWS_RATE_BURST", "60"))
+RATE_CLIENTS = int(os.getenv("NEWS_RATE_CLIENTS", "10000"))
+# Keys of API consumers that get a bucket of their own, comma-separated
+RATE_API_KEYS = frozenset(
+    k.strip() for k in [os.getenv("NEWS_INGEST_API_KEY", "")] + os.getenv("NEWS_RATE_API_KEYS", "").split(",")
+    if k.strip()
+)
+TRUST_PROXY = os.getenv("NEWS_TRUST_PROXY", "0") == "1"
+DB_CONCURRENCY = int(os.getenv("NEWS_DB_CONCURRENCY", "24"))
+DB_HEAVY_CONCURRENCY = int(os.getenv("NEWS_DB_HEAVY_CONCURRENCY", str(max(1, DB_CONCURRENCY // 3))))
+DB_QUEUE = int(os.getenv("NEWS_DB_QUEUE", "64"))
+DB_QUEUE_TIMEOUT = float(os.getenv("NEWS_DB_QUEUE_TIMEOUT", "2"))
+
+# Cost model
+SEARCH_COST = 4        # `q`: full-text match and ranking instead of an index range
+LIKE_COST = 8          # `q` with search_mode=like: a substring scan of every row in range
+DEEP_OFFSET = 1000     # +1 per this many skipped rows, capped at MAX_OFFSET_COST
+MAX_OFFSET_COST = 10
+LARGE_LIMIT = 100      # +1 per this many rows asked for
+TOTAL_COST = 1         # an exact count next to the page (include_total, on by default on first pages)
+HISTORY_COST = 2       # history: scans the archived partitions too
+EXPORT_COST = 10
+HEAVY_COST = 5
+
+GATED_PATHS = ("/api/",)
+UNGATED_PATHS = ("/api/news/stream",)
+ERROR_HELP_BASE = "https://injast.life/help/errors/"
+
+
+def _int_param(request: Request, name: str) -> int:
+    try:
+        return max(0, int(request.query_params.get(name, 0)))
+    except ValueError:
+        # Left for request validation to reject
+        return 0
+
+
+def _flag(request: Request, name: str) -> bool:
+    return request.query_params.get(name, "").lower() in ("1", "true", "yes", "on")
+
+
+def _counts_total(request: Request) -> bool:
+    # Mirrors NewsListQuery: an explicit include_total wins, otherwise first pages count
+    include_total = request.query_params.get("include_total")
+    if include_total is not None and include_total != "":
+        return _flag(request, "include_total")
+    return not (request.query_params.get("cursor") or _int_param(request, "offset"))
+
+
+def cost(request: Request) -> int:
+    """Tokens a read request spends; roughly its DB work relative to a plain first page."""
+    path = request.url.path
+    if path.startswith("/api/news/export"):
+        return EXPORT_COST
+    n = 1
+    if request.query_params.get("q"):
+        n += LIKE_COST if request.query_params.get("search_mode") == "like" else SEARCH_COST
+    n += min(_int_param(request, "offset") // DEEP_OFFSET, MAX_OFFSET_COST)
+    n += _int_param(request, "limit") // LARGE_LIMIT
+    if path == "/api/news" and _counts_total(request):
+        n += TOTAL_COST
+    if _flag(request, "history"):
+        n += HISTORY_COST
+    return n
+
+
+def client_key(request: Request) -> str:
+    api_key = request.headers.get("x-api-key")
+    if api_key and api_key in RATE_API_KEYS:
+        return "key:" + api_key
+    if TRUST_PROXY:
+        forwarded = request.headers.get("x-forwarded-for", "").split(",")[0].strip()
+        if forwarded:
+            return "ip:" + forwarded
+    return "ip:" + (request.client.host if request.client else "unknown")
+
+
+class RateLimiter:
+    """Token buckets per client key, LRU-bounded to max_clients (a forgotten client starts full)."""
+
+    def __init__(self, rate: float = RATE_LIMIT, burst: float = RATE_BURST, max_clients: int = RATE_CLIENTS):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._lock = threading.Lock()
+        self._buckets: "OrderedDict[str, tuple[float, float]]" = OrderedDict()
+
+    def take(self, key: str, tokens: float) -> float:
+        """0 if admitted (tokens spent), else seconds until the bucket holds enough."""
+        # A request dearer than the burst would otherwise never pass
+        tokens = min(tokens, self.burst)
+        now = time.monotonic()
+        with self._lock:
+            level, last = self._buckets.get(key, (self.burst, now))
+            level = min(self.burst, level + (now - last) * self.rate)
+            if level >= tokens:
+                level -= tokens
+                wait = 0.0
+            else:
+                wait = (tokens - level) / self.rate
+            self._buckets[key] = (level, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        return wait
+
+
+class Gate:
+    """At most `limit` holders; up to `queue` more wait, each for at most `timeout` seconds."""
+
+    def __init__(self, limit: int, queue: int = DB_QUEUE, timeout: float = DB_QUEUE_TIMEOUT):
+        self.limit = limit
+        self.queue = queue
+        self.timeout = timeout
+        self.active = 0
+        self.waiting = 0
+        self._sem = asyncio.Semaphore(limit)
+
+    async def acquire(self) -> Optional[str]:
+        """None once a slot is held, else why not: "queue_full" or "timeout"."""
+        if not self._sem.locked():
+            await self._sem.acquire()
+        elif self.waiting >= self.queue:
+            return "queue_full"
+        else:
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._sem.acquire(), self.timeout)
+            except asyncio.TimeoutError:
+                return "timeout"
+            finally:
+                self.waiting -= 1
+        self.active += 1
+        return None
+
+    def release(self) -> None:
+        self.active -= 1
+        self._sem.release()
+
+
+limiter: Optional[RateLimiter] = RateLimiter() if RATE_LIMIT > 0 else None
+db_gate: Optional[Gate] = Gate(DB_CONCURRENCY) if DB_CONCURRENCY > 0 else None
+heavy_gate: Optional[Gate] = Gate(DB_HEAVY_CONCURRENCY) if DB_CONCURRENCY > 0 else None
+
+# reason -> requests turned away
+rejected = {"rate": 0, "queue_full": 0, "timeout": 0}
+
+
+def _error(status_code: int, code: str, message: str, retry_after: float) -> JSONResponse:
+    env = EnvelopeError(
+        meta=MetaError(success=False, error_code=code, error_help=f"{ERROR_HELP_BASE}{code}", error_fields=[]),
+        message=message,
+    )
+    return JSONResponse(
+        status_code=status_code,
+        content=env.model_dump(),
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+def _overloaded(reason: str) -> JSONResponse:
+    rejected[reason] += 1
+    return _error(503, "ServiceUnavailable", "Server busy; retry shortly", DB_QUEUE_TIMEOUT)
+
+
+class AdmissionMiddleware:
+    """Pure ASGI, so the gate slot is held until a streamed body (export) has been sent."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        path = scope.get("path", "")
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or not path.startswith(GATED_PATHS)
+            or path.startswith(UNGATED_PATHS)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        price = cost(request)
+        if limiter is not None:
+            wait = limiter.take(client_key(request), price)
+            if wait > 0:
+                rejected["rate"] += 1
+                await _error(429, "TooManyRequests", "Rate limit exceeded; slow down", wait)(scope, receive, send)
+                return
+        if db_gate is None:
+            await self.app(scope, receive, send)
+            return
+
+        heavy = price >= HEAVY_COST
+        # Heavy slot first, so a search waiting for one doesn't sit on a general slot
+        if heavy:
+            reason = await heavy_gate.acquire()
+            if reason is not None:
+                await _overloaded(reason)(scope, receive, send)
+                return
+        try:
+            reason = await db_gate.acquire()
+            if reason is not None:
+                await _overloaded(reason)(scope, receive, send)
+                return
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                db_gate.release()
+        finally:
+            if heavy:
+                heavy_gate.release()
@@ -0,0 +1,196 @@
+"""Response cache for the hot read endpoints.
+
+Successful GET responses (listings and single items) are stored by (URL,
+normalized query params) with a strong ETag, so repeat hits skip Postgres and
+Pydantic entirely and browsers revalidating with If-None-Match get a 304. Ingest bumps a generation number;
+entries stamped with an older generation are treated as misses.
+
+Backends:
+  memory  per-process LRU with TTL (default)
+  redis   shared across uvicorn workers; needs the `redis` package and
+          NEWS_CACHE_URL, e.g. redis://localhost:6379/0
+  off     disabled
+"""
+import hashlib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import urlencode
+
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+from . import replicas
+from .serialize import if_none_match_tags, uncoded_etag
+
+CACHE_BACKEND = os.getenv("NEWS_CACHE_BACKEND", "memory")
+CACHE_URL = os.getenv("NEWS_CACHE_URL", "")
+CACHE_TTL = int(os.getenv("NEWS_CACHE_TTL", "30"))
+CACHE_SIZE = int(os.getenv("NEWS_CACHE_SIZE", "512"))
+
+CACHEABLE_PATHS = re.compile(r"^/api/(news|home|categories|agencies|stats|news/[0-9a-fA-F-]{36})$")
+
+
+@dataclass
+class CachedResponse:
+    generation: int
+    etag: str
+    media_type: str
+    body: bytes
+
+
+class MemoryBackend:
+    blocking = False
+
+    def __init__(self, ttl: int = CACHE_TTL, max_entries: int = CACHE_SIZE):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple[float, CachedResponse]]" = OrderedDict()
+
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            hit = self._entries.get(key)
+            if not hit:
+                return None
+            expires, entry = hit
+            if expires < time.monotonic() or entry.generation != self._generation:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CachedResponse) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, entry)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+
+class RedisBackend:
+    blocking = True
+    GEN_KEY = "news:respcache:gen"
+
+    def __init__(self, url: str, ttl: int = CACHE_TTL, prefix: str = "news:respcache:"):
+        import redis  # optional dependency, only needed for the shared backend
+
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def generation(self) -> int:
+        return int(self.client.get(self.GEN_KEY) or 0)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        # One round-trip for both the live generation and the entry
+        gen, raw = self.client.mget(self.GEN_KEY, self.prefix + key)
+        if raw is None:
+            return None
+        header, body = raw.split(b"\n\n", 1)
+        entry_gen, etag, media_type = header.decode().split("\n")
+        if int(entry_gen) != int(gen or 0):
+            return None
+        return CachedResponse(int(entry_gen), etag, media_type, body)
+
+    def set(self, key: str, entry: CachedResponse) -> None:
+        header = f"{entry.generation}\n{entry.etag}\n{entry.media_type}".encode()
+        self.client.setex(self.prefix + key, self.ttl, header + b"\n\n" + entry.body)
+
+    def invalidate(self) -> None:
+        self.client.incr(self.GEN_KEY)
+
+
+def make_backend(kind: str = CACHE_BACKEND):
+    if kind == "off":
+        return None
+    if kind == "redis":
+        return RedisBackend(CACHE_URL)
+    return MemoryBackend()
+
+
+response_cache = make_backend()
+
+
+def invalidate() -> None:
+    """Call after an ingest commit so cached listings are not served stale."""
+    if response_cache is not None:
+        response_cache.invalidate()
+
+
+def cache_key(request: Request) -> str:
+    params = sorted((k, v) for k, v in request.query_params.multi_items() if v != "")
+    base = str(request.url).split("?")[0]
+    return f"{base}?{urlencode(params)}"
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    # Weak comparison; also accept the -gzip/-br variants CompressionMiddleware hands out
+    tags = {uncoded_etag(t) for t in if_none_match_tags(if_none_match)}
+    return "*" in tags or etag in tags
+
+
+class ResponseCacheMiddleware(BaseHTTPMiddleware):
+    def __init__(self, app, paths: "re.Pattern[str]" = CACHEABLE_PATHS):
+        super().__init__(app)
+        self.paths = paths
+
+    async def _call(self, fn, *args):
+        if response_cache.blocking:
+            return await run_in_threadpool(fn, *args)
+        return fn(*args)
+
+    async def dispatch(self, request: Request, call_next):
+        if response_cache is None or request.method != "GET" or not self.paths.match(request.url.path):
+            return await call_next(request)
+        # Read-your-writes clients read the primary; an entry may have been filled from a lagging replica
+        if replicas.is_sticky(request):
+            return await call_next(request)
+
+        key = cache_key(request)
+        inm = request.headers.get("if-none-match")
+        entry = await self._call(response_cache.get, key)
+        if entry is not None:
+            headers = {"ETag": entry.etag, "Cache-Control": "no-cache", "X-Cache": "HIT"}
+            if etag_matches(inm, entry.etag):
+                return Response(status_code=304, headers=headers)
+            return Response(content=entry.body, media_type=entry.media_type, headers=headers)
+
+        # Read the generation before running the handler so an ingest that
+        # lands mid-request leaves this entry already stale
+        generation = await self._call(response_cache.generation)
+        response = await call_next(request)
+        if response.status_code != 200:
+            return response
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        etag = make_etag(body)
+        media_type = response.media_type or response.headers.get("content-type", "application/json")
+        await self._call(response_cache.set, key, CachedResponse(generation, etag, media_type, body))
+
+        headers = {k: v for k, v in response.headers.items() if k.lower() != "content-length"}
+        headers.update({"ETag": etag, "Cache-Control": "no-cache", "X-Cache": "MISS"})
+        if etag_matches(inm, etag):
+            return Response(status_code=304, headers={k: headers[k] for k in ("ETag", "Cache-Control", "X-Cache")})
+        return Response(content=body, status_code=200, headers=headers, media_type=media_type)
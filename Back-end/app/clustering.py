@@ -0,0 +1,222 @@
+"""Near-duplicate story clustering.
+
+The same story syndicated by several agencies arrives with slightly
+different headlines, so exact dedup (crud.find_duplicate_news) keeps all of
+them. Every created row gets a MinHash signature of the word bigrams of its
+normalized title and lead, and rows whose estimated Jaccard similarity is at
+least MIN_SIMILARITY share a `cluster_id` (the id of the cluster's first row).
+
+Candidates come from an LSH index, never a pairwise scan: the signature is
+cut into LSH_BANDS bands of LSH_ROWS values, each band hashed to a bucket,
+and (band, bucket) pairs are stored in `news_lsh`. Two rows become
+candidates when any band matches, which for 16 x 4 happens with high
+probability above ~0.5 similarity; candidates are then checked against the
+full signature.
+
+crud.create_news / create_news_bulk maintain the index as they insert; the
+whole thing can be rebuilt from the news table:
+
+    python -m app.clustering rebuild
+"""
+import argparse
+import hashlib
+import os
+import random
+import re
+import struct
+import uuid
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from . import models
+from .search import normalize
+
+LSH_BANDS = 16
+LSH_ROWS = 4
+NUM_PERM = LSH_BANDS * LSH_ROWS
+MIN_SIMILARITY = float(os.getenv("NEWS_CLUSTER_MIN_SIMILARITY", "0.5"))
+# Only stories published this close together are considered the same story
+CLUSTER_WINDOW = int(os.getenv("NEWS_CLUSTER_WINDOW", str(3 * 86400)))
+LEAD_CHARS = 600
+
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+# Fixed seed: signatures must stay comparable across processes and restarts
+_rng = random.Random(0x6E657773)
+_PERMS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+_SIG_FORMAT = f"<{NUM_PERM}I"
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+Signature = Tuple[int, ...]
+
+
+def _shingles(text: str) -> set:
+    words = _WORD_RE.findall(normalize(text))
+    if len(words) < 2:
+        return set(words)
+    return {f"{a} {b}" for a, b in zip(words, words[1:])}
+
+
+def minhash(title: str, content: str) -> Signature:
+    """NUM_PERM 32-bit minimums over the word bigrams of title and lead."""
+    hashes = [
+        int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little")
+        for s in _shingles(f"{title} {content[:LEAD_CHARS]}")
+    ]
+    if not hashes:
+        return (_MAX_HASH,) * NUM_PERM
+    return tuple(min(((a * h + b) % _PRIME) & _MAX_HASH for h in hashes) for a, b in _PERMS)
+
+
+def pack(signature: Signature) -> bytes:
+    return struct.pack(_SIG_FORMAT, *signature)
+
+
+def unpack(raw: bytes) -> Signature:
+    return struct.unpack(_SIG_FORMAT, raw)
+
+
+def bands(signature: Signature) -> List[Tuple[int, int]]:
+    out = []
+    for band in range(LSH_BANDS):
+        chunk = struct.pack(f"<{LSH_ROWS}I", *signature[band * LSH_ROWS:(band + 1) * LSH_ROWS])
+        # Signed 32-bit so it fits an INTEGER column
+        out.append((band, int.from_bytes(hashlib.blake2b(chunk, digest_size=4).digest(), "little", signed=True)))
+    return out
+
+
+def similarity(a: Signature, b: Signature) -> float:
+    return sum(1 for x, y in zip(a, b) if x == y) / NUM_PERM
+
+
+class LSHIndex:
+    """In-memory banded index; (band, bucket) -> [(signature, cluster_id, pubDate)]."""
+
+    def __init__(self):
+        self._buckets: Dict[Tuple[int, int], List[Tuple[Signature, uuid.UUID, Optional[int]]]] = defaultdict(list)
+
+    def add(self, signature: Signature, cluster_id: uuid.UUID, pub_date: Optional[int]) -> None:
+        for key in bands(signature):
+            self._buckets[key].append((signature, cluster_id, pub_date))
+
+    def match(self, signature: Signature, pub_date: Optional[int]) -> Optional[uuid.UUID]:
+        """cluster_id of the most similar indexed row above MIN_SIMILARITY within CLUSTER_WINDOW."""
+        best: Optional[Tuple[float, uuid.UUID]] = None
+        for key in bands(signature):
+            for other, cluster_id, other_date in self._buckets.get(key, ()):
+                if pub_date is not None and other_date is not None and abs(pub_date - other_date) > CLUSTER_WINDOW:
+                    continue
+                sim = similarity(signature, other)
+                if sim >= MIN_SIMILARITY and (best is None or sim > best[0]):
+                    best = (sim, cluster_id)
+        return best[1] if best else None
+
+    def prune(self, before: int) -> None:
+        """Drop entries published before `before`; they can no longer match anything newer."""
+        for key in list(self._buckets):
+            kept = [e for e in self._buckets[key] if e[2] is None or e[2] >= before]
+            if kept:
+                self._buckets[key] = kept
+            else:
+                del self._buckets[key]
+
+
+def assign(db: Session, items: List[Dict[str, Any]]) -> None:
+    """Give each item about to be inserted an id, minhash and cluster_id, in place.
+
+    Candidates are the indexed rows sharing a band with any item, loaded in one
+    query; items earlier in the batch are candidates for later ones.
+    """
+    if not items:
+        return
+    signatures = []
+    for item in items:
+        item.setdefault("id", uuid.uuid4())
+        signature = minhash(item["title"], item["content"])
+        item["minhash"] = pack(signature)
+        signatures.append(signature)
+
+    keys = {key for signature in signatures for key in bands(signature)}
+    index = LSHIndex()
+    stmt = select(models.News.id, models.News.minhash, models.News.cluster_id, models.News.pubDate).where(
+        models.News.id.in_(
+            select(models.NewsLSH.news_id).where(tuple_(models.NewsLSH.band, models.NewsLSH.bucket).in_(list(keys)))
+        )
+    )
+    dates = [item["pubDate"] for item in items if item.get("pubDate") is not None]
+    if len(dates) == len(items):
+        # Nothing outside CLUSTER_WINDOW can match; lets Postgres skip older partitions
+        stmt = stmt.where(models.News.pubDate.between(min(dates) - CLUSTER_WINDOW, max(dates) + CLUSTER_WINDOW))
+    rows = db.execute(stmt).all()
+    for news_id, raw, cluster_id, pub_date in rows:
+        if raw is not None:
+            index.add(unpack(raw), cluster_id or news_id, pub_date)
+
+    for item, signature in zip(items, signatures):
+        item["cluster_id"] = index.match(signature, item.get("pubDate")) or item["id"]
+        index.add(signature, item["cluster_id"], item.get("pubDate"))
+
+
+def index_rows(db: Session, rows: Iterable[Tuple[uuid.UUID, Optional[bytes]]]) -> None:
+    """Add (news_id, packed minhash) of freshly inserted rows to news_lsh."""
+    values = [
+        {"band": band, "bucket": bucket, "news_id": news_id}
+        for news_id, raw in rows if raw is not None
+        for band, bucket in bands(unpack(raw))
+    ]
+    if values:
+        db.execute(pg_insert(models.NewsLSH).values(values).on_conflict_do_nothing())
+
+
+def rebuild(db: Session, batch_size: int = 1000) -> int:
+    """Recompute signatures, clusters and news_lsh for the whole table, oldest first."""
+    db.execute(delete(models.NewsLSH))
+    index = LSHIndex()
+    stmt = select(models.News.id, models.News.title, models.News.content, models.News.pubDate).order_by(
+        models.News.pubDate.asc().nulls_first(), models.News.id.asc()
+    )
+    total = 0
+    pruned_at: Optional[int] = None
+    result = db.execute(stmt.execution_options(yield_per=batch_size))
+    for batch in result.partitions():
+        rows = []
+        for news_id, title, content, pub_date in batch:
+            signature = minhash(title, content)
+            cluster_id = index.match(signature, pub_date) or news_id
+            index.add(signature, cluster_id, pub_date)
+            rows.append({"id": news_id, "pubDate": pub_date, "minhash": pack(signature), "cluster_id": cluster_id})
+        # ORM bulk UPDATE by primary key (id, pubDate), one executemany per batch
+        db.execute(update(models.News), rows)
+        index_rows(db, [(r["id"], r["minhash"]) for r in rows])
+        total += len(rows)
+        # Rows arrive oldest first: keep only what newer rows can still match
+        newest = batch[-1][3]
+        if newest is not None and (pruned_at is None or newest - pruned_at > CLUSTER_WINDOW):
+            index.prune(newest - CLUSTER_WINDOW)
+            pruned_at = newest
+    return total
+
+
+def main() -> None:
+    from .database import SessionLocal
+
+    ap = argparse.ArgumentParser(description="Near-duplicate clustering maintenance")
+    ap.add_argument("command", choices=["rebuild"])
+    args = ap.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.command == "rebuild":
+            n = rebuild(db)
+            db.commit()
+            print(f"Rebuilt clusters for {n} rows")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
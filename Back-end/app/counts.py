@@ -0,0 +1,111 @@
+"""Per-filter cache for list_news totals.
+
+Exact COUNT(*) over a filtered join costs more than the page itself on a large
+table, so totals are cached per normalized filter set. Ingest keeps the cache
+honest: counts whose filters are plain id equality are adjusted in place for
+every created row (by its category, agency and pubDate), anything else
+(names, search, clusters) is dropped. A TTL
+bounds the drift from writers in other workers.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, Optional, Sequence, Tuple, Union
+
+COUNT_CACHE_TTL = float(os.getenv("NEWS_COUNT_CACHE_TTL", "60"))
+COUNT_CACHE_SIZE = int(os.getenv("NEWS_COUNT_CACHE_SIZE", "1024"))
+
+# (category_ids, agency_ids, category, agency, q, search_mode, cluster_id, collapse, since, until)
+CountKey = Tuple[
+    Optional[Tuple[int, ...]], Optional[Tuple[int, ...]], Optional[str], Optional[str], Optional[str],
+    Optional[str], Optional[str], Optional[str], Optional[int], Optional[int],
+]
+
+Ids = Union[int, Sequence[int], None]
+
+
+def id_set(ids: Ids) -> Optional[Tuple[int, ...]]:
+    """One id or several as a sorted tuple, None when unfiltered."""
+    if ids is None:
+        return None
+    if isinstance(ids, int):
+        return (ids,)
+    return tuple(sorted(set(ids))) or None
+
+
+def count_key(
+    *,
+    category_id: Ids,
+    agency_id: Ids,
+    category: Optional[str],
+    agency: Optional[str],
+    q: Optional[str],
+    search_mode: str,
+    cluster_id: Optional[Any] = None,
+    collapse: Optional[str] = None,
+    since: Optional[int] = None,
+    until: Optional[int] = None,
+) -> CountKey:
+    return (
+        id_set(category_id),
+        id_set(agency_id),
+        category.lower() if category else None,
+        agency.lower() if agency else None,
+        q.strip().lower() if q else None,
+        search_mode if q else None,
+        str(cluster_id) if cluster_id else None,
+        collapse,
+        since,
+        until,
+    )
+
+
+class CountCache:
+    def __init__(self, ttl: float = COUNT_CACHE_TTL, max_entries: int = COUNT_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[CountKey, Tuple[int, float]]" = OrderedDict()
+
+    def get_or_compute(self, key: CountKey, compute: Callable[[], int]) -> int:
+        now = time.monotonic()
+        with self._lock:
+            hit = self._entries.get(key)
+            if hit and now - hit[1] < self.ttl:
+                self._entries.move_to_end(key)
+                return hit[0]
+        value = compute()
+        with self._lock:
+            self._entries[key] = (value, now)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def on_ingest(self, created: Iterable[Tuple[int, int, int]]) -> None:
+        """Account for newly created rows, given as (category_id, agency_id, pubDate)."""
+        created = list(created)
+        if not created:
+            return
+        with self._lock:
+            for key in list(self._entries):
+                cat_ids, ag_ids, cat_name, ag_name, q, _, cluster, collapse, since, until = key
+                if cat_name or ag_name or q or cluster or collapse:
+                    del self._entries[key]
+                    continue
+                value, ts = self._entries[key]
+                delta = sum(
+                    1 for c, a, p in created
+                    if (cat_ids is None or c in cat_ids) and (ag_ids is None or a in ag_ids)
+                    and (since is None or p >= since) and (until is None or p < until)
+                )
+                if delta:
+                    self._entries[key] = (value + delta, ts)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+count_cache = CountCache()
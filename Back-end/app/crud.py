@@ -1,7 +1,36 @@
-from typing import Optional, Tuple
-from sqlalchemy.orm import Session
-from sqlalchemy import select, func
-from . import models
+import base64
+import hashlib
+import json
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import insert, literal, null, select, func, true, tuple_, or_, and_, text, union_all
+from . import clustering, models, partitions, rollup
+from .search import headline, ts_query
+from .counts import Ids, count_cache, count_key, id_set
+
+def _dedup_lock_key(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little", signed=True)
+
+def lock_dedup_keys(db: Session, items: List[Dict[str, Any]]) -> None:
+    """Serialize writers on the dedup keys (link, lower(title) + category) of `items`.
+
+    The partitioned news table can't carry unique indexes on these keys, so
+    the look-up-then-insert below runs under transaction-scoped advisory locks
+    instead. Keys are taken in sorted order, so two batches never deadlock.
+    """
+    keys = set()
+    for item in items:
+        keys.add(_dedup_lock_key(f"title\0{item['title'].strip().lower()}\0{item['category_id']}"))
+        if item.get("link"):
+            keys.add(_dedup_lock_key(f"link\0{item['link']}"))
+    if keys:
+        db.execute(
+            text("SELECT count(pg_advisory_xact_lock(k)) FROM unnest(CAST(:keys AS bigint[])) AS k"),
+            {"keys": sorted(keys)},
+        )
 
 def find_duplicate_news(db: Session, *, link: Optional[str], title: str, category_id: int) -> Optional[models.News]:
     # Prefer link match; else (title + category)
@@ -28,6 +57,7 @@ def create_news(
     pub_date: Optional[str],
     link: Optional[str],
 ) -> Tuple[models.News, bool]:
+    lock_dedup_keys(db, [{"title": title, "category_id": category_id, "link": link}])
     existing = find_duplicate_news(db, link=link, title=title, category_id=category_id)
     if existing:
         # Optionally backfill missing fields if new data is richer
@@ -35,9 +65,6 @@ def create_news(
         if not existing.image_url and image_url:
             existing.image_url = image_url
             changed = True
-        if not existing.pubDate and pub_date:
-            existing.pubDate = pub_date
-            changed = True
         if not existing.link and link:
             existing.link = link
             changed = True
@@ -45,62 +72,587 @@ def create_news(
             db.add(existing)
         return existing, False
 
-    news = models.News(
+    values = dict(
         title=title.strip(),
         content=content.strip(),
         image_url=image_url,
         category_id=category_id,
         agency_id=agency_id,
-        pubDate=pub_date,
+        # Partition key, so never NULL: undated items are filed under their ingest time
+        pubDate=pub_date or int(time.time()),
         link=link,
     )
+    clustering.assign(db, [values])
+    news = models.News(**values)
     db.add(news)
     db.flush()
+    clustering.index_rows(db, [(news.id, values["minhash"])])
+    rollup.record(db, [(category_id, agency_id, values["pubDate"])])
     db.refresh(news)
     return news, True
 
+def _backfill(target: Dict[str, Any], item: Dict[str, Any]) -> None:
+    # Same rule as create_news: only fill fields the first copy is missing
+    for key in ("image_url", "pubDate", "link"):
+        if not target.get(key) and item.get(key):
+            target[key] = item[key]
+
+def create_news_bulk(db: Session, items: List[Dict[str, Any]]) -> List[Tuple[models.News, bool]]:
+    """Set-based equivalent of calling create_news for each item in order.
+
+    Items are first merged inside the batch (link match first, else lower(title)
+    + category). Under advisory locks on those keys, rows whose link, then
+    title + category, already exists are backfilled, and the rest go in with
+    one multi-row INSERT ... RETURNING. Returns one (news, created) pair per
+    input item.
+    """
+    merged: List[Dict[str, Any]] = []
+    slot_of: List[int] = []
+    by_link: Dict[str, int] = {}
+    by_title: Dict[Tuple[str, int], int] = {}
+    for raw in items:
+        item = {
+            "title": raw["title"].strip(),
+            "content": raw["content"].strip(),
+            "image_url": raw.get("image_url"),
+            "category_id": raw["category_id"],
+            "agency_id": raw["agency_id"],
+            "pubDate": raw.get("pubDate"),
+            "link": raw.get("link"),
+        }
+        title_key = (item["title"].lower(), item["category_id"])
+        idx = by_link.get(item["link"]) if item["link"] else None
+        if idx is None:
+            idx = by_title.get(title_key)
+        if idx is None:
+            idx = len(merged)
+            merged.append(item)
+        else:
+            _backfill(merged[idx], item)
+        target = merged[idx]
+        if target["link"]:
+            by_link.setdefault(target["link"], idx)
+        by_title.setdefault((target["title"].lower(), target["category_id"]), idx)
+        by_title.setdefault(title_key, idx)
+        slot_of.append(idx)
+
+    # After merging, so a dated copy can backfill an undated one
+    now = int(time.time())
+    for m in merged:
+        if not m["pubDate"]:
+            m["pubDate"] = now
+    lock_dedup_keys(db, merged)
+
+    results: List[Optional[Tuple[models.News, bool]]] = [None] * len(merged)
+
+    # 1) Link matches win, exactly like find_duplicate_news
+    links = [m["link"] for m in merged if m["link"]]
+    existing_by_link: Dict[str, models.News] = {}
+    if links:
+        existing_by_link = {
+            n.link: n for n in db.execute(select(models.News).where(models.News.link.in_(links))).scalars()
+        }
+    pending: List[int] = []
+    for idx, m in enumerate(merged):
+        existing = existing_by_link.get(m["link"]) if m["link"] else None
+        if existing is None:
+            pending.append(idx)
+            continue
+        if not existing.image_url and m["image_url"]:
+            existing.image_url = m["image_url"]
+        results[idx] = (existing, False)
+
+    # 2) Then (lower(title), category_id), backfilling like create_news
+    new: List[int] = []
+    if pending:
+        title_keys = list({(merged[i]["title"].lower(), merged[i]["category_id"]) for i in pending})
+        existing_by_title = {
+            (n.title.lower(), n.category_id): n
+            for n in db.execute(
+                select(models.News).where(
+                    tuple_(func.lower(models.News.title), models.News.category_id).in_(title_keys)
+                )
+            ).scalars()
+        }
+        for i in pending:
+            m = merged[i]
+            existing = existing_by_title.get((m["title"].lower(), m["category_id"]))
+            if existing is None:
+                new.append(i)
+                continue
+            if not existing.image_url and m["image_url"]:
+                existing.image_url = m["image_url"]
+            if not existing.link and m["link"]:
+                existing.link = m["link"]
+            results[i] = (existing, False)
+
+    db.flush()
+
+    # 3) Everything else in one INSERT ... RETURNING
+    if new:
+        # Near-duplicate clusters are decided before the insert so they go in with it
+        clustering.assign(db, [merged[i] for i in new])
+        created = db.scalars(
+            insert(models.News).returning(models.News, sort_by_parameter_order=True),
+            [merged[i] for i in new],
+        ).all()
+        for i, news in zip(new, created):
+            results[i] = (news, True)
+        clustering.index_rows(db, [(news.id, merged[i]["minhash"]) for i, news in zip(new, created)])
+        rollup.record(db, [(merged[i]["category_id"], merged[i]["agency_id"], merged[i]["pubDate"]) for i in new])
+
+    # Warm the identity map so serializing category/agency doesn't lazy-load per row
+    cat_ids = {n.category_id for n, _ in results}
+    ag_ids = {n.agency_id for n, _ in results}
+    if cat_ids:
+        db.execute(select(models.Category).where(models.Category.id.in_(cat_ids))).scalars().all()
+    if ag_ids:
+        db.execute(select(models.Agency).where(models.Agency.id.in_(ag_ids))).scalars().all()
+
+    # Every input item maps to its merged row; only the first occurrence counts as created
+    out: List[Tuple[models.News, bool]] = []
+    seen: set = set()
+    for idx in slot_of:
+        news, created = results[idx]
+        out.append((news, created and idx not in seen))
+        seen.add(idx)
+    return out
+
 from sqlalchemy.orm import Session, joinedload
 
-def list_news(
-    db: Session,
+# Below this many rows an exact unfiltered count is cheap enough to run
+EXACT_COUNT_THRESHOLD = 100_000
+
+def _estimated_news_count(db: Session, since: Optional[int] = None) -> Optional[int]:
+    # Planner statistics of the partitions at or after `since`; None until analyzed
+    return partitions.estimated_rows(db, since)
+
+# ---------- Field projection ----------
+# Listings can select just the columns a client renders instead of hydrating
+# full News objects. id and pubDate always come along (cursors need them).
+
+TEASER_CHARS = 240
+
+NEWS_FIELDS: Dict[str, tuple] = {
+    "id": (models.News.id,),
+    "title": (models.News.title,),
+    "content": (models.News.content,),
+    # Truncated in Postgres so the full body never leaves the database
+    "teaser": (func.left(models.News.content, TEASER_CHARS).label("teaser"),),
+    "image_url": (models.News.image_url,),
+    "pubDate": (models.News.pubDate,),
+    "link": (models.News.link,),
+    "cluster_id": (models.News.cluster_id,),
+    "category": (
+        models.Category.id.label("category__id"),
+        models.Category.name.label("category__name"),
+    ),
+    "agency": (
+        models.Agency.id.label("agency__id"),
+        models.Agency.name.label("agency__name"),
+        models.Agency.website.label("agency__website"),
+        models.Agency.image_url.label("agency__image_url"),
+    ),
+}
+
+SUMMARY_FIELDS = ("id", "title", "teaser", "image_url", "pubDate", "link", "cluster_id", "category", "agency")
+
+def parse_fields(fields: str) -> List[str]:
+    names = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in names if f not in NEWS_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+    return names
+
+def _projected_columns(fields) -> list:
+    # Keep the caller's order (it becomes the JSON key order); append the cursor keys if missing
+    names = [*fields, *[f for f in ("id", "pubDate") if f not in fields]]
+    return [col for name in names for col in NEWS_FIELDS[name]]
+
+def nest_row(row) -> Dict[str, Any]:
+    # category__name -> {"category": {"name": ...}}
+    out: Dict[str, Any] = {}
+    for key, value in row.items():
+        if "__" in key:
+            parent, child = key.split("__", 1)
+            out.setdefault(parent, {})[child] = value
+        else:
+            out[key] = value
+    return out
+
+# ---------- Keyset pagination ----------
+# Listings are ordered by (pubDate DESC NULLS FIRST, id DESC). A cursor is the
+# (pubDate, id) of a boundary row plus the direction to walk from it, packed
+# as url-safe base64 JSON so clients treat it as opaque.
+
+def encode_cursor(news: Any, direction: str = "next") -> str:
+    # Accepts a News object or a projected row dict (see NEWS_FIELDS)
+    pub_date, news_id = (news["pubDate"], news["id"]) if isinstance(news, dict) else (news.pubDate, news.id)
+    raw = json.dumps([pub_date, str(news_id), direction], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[Optional[int], uuid.UUID, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        pub_date, news_id, direction = json.loads(base64.urlsafe_b64decode(padded))
+        if direction not in ("next", "prev") or (pub_date is not None and not isinstance(pub_date, int)):
+            raise ValueError(direction)
+        return pub_date, uuid.UUID(news_id), direction
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+
+def _after(pub_date: Optional[int], news_id: uuid.UUID):
+    # Rows that come after (pub_date, news_id) in listing order
+    if pub_date is None:
+        return or_(and_(models.News.pubDate.is_(None), models.News.id < news_id), models.News.pubDate.isnot(None))
+    return and_(models.News.pubDate.isnot(None), tuple_(models.News.pubDate, models.News.id) < (pub_date, news_id))
+
+def _before(pub_date: Optional[int], news_id: uuid.UUID):
+    # Rows that come before (pub_date, news_id) in listing order
+    if pub_date is None:
+        return and_(models.News.pubDate.is_(None), models.News.id > news_id)
+    return or_(models.News.pubDate.is_(None), tuple_(models.News.pubDate, models.News.id) > (pub_date, news_id))
+
+def _in_ids(column, ids: Ids):
+    # One id or several; None when unfiltered
+    ids = id_set(ids)
+    if ids is None:
+        return None
+    return column == ids[0] if len(ids) == 1 else column.in_(ids)
+
+def _filtered_news(
     *,
     category: Optional[str] = None,
     agency: Optional[str] = None,
-    category_id: Optional[int] = None,
-    agency_id: Optional[int] = None,
+    category_id: Ids = None,
+    agency_id: Ids = None,
     q: Optional[str] = None,
-    limit: int = 50,
-    offset: int = 0,
+    search_mode: str = "fts",
+    cluster_id: Optional[uuid.UUID] = None,
+    collapse: Optional[str] = None,
+    since: Optional[int] = None,
+    until: Optional[int] = None,
 ):
+    """The filtered, joined News select shared by listing, homepage and export; returns (stmt, tsquery or None)."""
     stmt = select(models.News).join(models.News.category).join(models.News.agency)
 
-    if category_id is not None:
-        stmt = stmt.where(models.News.category_id == category_id)
-    if agency_id is not None:
-        stmt = stmt.where(models.News.agency_id == agency_id)
+    # Constant bounds on the partition key: the planner skips partitions outside them
+    if since is not None:
+        stmt = stmt.where(models.News.pubDate >= since)
+    if until is not None:
+        stmt = stmt.where(models.News.pubDate < until)
+
+    if cluster_id is not None:
+        stmt = stmt.where(models.News.cluster_id == cluster_id)
+    if collapse == "cluster":
+        # Keep only the newest row of each cluster (the first one in listing
+        # order). A per-row predicate, so keyset cursors keep working.
+        newer = aliased(models.News)
+        # Newer rows are never older than this row, which is what lets the probe prune partitions
+        stmt = stmt.where(
+            ~select(newer.id).where(
+                newer.cluster_id == models.News.cluster_id,
+                newer.pubDate >= models.News.pubDate,
+                tuple_(newer.pubDate, newer.id) > tuple_(models.News.pubDate, models.News.id),
+            ).exists()
+        )
+
+    by_category = _in_ids(models.News.category_id, category_id)
+    if by_category is not None:
+        stmt = stmt.where(by_category)
+    by_agency = _in_ids(models.News.agency_id, agency_id)
+    if by_agency is not None:
+        stmt = stmt.where(by_agency)
 
     if category:
         stmt = stmt.where(func.lower(models.Category.name) == category.lower())
     if agency:
         stmt = stmt.where(func.lower(models.Agency.name) == agency.lower())
 
-    if q:
+    tsq = None
+    if q and search_mode == "like":
         like = f"%{q.lower()}%"
         stmt = stmt.where(
             func.lower(models.News.title).like(like) | func.lower(models.News.content).like(like)
         )
+    elif q:
+        tsq = ts_query(q)
+        stmt = stmt.where(models.News.search_vector.op("@@")(tsq))
+    return stmt, tsq
 
-    total = db.execute(stmt.with_only_columns(func.count()).order_by(None)).scalar() or 0
-    # Order by most recent publication date first; fall back to id for stable ordering
-    stmt = stmt.order_by(models.News.pubDate.desc(), models.News.id.desc()).limit(limit).offset(offset)
+def list_news(
+    db: Session,
+    *,
+    category: Optional[str] = None,
+    agency: Optional[str] = None,
+    category_id: Ids = None,
+    agency_id: Ids = None,
+    q: Optional[str] = None,
+    limit: int = 50,
+    offset: int = 0,
+    cursor: Optional[str] = None,
+    search_mode: str = "fts",
+    cluster_id: Optional[uuid.UUID] = None,
+    collapse: Optional[str] = None,
+    since: Optional[int] = None,
+    until: Optional[int] = None,
+    history: bool = False,
+    order: str = "date",
+    highlight: bool = False,
+    include_total: bool = True,
+    fields: Optional[List[str]] = None,
+):
+    """Return (total, rows, has_more).
+
+    Rows are News objects, or plain dicts holding only `fields` (plus id and
+    pubDate) when a projection is requested.
+
+    `total` is None unless include_total; it then comes from the per-filter
+    count cache, and for an unfiltered listing over a large table from the
+    planner's row estimate. `has_more` never needs it: pages probe limit + 1.
+
+    With a `cursor` the page is located by keyset (offset is ignored) and
+    `has_more` refers to the cursor's direction; otherwise it means rows exist
+    past offset + limit.
+
+    `q` goes through the indexed search_vector unless search_mode="like".
+    order="relevance" ranks full-text matches (offset paging only), and
+    `highlight` fills News.snippet with a marked-up excerpt.
+
+    `cluster_id` lists one near-duplicate cluster; collapse="cluster" shows
+    only the newest row of each cluster. category_id / agency_id take one id
+    or several (IN).
+
+    `since` (inclusive) and `until` (exclusive) bound pubDate. Without
+    `since`, only the recent partitions (partitions.recent_cutoff) are read
+    unless `history` asks for the whole archive.
+    """
+    bounded = since is not None or until is not None
+    if since is None and not history:
+        since = partitions.recent_cutoff()
+    stmt, tsq = _filtered_news(
+        category=category, agency=agency, category_id=category_id, agency_id=agency_id,
+        q=q, search_mode=search_mode, cluster_id=cluster_id, collapse=collapse, since=since, until=until,
+    )
+
+    by_relevance = order == "relevance" and tsq is not None
+    if by_relevance and cursor:
+        raise ValueError("cursor paging is not available with order=relevance")
+
+    total = None
+    if include_total:
+        def _exact() -> int:
+            return db.execute(stmt.with_only_columns(func.count()).order_by(None)).scalar() or 0
 
-    rows = db.execute(stmt).scalars().all()
-    for n in rows:
-        _ = n.category, n.agency
-    return total, rows
+        def _unfiltered() -> int:
+            est = _estimated_news_count(db, since)
+            return est if est is not None and est >= EXACT_COUNT_THRESHOLD else _exact()
+
+        # The partition estimate only fits the month-aligned recent cutoff
+        unfiltered = not any((category_id, agency_id, category, agency, q, cluster_id, collapse, bounded))
+        key = count_key(
+            category_id=category_id, agency_id=agency_id, category=category, agency=agency,
+            q=q, search_mode=search_mode, cluster_id=cluster_id, collapse=collapse, since=since, until=until,
+        )
+        total = count_cache.get_or_compute(key, _unfiltered if unfiltered else _exact)
+
+    def _fetch(page_stmt) -> list:
+        if fields is None:
+            return list(db.execute(page_stmt).scalars().all())
+        # Plain column rows: no ORM identity map, no relationship loading
+        return [nest_row(r) for r in db.execute(page_stmt.with_only_columns(*_projected_columns(fields))).mappings()]
+
+    if cursor:
+        pub_date, news_id, direction = decode_cursor(cursor)
+        if direction == "prev":
+            # Walk backwards through the index, then flip back to listing order
+            stmt = stmt.where(_before(pub_date, news_id)).order_by(
+                models.News.pubDate.asc().nulls_last(), models.News.id.asc()
+            )
+        else:
+            stmt = stmt.where(_after(pub_date, news_id)).order_by(
+                models.News.pubDate.desc().nulls_first(), models.News.id.desc()
+            )
+        rows = _fetch(stmt.limit(limit + 1))
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if direction == "prev":
+            rows.reverse()
+    else:
+        if by_relevance:
+            stmt = stmt.order_by(func.ts_rank_cd(models.News.search_vector, tsq).desc())
+        # Order by most recent publication date first; fall back to id for stable ordering
+        stmt = stmt.order_by(models.News.pubDate.desc(), models.News.id.desc()).limit(limit + 1).offset(offset)
+        rows = _fetch(stmt)
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+    if fields is None:
+        for n in rows:
+            _ = n.category, n.agency
+    if highlight and tsq is not None and rows:
+        # Only the page's rows are highlighted; a projection may have left content out
+        ids = [n["id"] if fields is not None else n.id for n in rows]
+        if fields is None:
+            contents = {n.id: n.content for n in rows}
+        else:
+            contents = dict(db.execute(
+                select(models.News.id, models.News.content).where(models.News.id.in_(ids))
+            ).all())
+        for n, news_id in zip(rows, ids):
+            snippet = headline(contents[news_id], q) if news_id in contents else None
+            if fields is not None:
+                n["snippet"] = snippet
+            else:
+                n.snippet = snippet
+    return total, rows, has_more
+
+# ---------- Homepage ----------
+
+def home_news(
+    db: Session,
+    *,
+    latest: int = 15,
+    per_category: int = 6,
+    per_agency: int = 0,
+    category_id: Ids = None,
+    agency_id: Ids = None,
+    since: Optional[int] = None,
+    fields: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """The `latest` newest stories plus the newest `per_category` of every
+    category and `per_agency` of every agency, in one statement.
+
+    Each section is a LEFT JOIN LATERAL top-N probe that walks
+    ix_news_category_pubdate_id / ix_news_agency_pubdate_id backwards, so a
+    section costs N index entries however large news is; the sections go
+    out as one UNION ALL. category_id / agency_id narrow the stories (and
+    the sections of that kind); `since` defaults to the recent window.
+    Sections without stories come back with an empty list.
+    """
+    if since is None:
+        since = partitions.recent_cutoff()
+    cols = _projected_columns(fields or list(SUMMARY_FIELDS))
+
+    def top(n: int, *where):
+        stmt, _ = _filtered_news(category_id=category_id, agency_id=agency_id, since=since)
+        return (
+            stmt.where(*where).with_only_columns(*cols)
+            .order_by(models.News.pubDate.desc(), models.News.id.desc()).limit(n)
+        )
+
+    def per_owner(section: str, owner_model, news_column, n: int, ids: Ids):
+        owners = select(owner_model.id, owner_model.name)
+        only = _in_ids(owner_model.id, ids)
+        if only is not None:
+            owners = owners.where(only)
+        owners = owners.subquery(f"{section}_owner")
+        stories = top(n, news_column == owners.c.id).lateral(f"{section}_top")
+        return select(
+            literal(section).label("section"), owners.c.id.label("section_id"), owners.c.name.label("section_name"),
+            stories,
+        ).select_from(owners.outerjoin(stories, true()))
+
+    parts = []
+    if latest:
+        stories = top(latest).subquery("latest_top")
+        parts.append(select(
+            literal("latest").label("section"), null().label("section_id"), null().label("section_name"), stories,
+        ))
+    if per_category:
+        parts.append(per_owner("categories", models.Category, models.News.category_id, per_category, category_id))
+    if per_agency:
+        parts.append(per_owner("agencies", models.Agency, models.News.agency_id, per_agency, agency_id))
+
+    out: Dict[str, Any] = {
+        key: [] for key, n in (("latest", latest), ("categories", per_category), ("agencies", per_agency)) if n
+    }
+    if not parts:
+        return out
+    u = union_all(*parts).subquery("home")
+    rows = db.execute(
+        select(u).order_by(u.c.section, u.c.section_name, u.c.pubDate.desc(), u.c.id.desc())
+    ).mappings()
+
+    sections: Dict[Tuple[str, Any], Dict[str, Any]] = {}
+    for row in rows:
+        row = dict(row)
+        section, owner_id, owner_name = row.pop("section"), row.pop("section_id"), row.pop("section_name")
+        if section == "latest":
+            items = out["latest"]
+        else:
+            entry = sections.get((section, owner_id))
+            if entry is None:
+                entry = sections[(section, owner_id)] = {"id": owner_id, "name": owner_name, "news": []}
+                out[section].append(entry)
+            items = entry["news"]
+        # An owner without stories joins to one all-NULL row
+        if row["id"] is not None:
+            items.append(nest_row(row))
+    return out
+
+EXPORT_BATCH_SIZE = 1000
+
+def export_news(
+    db: Session,
+    *,
+    category: Optional[str] = None,
+    agency: Optional[str] = None,
+    category_id: Ids = None,
+    agency_id: Ids = None,
+    q: Optional[str] = None,
+    search_mode: str = "fts",
+    since: Optional[int] = None,
+    since_id: Optional[uuid.UUID] = None,
+    fields: Optional[List[str]] = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+):
+    """Yield every matching row as flat mappings, oldest first, in lists of `batch_size`.
+
+    Rows come off a server-side cursor (yield_per), so memory stays flat no
+    matter how many match. `since`/`since_id` is a watermark: pass the last
+    exported (pubDate, id) to resume strictly after it; `since` alone means
+    pubDate >= since. Nested keys come out as category__name etc.
+    """
+    stmt, _ = _filtered_news(
+        category=category, agency=agency, category_id=category_id, agency_id=agency_id,
+        q=q, search_mode=search_mode,
+    )
+    if since is not None and since_id is not None:
+        stmt = stmt.where(tuple_(models.News.pubDate, models.News.id) > (since, since_id))
+    elif since is not None:
+        stmt = stmt.where(models.News.pubDate >= since)
+    stmt = stmt.with_only_columns(*_projected_columns(fields or [f for f in NEWS_FIELDS if f != "teaser"]))
+    stmt = stmt.order_by(models.News.pubDate.asc().nulls_first(), models.News.id.asc())
+
+    result = db.execute(stmt.execution_options(yield_per=batch_size))
+    try:
+        for batch in result.mappings().partitions():
+            yield batch
+    finally:
+        result.close()
+
+def get_news_by_id(db: Session, news_id: uuid.UUID) -> Optional[models.News]:
+    return db.execute(
+        select(models.News)
+        .options(joinedload(models.News.category), joinedload(models.News.agency))
+        .where(models.News.id == news_id)
+    ).scalar_one_or_none()
 
 def list_categories(db: Session):
     return db.execute(select(models.Category).order_by(models.Category.name.asc())).scalars().all()
 
 def list_agencies(db: Session):
     return db.execute(select(models.Agency).order_by(models.Agency.name.asc())).scalars().all()
+
+# ---------- Async variants (NEWS_DB_ASYNC=1) ----------
+
+async def list_news_async(db: AsyncSession, **kwargs):
+    # Same query code as list_news; run_sync drives it over asyncpg without a thread
+    return await db.run_sync(lambda s: list_news(s, **kwargs))
+
+async def list_categories_async(db: AsyncSession):
+    return (await db.execute(select(models.Category).order_by(models.Category.name.asc()))).scalars().all()
+
+async def list_agencies_async(db: AsyncSession):
+    return (await db.execute(select(models.Agency).order_by(models.Agency.name.asc()))).scalars().all()
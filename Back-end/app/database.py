@@ -16,3 +16,24 @@ engine = create_engine(
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
+
+# Optional asyncpg-backed engine for the read endpoints (NEWS_DB_ASYNC=1).
+# Ingest and startup DDL keep using the sync engine above.
+USE_ASYNC_DB = os.getenv("NEWS_DB_ASYNC", "0") == "1"
+ASYNC_DATABASE_URL = os.getenv(
+    "ASYNC_DATABASE_URL",
+    DATABASE_URL.replace("+psycopg2", "+asyncpg").replace("postgresql://", "postgresql+asyncpg://"),
+)
+
+async_engine = None
+AsyncSessionLocal = None
+if USE_ASYNC_DB:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        pool_pre_ping=True,
+        pool_size=int(os.getenv("NEWS_ASYNC_POOL_SIZE", "20")),
+        max_overflow=int(os.getenv("NEWS_ASYNC_MAX_OVERFLOW", "40")),
+    )
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
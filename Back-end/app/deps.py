@@ -1,5 +1,8 @@
-from typing import Generator
+from typing import AsyncGenerator, Generator
+from fastapi import Request
+from . import database
 from .database import SessionLocal
+from .replicas import read_session
 
 def get_db() -> Generator:
     db = SessionLocal()
@@ -7,3 +10,15 @@ def get_db() -> Generator:
         yield db
     finally:
         db.close()
+
+def get_read_db(request: Request) -> Generator:
+    # Replica session for read-only handlers (see app/replicas.py)
+    db = read_session(request)
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db() -> AsyncGenerator:
+    async with database.AsyncSessionLocal() as db:
+        yield db
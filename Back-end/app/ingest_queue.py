@@ -0,0 +1,277 @@
+"""Write-behind ingestion (NEWS_INGEST_MODE=queue).
+
+POST /api/news and /api/news/bulk validate the payload, append it to a local
+SQLite queue and answer 202 with an ingest id. A background writer drains
+the queue in large batches through crud.create_news_bulk, one transaction per
+drain, so ingest bursts stop competing with readers for pool connections.
+
+The queue file survives restarts. A batch is only marked done after its
+transaction commits; batches claimed by a writer that died are re-claimed
+once their lease expires, which is safe because the bulk upsert is
+idempotent. Several uvicorn workers may share one queue file.
+
+Only a batch Postgres rejects as invalid (IntegrityError/DataError) is marked
+failed. When the database is unreachable the claimed batches go back to
+'queued' and the writer backs off, so acknowledged payloads survive an outage.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import closing
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import exc as sa_exc
+
+INGEST_MODE = os.getenv("NEWS_INGEST_MODE", "sync")
+QUEUE_PATH = os.getenv("NEWS_INGEST_QUEUE", "./ingest_queue.sqlite3")
+DRAIN_MAX_ITEMS = int(os.getenv("NEWS_INGEST_DRAIN_MAX", "2000"))
+POLL_INTERVAL = float(os.getenv("NEWS_INGEST_POLL", "0.5"))
+LEASE_SECONDS = 300
+BACKOFF_MIN = 1.0
+BACKOFF_MAX = 60.0
+KEEP_DONE_SECONDS = 7 * 86400
+
+log = logging.getLogger("news-ingest")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ingest_batches (
+    id          TEXT PRIMARY KEY,
+    status      TEXT NOT NULL,           -- queued | processing | done | failed
+    items       INTEGER NOT NULL,
+    payload     TEXT NOT NULL,
+    created     REAL NOT NULL,
+    claimed_at  REAL,
+    finished_at REAL,
+    created_n   INTEGER,
+    error       TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_ingest_status_created ON ingest_batches (status, created);
+"""
+
+
+class IngestQueue:
+    def __init__(self, path: str = QUEUE_PATH):
+        self.path = path
+        self.wakeup = threading.Event()
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def enqueue(self, items: List[Dict[str, Any]]) -> str:
+        ingest_id = uuid.uuid4().hex
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "INSERT INTO ingest_batches (id, status, items, payload, created) VALUES (?, 'queued', ?, ?, ?)",
+                (ingest_id, len(items), json.dumps(items, ensure_ascii=False), time.time()),
+            )
+        self.wakeup.set()
+        return ingest_id
+
+    def claim(self, max_items: int = DRAIN_MAX_ITEMS) -> List[Tuple[str, List[Dict[str, Any]]]]:
+        """Atomically claim the oldest queued batches, up to roughly max_items items."""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(
+                "SELECT id, items, payload FROM ingest_batches "
+                "WHERE status = 'queued' OR (status = 'processing' AND claimed_at < ?) "
+                "ORDER BY created LIMIT 1000",
+                (now - LEASE_SECONDS,),
+            ).fetchall()
+            claimed: List[Tuple[str, List[Dict[str, Any]]]] = []
+            total = 0
+            for batch_id, n, payload in rows:
+                if claimed and total + n > max_items:
+                    break
+                claimed.append((batch_id, json.loads(payload)))
+                total += n
+            conn.executemany(
+                "UPDATE ingest_batches SET status = 'processing', claimed_at = ? WHERE id = ?",
+                [(now, batch_id) for batch_id, _ in claimed],
+            )
+            conn.execute("COMMIT")
+            return claimed
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def mark_done(self, results: Dict[str, int]) -> None:
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.executemany(
+                "UPDATE ingest_batches SET status = 'done', finished_at = ?, created_n = ?, payload = '[]' WHERE id = ?",
+                [(now, created, batch_id) for batch_id, created in results.items()],
+            )
+            conn.execute(
+                "DELETE FROM ingest_batches WHERE status = 'done' AND finished_at < ?", (now - KEEP_DONE_SECONDS,)
+            )
+
+    def requeue(self, batch_ids: List[str]) -> None:
+        """Hand claimed batches back to the queue untouched, e.g. while Postgres is down."""
+        with closing(self._connect()) as conn:
+            conn.executemany(
+                "UPDATE ingest_batches SET status = 'queued', claimed_at = NULL WHERE id = ?",
+                [(batch_id,) for batch_id in batch_ids],
+            )
+
+    def mark_failed(self, batch_id: str, error: str) -> None:
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "UPDATE ingest_batches SET status = 'failed', finished_at = ?, error = ? WHERE id = ?",
+                (time.time(), error[:2000], batch_id),
+            )
+
+    def status(self, ingest_id: str) -> Optional[Dict[str, Any]]:
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT id, status, items, created, finished_at, created_n, error FROM ingest_batches WHERE id = ?",
+                (ingest_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        keys = ("ingest_id", "status", "items", "queued_at", "finished_at", "created", "error")
+        return dict(zip(keys, row))
+
+    def depth(self) -> Dict[str, int]:
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT status, COUNT(*), COALESCE(SUM(items), 0) FROM ingest_batches "
+                "WHERE status IN ('queued', 'processing', 'failed') GROUP BY status"
+            ).fetchall()
+        out = {"queued_batches": 0, "queued_items": 0, "processing_batches": 0, "failed_batches": 0}
+        for status, batches, items in rows:
+            out[f"{status}_batches"] = batches
+            if status == "queued":
+                out["queued_items"] = items
+        return out
+
+
+class IngestWriter(threading.Thread):
+    """Drains the queue into Postgres, one transaction per claimed group of batches."""
+
+    def __init__(self, queue: IngestQueue):
+        super().__init__(name="ingest-writer", daemon=True)
+        self.queue = queue
+        self._stop_event = threading.Event()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.queue.wakeup.set()
+
+    def run(self) -> None:
+        backoff = 0.0
+        while not self._stop_event.is_set():
+            try:
+                claimed = self.queue.claim()
+            except Exception as e:
+                log.error("Ingest queue claim failed: %s", e)
+                claimed = []
+            if not claimed:
+                self.queue.wakeup.wait(POLL_INTERVAL)
+                self.queue.wakeup.clear()
+                continue
+            if self.drain(claimed):
+                backoff = 0.0
+            else:
+                backoff = min(max(backoff * 2, BACKOFF_MIN), BACKOFF_MAX)
+                log.warning("Ingest writer backing off for %.0fs", backoff)
+                self._stop_event.wait(backoff)
+
+    def drain(self, claimed: List[Tuple[str, List[Dict[str, Any]]]]) -> bool:
+        """Write claimed batches; False when some were requeued and the writer should back off."""
+        try:
+            self._write(claimed)
+            return True
+        except Exception as e:
+            if _transient(e):
+                log.warning("Ingest of %d batch(es) deferred, database unavailable: %s", len(claimed), e)
+                self.queue.requeue([batch_id for batch_id, _ in claimed])
+                return False
+            # One bad batch must not sink the whole group: retry batch by batch
+            log.warning("Grouped ingest of %d batch(es) failed, isolating: %s", len(claimed), e)
+        ok = True
+        for i, batch in enumerate(claimed):
+            try:
+                self._write([batch])
+            except Exception as err:
+                if isinstance(err, (sa_exc.IntegrityError, sa_exc.DataError)):
+                    log.error("Ingest batch %s rejected: %s", batch[0], err)
+                    self.queue.mark_failed(batch[0], str(err))
+                elif _transient(err):
+                    log.warning("Ingest deferred, database unavailable: %s", err)
+                    self.queue.requeue([batch_id for batch_id, _ in claimed[i:]])
+                    return False
+                else:
+                    # Unknown errors may be ours, not the payload's: keep it for a retry
+                    log.exception("Ingest batch %s failed, requeued", batch[0])
+                    self.queue.requeue([batch[0]])
+                    ok = False
+        return ok
+
+    def _write(self, claimed: List[Tuple[str, List[Dict[str, Any]]]]) -> None:
+        from . import cache, stream
+        from .counts import count_cache
+        from .crud import create_news_bulk
+        from .database import SessionLocal
+
+        items = [item for _, batch in claimed for item in batch]
+        db = SessionLocal()
+        try:
+            rows = create_news_bulk(db, items)
+            created = [(news.category_id, news.agency_id, news.pubDate) for news, is_new in rows if is_new]
+            pushed = [stream.payload(news) for news, is_new in rows if is_new]
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+        count_cache.on_ingest(created)
+        cache.invalidate()
+        stream.publish(pushed)
+
+        # create_news_bulk returns one pair per input item, in order
+        results: Dict[str, int] = {}
+        pos = 0
+        for batch_id, batch in claimed:
+            results[batch_id] = sum(1 for _, is_new in rows[pos:pos + len(batch)] if is_new)
+            pos += len(batch)
+        self.queue.mark_done(results)
+
+
+def _transient(e: Exception) -> bool:
+    """Errors that say nothing about the payload: the database went away or is overloaded."""
+    if isinstance(e, sa_exc.DBAPIError) and e.connection_invalidated:
+        return True
+    return isinstance(e, (sa_exc.OperationalError, sa_exc.InterfaceError, sa_exc.TimeoutError))
+
+
+ingest_queue: Optional[IngestQueue] = IngestQueue() if INGEST_MODE == "queue" else None
+_writer: Optional[IngestWriter] = None
+
+
+def start_writer() -> None:
+    global _writer
+    if ingest_queue is not None and _writer is None:
+        _writer = IngestWriter(ingest_queue)
+        _writer.start()
+
+
+def stop_writer() -> None:
+    global _writer
+    if _writer is not None:
+        _writer.stop()
+        _writer.join(timeout=10)
+        _writer = None
@@ -1,12 +1,21 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
+from . import database
 from .database import engine, Base
 from .routers import news as news_router
 from .schemas import EnvelopeError, MetaError, ErrorField
+from .cache import ResponseCacheMiddleware
+from .serialize import CompressionMiddleware
+from .ingest_queue import start_writer, stop_writer
+from . import partitions
+from . import metrics
+from . import replicas
+from . import stream
+from .admission import AdmissionMiddleware
 
 APP_NAME = "Injast News Service"
 
@@ -21,6 +30,23 @@ app = FastAPI(
     redoc_url="/redoc",           # ReDoc
 )
 
+# Rate limits and the DB concurrency gate (see app/admission.py). Innermost,
+# so cache hits are neither charged nor queued.
+app.add_middleware(AdmissionMiddleware)
+# Cached GET listings with ETag/304 (see app/cache.py). Added before CORS so
+# CORS stays the outermost layer and decorates cache hits too.
+app.add_middleware(ResponseCacheMiddleware)
+# gzip/brotli for JSON, outside the cache so cached bodies stay uncompressed
+app.add_middleware(CompressionMiddleware)
+# Per-route latency, SQL counts and Server-Timing; outside the cache so hits are measured too
+app.add_middleware(metrics.MetricsMiddleware)
+metrics.instrument_engine(engine)
+if database.async_engine is not None:
+    metrics.instrument_engine(database.async_engine.sync_engine, "async")
+if replicas.replica_set is not None:
+    for replica in replicas.replica_set.replicas:
+        metrics.instrument_engine(replica.engine, replica.name)
+
 # CORS (tighten in production)
 app.add_middleware(
     CORSMiddleware,
@@ -28,19 +54,36 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
 # Auto-create tables on startup (dev). Prefer Alembic for prod.
 @app.on_event("startup")
 def on_startup():
     Base.metadata.create_all(bind=engine)
+    # A pre-partitioning news table: refuse to start, or migrate with NEWS_AUTO_MIGRATE=1
+    partitions.check_schema()
+    # This month's and upcoming partitions of news, then periodic re-checks
+    partitions.start_maintenance()
+    start_writer()
+    # NEWS_STREAM_FANOUT=postgres: live-push stories ingested by any worker
+    stream.start_listener()
+
+@app.on_event("shutdown")
+def on_shutdown():
+    stop_writer()
+    partitions.stop_maintenance()
+    stream.stop_listener()
 
 # ---------- Error envelope handlers ----------
 ERROR_HELP_BASE = "https://injast.life/help/errors/"
 
 @app.exception_handler(StarletteHTTPException)
 async def http_exception_handler(request: Request, exc: StarletteHTTPException):
-    code = {403: "Forbidden", 404: "NotFound", 401: "Unauthorized"}.get(exc.status_code, "HTTPError")
+    code = {
+        400: "BadRequest", 403: "Forbidden", 404: "NotFound", 401: "Unauthorized",
+        429: "TooManyRequests", 503: "ServiceUnavailable",
+    }.get(exc.status_code, "HTTPError")
     env = EnvelopeError(
         meta=MetaError(success=False, error_code=code, error_help=f"{ERROR_HELP_BASE}{code}", error_fields=[]),
         message=str(exc.detail),
@@ -67,8 +110,14 @@ app.include_router(news_router.router)
 
 @app.get("/healthz")
 def healthz():
+    if replicas.replica_set is not None:
+        return {"ok": True, "replicas": replicas.replica_set.status()}
     return {"ok": True}
 
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 @app.get("/")
 def index():
     return {"service": APP_NAME, "docs": "/docs", "openapi": "/openapi.json"}
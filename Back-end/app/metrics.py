@@ -0,0 +1,280 @@
+"""Request and SQL instrumentation, exposed as Prometheus text on /metrics.
+
+MetricsMiddleware times every request per (method, route template, status)
+and, through engine event hooks, counts the SQL statements each request
+issued and the time spent in them, lazy loads included. Pool events (public
+connect/checkout/checkin hooks) time how long each connection is held and
+count checkouts and new connections; in-use / idle / overflow connections
+are read at scrape time. Pool series carry an `engine` label (primary, async,
+replicaN) so each instrumented engine is reported separately. Statements slower than NEWS_SLOW_QUERY_MS are logged with a
+fingerprint (literals and parameters stripped) so repeats group together.
+
+NEWS_SERVER_TIMING=1 adds a Server-Timing header (app, db) to each response.
+
+Metrics are per process; with several uvicorn workers, scrape each one or
+sum them in Prometheus.
+"""
+import contextvars
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+
+SLOW_QUERY_MS = float(os.getenv("NEWS_SLOW_QUERY_MS", "200"))
+SERVER_TIMING = os.getenv("NEWS_SERVER_TIMING", "0") == "1"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+log = logging.getLogger("news-sql")
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, labels: Sequence[str], buckets: Sequence[float]):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        # label values -> [bucket counts..., +Inf count, sum]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[len(self.buckets)] += 1
+            series[-1] += value
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._series.items()]
+        for label_values, series in sorted(items):
+            base = ",".join(f'{k}="{_escape(v)}"' for k, v in zip(self.labels, label_values))
+            sep = "," if base else ""
+            for bound, count in zip(self.buckets, series):
+                lines.append(f'{self.name}_bucket{{{base}{sep}le="{bound:g}"}} {count}')
+            lines.append(f'{self.name}_bucket{{{base}{sep}le="+Inf"}} {series[len(self.buckets)]}')
+            labels = f"{{{base}}}" if base else ""
+            lines.append(f"{self.name}_sum{labels} {series[-1]:.6f}")
+            lines.append(f"{self.name}_count{labels} {series[len(self.buckets)]}")
+        return "\n".join(lines)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+REQUEST_LATENCY = Histogram(
+    "news_http_request_duration_seconds", "HTTP request latency", ("method", "route", "status"), LATENCY_BUCKETS
+)
+REQUEST_QUERIES = Histogram(
+    "news_db_queries_per_request", "SQL statements issued per request", ("method", "route"), QUERY_COUNT_BUCKETS
+)
+REQUEST_DB_TIME = Histogram(
+    "news_db_time_per_request_seconds", "Time spent in SQL per request", ("method", "route"), LATENCY_BUCKETS
+)
+QUERY_LATENCY = Histogram("news_db_query_duration_seconds", "SQL statement latency", (), LATENCY_BUCKETS)
+POOL_HOLD = Histogram(
+    "news_db_pool_hold_seconds", "Time a pooled connection stays checked out", ("engine",), LATENCY_BUCKETS
+)
+
+_slow_queries = 0
+_slow_lock = threading.Lock()
+# engine name -> engine, in instrumentation order
+_engines: Dict[str, Engine] = {}
+# engine name -> event -> count
+_pool_events: Dict[str, Dict[str, int]] = {}
+_pool_lock = threading.Lock()
+
+
+# ---------- Per-request SQL accounting ----------
+
+@dataclass
+class RequestStats:
+    queries: int = 0
+    db_seconds: float = 0.0
+
+
+# Starlette copies the context into threadpool workers, so sync handlers
+# running there still find (and mutate) the request's stats object
+_current: contextvars.ContextVar[Optional[RequestStats]] = contextvars.ContextVar("news_request_stats", default=None)
+
+_LITERALS = [
+    (re.compile(r"'(?:[^']|'')*'"), "?"),
+    (re.compile(r"%\(\w+\)s|\$\d+|%s"), "?"),
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)"), "(?+)"),
+    (re.compile(r"\s+"), " "),
+]
+
+
+def fingerprint(statement: str) -> Tuple[str, str]:
+    """(short hash, normalized text) of a statement with literals and parameters stripped."""
+    text = statement
+    for pattern, repl in _LITERALS:
+        text = pattern.sub(repl, text)
+    text = text.strip()
+    return hashlib.sha1(text.encode()).hexdigest()[:12], text
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("news_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    global _slow_queries
+    elapsed = time.perf_counter() - conn.info["news_query_start"].pop()
+    QUERY_LATENCY.observe(elapsed)
+    stats = _current.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+    if elapsed * 1000 >= SLOW_QUERY_MS:
+        with _slow_lock:
+            _slow_queries += 1
+        fp, text = fingerprint(statement)
+        log.warning("Slow query %.1f ms [%s] %s", elapsed * 1000, fp, text[:500])
+
+
+def _handle_error(context):
+    # after_cursor_execute doesn't fire for a failed statement
+    starts = context.connection.info.get("news_query_start") if context.connection is not None else None
+    if starts:
+        starts.pop()
+
+
+def instrument_engine(engine: Engine, name: str = "primary") -> None:
+    """Attach SQL timing hooks and pool event hooks to a (sync) engine; `name` labels its pool metrics."""
+    _engines[name] = engine
+    _pool_events[name] = {"checkout": 0, "connect": 0}
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+    # Listening on the engine (not engine.pool) keeps the hooks on a pool
+    # recreated by engine.dispose()
+    def on_connect(dbapi_connection, connection_record) -> None:
+        _count_pool_event(name, "connect")
+
+    def on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+        _count_pool_event(name, "checkout")
+        connection_record.info["news_checked_out_at"] = time.perf_counter()
+
+    def on_checkin(dbapi_connection, connection_record) -> None:
+        t0 = connection_record.info.pop("news_checked_out_at", None)
+        if t0 is not None:
+            POOL_HOLD.observe(time.perf_counter() - t0, name)
+
+    event.listen(engine, "connect", on_connect)
+    event.listen(engine, "checkout", on_checkout)
+    event.listen(engine, "checkin", on_checkin)
+
+
+def _count_pool_event(engine_name: str, event_name: str) -> None:
+    with _pool_lock:
+        _pool_events[engine_name][event_name] += 1
+
+
+# ---------- HTTP side ----------
+
+class MetricsMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        stats = RequestStats()
+        token = _current.set(stats)
+        t0 = time.perf_counter()
+        status = "500"
+        try:
+            response = await call_next(request)
+            status = str(response.status_code)
+        finally:
+            _current.reset(token)
+            elapsed = time.perf_counter() - t0
+            # Route template, not the raw path, keeps label cardinality bounded
+            route = getattr(request.scope.get("route"), "path", None) or "unmatched"
+            REQUEST_LATENCY.observe(elapsed, request.method, route, status)
+            REQUEST_QUERIES.observe(stats.queries, request.method, route)
+            REQUEST_DB_TIME.observe(stats.db_seconds, request.method, route)
+        if SERVER_TIMING:
+            response.headers["Server-Timing"] = (
+                f'app;dur={elapsed * 1000:.1f}, db;dur={stats.db_seconds * 1000:.1f};desc="{stats.queries} queries"'
+            )
+        return response
+
+
+def _gauge(name: str, help_text: str, value: float) -> str:
+    return f"# HELP {name} {help_text}\n# TYPE {name} gauge\n{name} {value}"
+
+
+def _per_engine(name: str, kind: str, help_text: str, values: Dict[str, float]) -> str:
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    lines += [f'{name}{{engine="{_escape(e)}"}} {v}' for e, v in values.items()]
+    return "\n".join(lines)
+
+
+_POOL_GAUGES = (
+    ("news_db_pool_size", "Configured pool size", "size"),
+    ("news_db_pool_checked_out", "Connections in use", "checkedout"),
+    ("news_db_pool_checked_in", "Idle pooled connections", "checkedin"),
+    ("news_db_pool_overflow", "Connections open beyond pool_size", "overflow"),
+)
+
+
+def render() -> str:
+    parts = [h.render() for h in (REQUEST_LATENCY, REQUEST_QUERIES, REQUEST_DB_TIME, QUERY_LATENCY, POOL_HOLD)]
+    # NullPool and friends keep no counts
+    pools = {name: e.pool for name, e in _engines.items() if hasattr(e.pool, "checkedout")}
+    for metric, help_text, method in _POOL_GAUGES:
+        parts.append(_per_engine(metric, "gauge", help_text, {n: getattr(p, method)() for n, p in pools.items()}))
+    with _pool_lock:
+        events = {name: dict(counts) for name, counts in _pool_events.items()}
+    parts.append(_per_engine(
+        "news_db_pool_checkouts_total", "counter", "Connections handed out by the pool",
+        {name: counts["checkout"] for name, counts in events.items()},
+    ))
+    parts.append(_per_engine(
+        "news_db_pool_connects_total", "counter", "New DBAPI connections opened",
+        {name: counts["connect"] for name, counts in events.items()},
+    ))
+    parts.append(
+        f"# HELP news_db_slow_queries_total Statements slower than {SLOW_QUERY_MS:g} ms\n"
+        f"# TYPE news_db_slow_queries_total counter\nnews_db_slow_queries_total {_slow_queries}"
+    )
+
+    from .stream import broadcaster
+    parts.append(_gauge("news_stream_clients", "Connected live-push clients", broadcaster.clients()))
+    parts.append(
+        "# HELP news_stream_evictions_total Live-push clients dropped as slow consumers\n"
+        f"# TYPE news_stream_evictions_total counter\nnews_stream_evictions_total {broadcaster.evictions}"
+    )
+
+    from . import admission
+    if admission.db_gate is not None:
+        parts.append(_gauge("news_admission_active", "Admitted read requests running", admission.db_gate.active))
+        parts.append(_gauge("news_admission_waiting", "Read requests queued for a DB slot", admission.db_gate.waiting))
+    parts.append(
+        "# HELP news_admission_rejected_total Read requests turned away (429 rate, 503 queue_full/timeout)\n"
+        "# TYPE news_admission_rejected_total counter\n"
+        + "\n".join(f'news_admission_rejected_total{{reason="{r}"}} {n}' for r, n in admission.rejected.items())
+    )
+
+    from .ingest_queue import ingest_queue
+    if ingest_queue is not None:
+        depth = ingest_queue.depth()
+        parts.append(_gauge("news_ingest_queue_items", "Items waiting in the write-behind queue", depth["queued_items"]))
+        parts.append(_gauge("news_ingest_queue_failed_batches", "Write-behind batches that failed", depth["failed_batches"]))
+    return "\n".join(parts) + "\n"
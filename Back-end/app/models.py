@@ -1,8 +1,9 @@
 import uuid as _uuid
-from sqlalchemy import Column, Integer, String, Text, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Computed, DDL, Integer, LargeBinary, SmallInteger, String, Text, ForeignKey, Index, event, func
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
+from sqlalchemy.orm import deferred, relationship
 from .database import Base
+from .search import NORMALIZE_FN_SQL, SEARCH_VECTOR_SQL
 
 class Category(Base):
     __tablename__ = "categories"
@@ -20,15 +21,67 @@ class Agency(Base):
 
 class News(Base):
     __tablename__ = "news"
-    id = Column(UUID(as_uuid=True), unique=True, primary_key=True, nullable=False, default=_uuid.uuid4, index=True)
+    # Range-partitioned by month on pubDate (see app/partitions.py), which must
+    # be part of the primary key; ids are still unique (uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, nullable=False, default=_uuid.uuid4)
 
     title = Column(String(255), nullable=False)
     content = Column(Text, nullable=False)
     image_url = Column(Text, nullable=True)
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=False)
     agency_id = Column(Integer, ForeignKey("agencies.id"), nullable=False)
-    pubDate = Column(Integer, nullable=True)
+    pubDate = Column(Integer, primary_key=True, nullable=False)
     link = Column(Text, nullable=True)
+    # Generated from normalized title (weight A) + content (weight B); never loaded unless asked for
+    search_vector = deferred(Column(TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True)))
+    # Near-duplicate clustering (see app/clustering.py); cluster_id is the id of the cluster's first row
+    minhash = deferred(Column(LargeBinary, nullable=True))
+    cluster_id = Column(UUID(as_uuid=True), nullable=True)
+
+    # Filled by crud.list_news when highlighting is requested; not a column
+    snippet = None
 
     category = relationship("Category", back_populates="news")
     agency = relationship("Agency", back_populates="news")
+
+    __table_args__ = (
+        # Dedup lookups (crud.find_duplicate_news / create_news_bulk). Not unique:
+        # a partitioned table can't enforce that without pubDate in the key, so
+        # crud serializes writers on these keys with advisory locks instead
+        Index("ix_news_link", link),
+        Index("ix_news_title_category", func.lower(title), category_id),
+        # Keyset pagination: (pubDate, id) walked backwards gives listing order;
+        # the category / agency ones also serve crud.home_news' per-section top-N
+        Index("ix_news_pubdate_id", pubDate, id),
+        Index("ix_news_category_pubdate_id", category_id, pubDate, id),
+        Index("ix_news_agency_pubdate_id", agency_id, pubDate, id),
+        Index("ix_news_search_vector", "search_vector", postgresql_using="gin"),
+        # collapse=cluster: "is there a newer row in my cluster" probe
+        Index("ix_news_cluster_pubdate_id", cluster_id, pubDate, id),
+        {"postgresql_partition_by": 'RANGE ("pubDate")'},
+    )
+
+class NewsLSH(Base):
+    """LSH buckets of News.minhash: one row per (band, bucket) of every clustered row."""
+    __tablename__ = "news_lsh"
+    band = Column(SmallInteger, primary_key=True)
+    bucket = Column(Integer, primary_key=True)
+    # No foreign key: news.id alone isn't unique-indexed on the partitioned
+    # table; partitions.retain deletes the rows of archived partitions
+    news_id = Column(UUID(as_uuid=True), primary_key=True)
+
+    __table_args__ = (Index("ix_news_lsh_news_id", news_id),)
+
+class NewsRollup(Base):
+    """News counts per (category, agency, hour of pubDate), kept current by crud's ingest paths (see app/rollup.py)."""
+    __tablename__ = "news_rollup"
+    category_id = Column(Integer, primary_key=True)
+    agency_id = Column(Integer, primary_key=True)
+    # Unix seconds of the start of the UTC hour
+    hour = Column(Integer, primary_key=True)
+    count = Column(Integer, nullable=False)
+
+    __table_args__ = (Index("ix_news_rollup_hour", hour),)
+
+# The generated search_vector column depends on news_normalize()
+event.listen(News.__table__, "before_create", DDL(NORMALIZE_FN_SQL))
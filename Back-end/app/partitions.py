@@ -0,0 +1,402 @@
+"""Monthly partitions of `news` on pubDate, with retention and archival.
+
+`news` is range-partitioned on "pubDate" into one table per UTC calendar
+month (news_p202610 holds October 2026) plus news_pdefault for anything no
+month partition covers. Listings only read the partitions of the last
+RECENT_MONTHS months unless a caller opts into the full history
+(recent_cutoff), so the hot path's indexes and vacuum work stop growing with
+the archive.
+
+Postgres only enforces uniqueness across partitions for indexes that contain
+the partition key, hence:
+- the primary key is (id, pubDate) and pubDate is NOT NULL; crud files
+  undated items under their ingest time;
+- link and (lower(title), category_id) dedup is done by crud under
+  transaction-scoped advisory locks rather than unique indexes;
+- news_lsh has no foreign key to news; retention clears its rows.
+
+The API creates the partitions from the start of the recent window to
+PARTITION_AHEAD months ahead at startup and re-checks every MAINTENANCE_INTERVAL (also applying retention when
+RETENTION_MONTHS is set). The same jobs from the command line:
+
+    python -m app.partitions ensure
+    python -m app.partitions list
+    python -m app.partitions retain --months 24 --mode export
+    python -m app.partitions migrate    # one-off: convert an unpartitioned news table
+
+A database created before partitioning still has a plain `news` table, which
+create_all leaves alone. The API refuses to start on one (check_schema) unless
+NEWS_AUTO_MIGRATE=1, in which case it runs the migration itself first.
+
+Retention modes (NEWS_ARCHIVE_MODE):
+- detach: the partition becomes the standalone table news_archive_YYYYMM
+  (moved to NEWS_ARCHIVE_TABLESPACE if set); bring it back with
+  ALTER TABLE news ATTACH PARTITION news_archive_YYYYMM FOR VALUES FROM (..) TO (..)
+- export: COPY to NEWS_ARCHIVE_DIR/news_pYYYYMM.csv.gz, then drop; reload into
+  a recreated partition with COPY news (...) FROM ... WITH (FORMAT csv, HEADER)
+- drop: gone
+"""
+import argparse
+import gzip
+import logging
+import os
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from . import models, rollup
+
+PARTITION_AHEAD = int(os.getenv("NEWS_PARTITION_AHEAD", "2"))
+# Listings without history=true read the current month and this many before it (0: no pruning)
+RECENT_MONTHS = int(os.getenv("NEWS_RECENT_MONTHS", "3"))
+# Partitions that ended more than this many months ago are archived (0: keep everything)
+RETENTION_MONTHS = int(os.getenv("NEWS_RETENTION_MONTHS", "0"))
+ARCHIVE_MODE = os.getenv("NEWS_ARCHIVE_MODE", "detach")
+ARCHIVE_DIR = os.getenv("NEWS_ARCHIVE_DIR", "./archive")
+ARCHIVE_TABLESPACE = os.getenv("NEWS_ARCHIVE_TABLESPACE") or None
+MAINTENANCE_INTERVAL = float(os.getenv("NEWS_PARTITION_CHECK_INTERVAL", str(6 * 3600)))
+# Convert a legacy unpartitioned news table at startup instead of refusing to start
+AUTO_MIGRATE = os.getenv("NEWS_AUTO_MIGRATE", "0") == "1"
+
+ARCHIVE_MODES = ("detach", "export", "drop")
+DEFAULT_PARTITION = "news_pdefault"
+_NAME_RE = re.compile(r"^news_p(\d{4})(\d{2})$")
+# pg_advisory_xact_lock key serializing partition DDL across workers
+_MAINTENANCE_LOCK = 0x6E657773_70617274
+
+log = logging.getLogger("news-partitions")
+
+Month = Tuple[int, int]
+
+
+# ---------- Month arithmetic ----------
+
+def month_of(ts: float) -> Month:
+    d = datetime.fromtimestamp(ts, timezone.utc)
+    return d.year, d.month
+
+
+def shift(month: Month, n: int) -> Month:
+    idx = month[0] * 12 + month[1] - 1 + n
+    return idx // 12, idx % 12 + 1
+
+
+def month_start(month: Month) -> int:
+    return int(datetime(month[0], month[1], 1, tzinfo=timezone.utc).timestamp())
+
+
+def partition_name(month: Month) -> str:
+    return f"news_p{month[0]:04d}{month[1]:02d}"
+
+
+def partition_month(name: str) -> Optional[Month]:
+    m = _NAME_RE.match(name)
+    return (int(m.group(1)), int(m.group(2))) if m else None
+
+
+def recent_cutoff(now: Optional[float] = None) -> Optional[int]:
+    """Lower pubDate bound of a default listing; month-aligned so whole partitions are pruned."""
+    if RECENT_MONTHS <= 0:
+        return None
+    return month_start(shift(month_of(now if now is not None else time.time()), -RECENT_MONTHS))
+
+
+# ---------- Catalog ----------
+
+def is_partitioned(db: Session) -> bool:
+    return bool(db.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('news'))"
+    )).scalar())
+
+
+def attached(db: Session) -> List[Tuple[str, float]]:
+    """(partition name, planner row estimate) of every partition of news."""
+    return [tuple(r) for r in db.execute(text(
+        "SELECT c.relname, c.reltuples FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = to_regclass('news') ORDER BY c.relname"
+    )).all()]
+
+
+def estimated_rows(db: Session, since: Optional[int] = None) -> Optional[int]:
+    """Planner row estimate of news, counting only month partitions that end after `since`.
+
+    The parent of a partitioned table carries no estimate of its own (and
+    autovacuum never analyzes it), so the partitions' are summed.
+    """
+    parts = attached(db)
+    if not parts:
+        est = db.execute(text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass('news')")).scalar()
+        return int(est) if est and est > 0 else None
+    total = 0.0
+    for name, tuples in parts:
+        month = partition_month(name)
+        if since is not None and month is not None and month_start(shift(month, 1)) <= since:
+            continue
+        if tuples > 0:
+            total += tuples
+    return int(total) or None
+
+
+def _plain_columns() -> List[str]:
+    # Everything but generated columns, which Postgres recomputes on insert
+    return [f'"{c.name}"' for c in models.News.__table__.columns if c.computed is None]
+
+
+# ---------- Creation ----------
+
+def _create(db: Session, month: Month, has_default: bool) -> None:
+    name = partition_name(month)
+    lo, hi = month_start(month), month_start(shift(month, 1))
+    moved = 0
+    if has_default:
+        # Postgres refuses to add a partition whose range has rows sitting in
+        # the default partition: park them, add the partition, route them back
+        db.execute(text(
+            f'CREATE TEMP TABLE _news_moved AS SELECT * FROM {DEFAULT_PARTITION} '
+            f'WHERE "pubDate" >= :lo AND "pubDate" < :hi'
+        ), {"lo": lo, "hi": hi})
+        moved = db.execute(text(f'DELETE FROM {DEFAULT_PARTITION} WHERE "pubDate" >= :lo AND "pubDate" < :hi'),
+                           {"lo": lo, "hi": hi}).rowcount
+    db.execute(text(f"CREATE TABLE {name} PARTITION OF news FOR VALUES FROM ({lo}) TO ({hi})"))
+    if has_default:
+        cols = ", ".join(_plain_columns())
+        db.execute(text(f"INSERT INTO news ({cols}) SELECT {cols} FROM _news_moved"))
+        db.execute(text("DROP TABLE _news_moved"))
+    log.info("Created partition %s%s", name, f" ({moved} rows moved out of {DEFAULT_PARTITION})" if moved else "")
+
+
+def ensure(db: Session, since: Optional[int] = None, ahead: int = PARTITION_AHEAD) -> List[str]:
+    """Create missing month partitions from `since` to `ahead` months out.
+
+    `since` defaults to the start of the recent window (recent_cutoff), so
+    late items from last month still get a real partition. Returns the names
+    created; the caller commits.
+    """
+    if not is_partitioned(db):
+        log.warning("news is not partitioned; run `python -m app.partitions migrate`")
+        return []
+    db.execute(text("SELECT pg_advisory_xact_lock(:k)"), {"k": _MAINTENANCE_LOCK})
+    existing = {name for name, _ in attached(db)}
+    has_default = DEFAULT_PARTITION in existing
+    if not has_default:
+        db.execute(text(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF news DEFAULT"))
+        has_default = True
+    now = time.time()
+    if since is None:
+        since = recent_cutoff(now) or now
+    month, last = month_of(since), shift(month_of(now), ahead)
+    created = []
+    while month <= last:
+        if partition_name(month) not in existing:
+            _create(db, month, has_default)
+            created.append(partition_name(month))
+        month = shift(month, 1)
+    return created
+
+
+# ---------- Retention ----------
+
+def _export(db: Session, name: str, archive_dir: str) -> str:
+    os.makedirs(archive_dir, exist_ok=True)
+    path = os.path.join(archive_dir, f"{name}.csv.gz")
+    tmp = path + ".tmp"
+    cursor = db.connection().connection.cursor()
+    with gzip.open(tmp, "wt", encoding="utf-8", newline="") as f:
+        cursor.copy_expert(f"COPY (SELECT {', '.join(_plain_columns())} FROM {name}) TO STDOUT WITH (FORMAT csv, HEADER)", f)
+    os.replace(tmp, path)
+    return path
+
+
+def retain(db: Session, months: int = RETENTION_MONTHS, mode: str = ARCHIVE_MODE,
+           archive_dir: str = ARCHIVE_DIR) -> List[str]:
+    """Archive every month partition that ended more than `months` months ago; the caller commits."""
+    if months <= 0:
+        return []
+    if mode not in ARCHIVE_MODES:
+        raise ValueError(f"Unknown archive mode {mode!r} (expected one of {', '.join(ARCHIVE_MODES)})")
+    db.execute(text("SELECT pg_advisory_xact_lock(:k)"), {"k": _MAINTENANCE_LOCK})
+    keep_from = shift(month_of(time.time()), -months)
+    archived = []
+    for name, _ in attached(db):
+        month = partition_month(name)
+        if month is None or month >= keep_from:
+            continue
+        # No foreign key from news_lsh: drop the LSH buckets of the rows leaving, and their counts
+        db.execute(text(f"DELETE FROM news_lsh WHERE news_id IN (SELECT id FROM {name})"))
+        rollup.forget(db, month_start(month), month_start(shift(month, 1)))
+        if mode == "export":
+            log.info("Exported %s to %s", name, _export(db, name, archive_dir))
+        db.execute(text(f"ALTER TABLE news DETACH PARTITION {name}"))
+        if mode == "detach":
+            archive_name = f"news_archive_{month[0]:04d}{month[1]:02d}"
+            db.execute(text(f"ALTER TABLE {name} RENAME TO {archive_name}"))
+            if ARCHIVE_TABLESPACE:
+                db.execute(text(f'ALTER TABLE {archive_name} SET TABLESPACE "{ARCHIVE_TABLESPACE}"'))
+            log.info("Detached %s as %s", name, archive_name)
+        else:
+            db.execute(text(f"DROP TABLE {name}"))
+            log.info("Dropped %s", name)
+        archived.append(name)
+    return archived
+
+
+# ---------- One-off conversion ----------
+
+def migrate(db: Session) -> int:
+    """Rebuild an unpartitioned news table as a partitioned one; returns rows copied.
+
+    Runs in the caller's transaction and holds an exclusive lock on news until
+    commit, so schedule downtime for large tables. Undated rows get the
+    migration time as pubDate.
+    """
+    if is_partitioned(db):
+        return 0
+    db.execute(text("ALTER TABLE news_lsh DROP CONSTRAINT IF EXISTS news_lsh_news_id_fkey"))
+    db.execute(text("ALTER TABLE news RENAME TO news_unpartitioned"))
+    # Index and primary key names are schema-wide: free them for the new table
+    for (conname,) in db.execute(text(
+        "SELECT conname FROM pg_constraint WHERE conrelid = 'news_unpartitioned'::regclass AND contype IN ('p', 'u')"
+    )).all():
+        db.execute(text(f'ALTER TABLE news_unpartitioned DROP CONSTRAINT "{conname}"'))
+    for (indexname,) in db.execute(text(
+        "SELECT indexname FROM pg_indexes WHERE tablename = 'news_unpartitioned'"
+    )).all():
+        db.execute(text(f'DROP INDEX "{indexname}"'))
+
+    models.News.__table__.create(bind=db.connection())
+    # Month partitions from the 0.1th percentile on; stray ancient dates land in the default one
+    oldest = db.execute(text(
+        'SELECT percentile_disc(0.001) WITHIN GROUP (ORDER BY "pubDate") FROM news_unpartitioned'
+    )).scalar()
+    ensure(db, since=oldest)
+    cols = _plain_columns()
+    select_cols = ", ".join(
+        'COALESCE("pubDate", extract(epoch FROM now())::int)' if c == '"pubDate"' else c for c in cols
+    )
+    copied = db.execute(text(f"INSERT INTO news ({', '.join(cols)}) SELECT {select_cols} FROM news_unpartitioned")).rowcount
+    db.execute(text("DROP TABLE news_unpartitioned"))
+    return copied
+
+
+def check_schema() -> None:
+    """Fail fast on a legacy unpartitioned news table, or migrate it when NEWS_AUTO_MIGRATE=1."""
+    from .database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        if is_partitioned(db):
+            return
+        if not AUTO_MIGRATE:
+            raise RuntimeError(
+                "news is a legacy unpartitioned table. Stop the API and run "
+                "`python -m app.partitions migrate` (or start once with NEWS_AUTO_MIGRATE=1)."
+            )
+        log.warning("news is not partitioned; migrating (NEWS_AUTO_MIGRATE=1), news is locked until done")
+        # Workers starting together queue up here; the losers find it partitioned
+        db.execute(text("SELECT pg_advisory_xact_lock(:k)"), {"k": _MAINTENANCE_LOCK})
+        n = migrate(db)
+        db.commit()
+        log.info("Copied %d rows into the partitioned news table", n)
+    finally:
+        db.close()
+
+
+# ---------- Background maintenance ----------
+
+def run_maintenance() -> None:
+    from .database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        ensure(db)
+        archived = retain(db)
+        db.commit()
+        if archived:
+            from . import cache
+            from .counts import count_cache
+
+            count_cache.clear()
+            cache.invalidate()
+    except Exception as e:
+        db.rollback()
+        log.error("Partition maintenance failed: %s", e)
+    finally:
+        db.close()
+
+
+class PartitionMaintainer(threading.Thread):
+    def __init__(self, interval: float = MAINTENANCE_INTERVAL):
+        super().__init__(name="partition-maintenance", daemon=True)
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            run_maintenance()
+
+
+_maintainer: Optional[PartitionMaintainer] = None
+
+
+def start_maintenance() -> None:
+    """Create this month's (and upcoming) partitions now, then keep checking in the background."""
+    global _maintainer
+    run_maintenance()
+    if _maintainer is None:
+        _maintainer = PartitionMaintainer()
+        _maintainer.start()
+
+
+def stop_maintenance() -> None:
+    global _maintainer
+    if _maintainer is not None:
+        _maintainer.stop()
+        _maintainer.join(timeout=10)
+        _maintainer = None
+
+
+def main() -> None:
+    from .database import SessionLocal
+
+    ap = argparse.ArgumentParser(description="news partition maintenance")
+    ap.add_argument("command", choices=["ensure", "list", "retain", "migrate"])
+    ap.add_argument("--months", type=int, default=RETENTION_MONTHS, help="retain: keep this many months")
+    ap.add_argument("--mode", choices=ARCHIVE_MODES, default=ARCHIVE_MODE, help="retain: what happens to older partitions")
+    ap.add_argument("--archive-dir", default=ARCHIVE_DIR, help="retain --mode export: where the .csv.gz files go")
+    args = ap.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.command == "ensure":
+            created = ensure(db)
+            db.commit()
+            print(f"Created {len(created)} partition(s): {', '.join(created) or '-'}")
+        elif args.command == "list":
+            for name, tuples in attached(db):
+                month = partition_month(name)
+                span = f"{month[0]:04d}-{month[1]:02d}" if month else "default"
+                print(f"{name:<20} {span:<8} ~{max(int(tuples), 0)} rows")
+        elif args.command == "retain":
+            archived = retain(db, months=args.months, mode=args.mode, archive_dir=args.archive_dir)
+            db.commit()
+            print(f"Archived {len(archived)} partition(s) ({args.mode}): {', '.join(archived) or '-'}")
+        elif args.command == "migrate":
+            n = migrate(db)
+            db.commit()
+            db.execute(text("ANALYZE news"))
+            db.commit()
+            print(f"Copied {n} rows into the partitioned news table")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
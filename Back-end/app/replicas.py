@@ -0,0 +1,153 @@
+"""Read-replica routing for the GET endpoints.
+
+DATABASE_REPLICA_URLS lists streaming replicas of DATABASE_URL, comma
+separated. Read handlers of the news router take their session from
+deps.get_read_db, which hands replicas out round-robin; ingest, startup DDL
+and the background writers stay on the primary (database.engine).
+
+A replica that refuses connections, or whose replay lag exceeds
+NEWS_REPLICA_MAX_LAG seconds, is skipped for NEWS_REPLICA_RETRY seconds.
+With no healthy replica left, reads go to the primary.
+
+Read-your-writes: ingest responses set a short-lived cookie
+(NEWS_READ_YOUR_WRITES seconds, 0 disables it); requests carrying it read
+from the primary and bypass the response cache until it expires, so a
+client sees its own stories despite replication lag. Other readers may see
+them up to the lag later.
+
+The asyncpg read path (NEWS_DB_ASYNC=1) still reads from the primary.
+"""
+import itertools
+import logging
+import math
+import os
+import threading
+import time
+from typing import List, Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.requests import Request
+from starlette.responses import Response
+
+from .database import SessionLocal
+
+REPLICA_URLS = [u.strip() for u in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if u.strip()]
+MAX_LAG = float(os.getenv("NEWS_REPLICA_MAX_LAG", "10"))
+RETRY_SECONDS = float(os.getenv("NEWS_REPLICA_RETRY", "30"))
+CHECK_INTERVAL = float(os.getenv("NEWS_REPLICA_CHECK_INTERVAL", "5"))
+READ_YOUR_WRITES = float(os.getenv("NEWS_READ_YOUR_WRITES", "5"))
+STICKY_COOKIE = "news_primary_until"
+
+log = logging.getLogger("news-replicas")
+
+# Seconds behind the primary; 0 when fully replayed. The replay timestamp alone
+# would report an idle primary's replicas as lagging.
+_LAG_SQL = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class Replica:
+    def __init__(self, url: str, index: int):
+        self.name = f"replica{index}"
+        self.engine = create_engine(
+            url,
+            pool_pre_ping=True,
+            pool_size=int(os.getenv("NEWS_REPLICA_POOL_SIZE", "10")),
+            max_overflow=int(os.getenv("NEWS_REPLICA_MAX_OVERFLOW", "20")),
+        )
+        self.Session = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.down_until = 0.0
+        self.checked_at = 0.0
+        self.lag: Optional[float] = None
+
+    def mark_down(self, reason: str) -> None:
+        if self.down_until <= time.monotonic():
+            log.warning("%s unhealthy (%s); reading from the others for %gs", self.name, reason, RETRY_SECONDS)
+        self.down_until = time.monotonic() + RETRY_SECONDS
+        # Re-check lag as soon as it comes back
+        self.checked_at = 0.0
+
+    def open(self) -> Optional[Session]:
+        """A session on this replica, or None (and marked down) if it is unreachable or too far behind."""
+        db = self.Session()
+        try:
+            now = time.monotonic()
+            if now - self.checked_at >= CHECK_INTERVAL:
+                self.lag = float(db.execute(_LAG_SQL).scalar() or 0)
+                self.checked_at = now
+                if self.lag > MAX_LAG:
+                    db.close()
+                    self.mark_down(f"{self.lag:.1f}s behind")
+                    return None
+            else:
+                # Check out now (pre-ping included) so a dead replica fails here, not mid-handler
+                db.connection()
+            return db
+        except DBAPIError as e:
+            db.close()
+            self.mark_down(type(e.orig).__name__ if e.orig is not None else str(e))
+            return None
+
+
+class ReplicaSet:
+    def __init__(self, urls: List[str]):
+        self.replicas = [Replica(url, i) for i, url in enumerate(urls)]
+        self._turn = itertools.count()
+        self._lock = threading.Lock()
+
+    def session(self) -> Session:
+        """Next healthy replica's session in round-robin order; the primary's when none is."""
+        with self._lock:
+            start = next(self._turn)
+        now = time.monotonic()
+        n = len(self.replicas)
+        for i in range(n):
+            replica = self.replicas[(start + i) % n]
+            if replica.down_until > now:
+                continue
+            db = replica.open()
+            if db is not None:
+                return db
+        return SessionLocal()
+
+    def status(self) -> List[dict]:
+        now = time.monotonic()
+        return [
+            {"name": r.name, "healthy": r.down_until <= now, "lag_seconds": r.lag}
+            for r in self.replicas
+        ]
+
+
+replica_set: Optional[ReplicaSet] = ReplicaSet(REPLICA_URLS) if REPLICA_URLS else None
+
+
+def is_sticky(request: Request) -> bool:
+    """True while the client's read-your-writes cookie from a recent ingest is live."""
+    try:
+        return float(request.cookies.get(STICKY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def stick(response: Response) -> Response:
+    """Pin the client's reads to the primary for NEWS_READ_YOUR_WRITES seconds."""
+    if replica_set is not None and READ_YOUR_WRITES > 0:
+        response.set_cookie(
+            STICKY_COOKIE,
+            f"{time.time() + READ_YOUR_WRITES:.3f}",
+            max_age=math.ceil(READ_YOUR_WRITES),
+            httponly=True,
+            samesite="lax",
+        )
+    return response
+
+
+def read_session(request: Optional[Request] = None) -> Session:
+    """Session for a read-only request: a replica unless none are configured or the client is sticky."""
+    if replica_set is None or (request is not None and is_sticky(request)):
+        return SessionLocal()
+    return replica_set.session()
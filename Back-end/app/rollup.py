@@ -0,0 +1,145 @@
+"""News counts per (category, agency, hour), for GET /api/stats.
+
+`news_rollup` holds one row per (category_id, agency_id, UTC hour of pubDate)
+with the number of stories in it. crud.create_news and create_news_bulk add
+their new rows in the ingest transaction, so the counts commit (or roll
+back) together with the stories; partitions.retain removes the hours of
+archived months. A histogram then reads at most a few rows per hour and
+group instead of counting news.
+
+Rows that bypass crud (bench.corpus COPY, manual deletes) are picked up by
+a rebuild from the news table:
+
+    python -m app.rollup rebuild
+"""
+import argparse
+import os
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from . import models
+from .counts import Ids, id_set
+
+HOUR = 3600
+DAY = 86400
+MAX_BUCKETS = int(os.getenv("NEWS_STATS_MAX_BUCKETS", "10000"))
+
+R = models.NewsRollup
+
+# group_by name -> (output key, expression)
+GROUPS = {
+    "category": ("category_id", R.category_id),
+    "agency": ("agency_id", R.agency_id),
+    "hour": ("hour", R.hour),
+    "day": ("day", R.hour - R.hour % DAY),
+}
+
+
+def hour_of(pub_date: int) -> int:
+    return pub_date - pub_date % HOUR
+
+
+def record(db: Session, rows: Iterable[Tuple[int, int, int]]) -> None:
+    """Count newly created (category_id, agency_id, pubDate) rows; runs in the caller's transaction."""
+    counts = Counter((category_id, agency_id, hour_of(pub_date)) for category_id, agency_id, pub_date in rows)
+    if not counts:
+        return
+    # Sorted, so concurrent writers lock the rollup rows in the same order
+    values = [
+        {"category_id": c, "agency_id": a, "hour": h, "count": n}
+        for (c, a, h), n in sorted(counts.items())
+    ]
+    stmt = pg_insert(R).values(values)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[R.category_id, R.agency_id, R.hour],
+        set_={"count": R.count + stmt.excluded["count"]},
+    ))
+
+
+def forget(db: Session, since: int, until: int) -> None:
+    """Drop the counts of hours in [since, until), e.g. of an archived partition."""
+    db.execute(delete(R).where(R.hour >= since, R.hour < until))
+
+
+def parse_group_by(value: str) -> List[str]:
+    names = [g.strip() for g in value.split(",") if g.strip()]
+    unknown = [g for g in names if g not in GROUPS]
+    if unknown:
+        raise ValueError(f"Unknown group_by {', '.join(unknown)} (expected any of {', '.join(GROUPS)})")
+    if "hour" in names and "day" in names:
+        raise ValueError("group_by takes hour or day, not both")
+    return list(dict.fromkeys(names))
+
+
+def histogram(
+    db: Session,
+    group_by: List[str],
+    *,
+    category_id: Ids = None,
+    agency_id: Ids = None,
+    since: Optional[int] = None,
+    until: Optional[int] = None,
+) -> Tuple[List[Dict[str, Any]], int]:
+    """(buckets, total) of news counts grouped by `group_by`, ordered by the group keys.
+
+    since/until (unix seconds) select whole hours: both are truncated to their
+    hour, as record() buckets rows, and until's hour is excluded. The answer
+    then doesn't depend on the minute of the call.
+    """
+    cols = [GROUPS[g][1].label(GROUPS[g][0]) for g in group_by]
+    conds = []
+    for column, ids in ((R.category_id, id_set(category_id)), (R.agency_id, id_set(agency_id))):
+        if ids is not None:
+            conds.append(column.in_(ids))
+    if since is not None:
+        conds.append(R.hour >= hour_of(since))
+    if until is not None:
+        conds.append(R.hour < hour_of(until))
+
+    stmt = select(*cols, func.coalesce(func.sum(R.count), 0).label("count")).where(*conds)
+    if cols:
+        stmt = stmt.group_by(*cols).order_by(*cols).limit(MAX_BUCKETS + 1)
+    buckets = [dict(r._mapping) for r in db.execute(stmt)]
+    if len(buckets) > MAX_BUCKETS:
+        raise ValueError(f"More than {MAX_BUCKETS} buckets; narrow the range with since/until or filters")
+    return buckets, sum(b["count"] for b in buckets)
+
+
+def rebuild(db: Session) -> int:
+    """Recount everything from news; returns the number of rollup rows. The caller commits."""
+    # Ingest blocks on its rollup upsert until this commits, then adds on top
+    # of counts that don't include its still-uncommitted rows
+    db.execute(text("LOCK TABLE news_rollup IN EXCLUSIVE MODE"))
+    db.execute(delete(R))
+    hour = models.News.pubDate - models.News.pubDate % HOUR
+    db.execute(insert(R).from_select(
+        ["category_id", "agency_id", "hour", "count"],
+        select(models.News.category_id, models.News.agency_id, hour, func.count())
+        .group_by(models.News.category_id, models.News.agency_id, hour),
+    ))
+    return db.execute(select(func.count()).select_from(R)).scalar_one()
+
+
+def main() -> None:
+    from .database import SessionLocal
+
+    ap = argparse.ArgumentParser(description="News count rollup maintenance")
+    ap.add_argument("command", choices=["rebuild"])
+    args = ap.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.command == "rebuild":
+            n = rebuild(db)
+            db.commit()
+            print(f"Rebuilt {n} rollup rows")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
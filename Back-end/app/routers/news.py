@@ -1,44 +1,106 @@
-from typing import List
-from fastapi import APIRouter, Depends, Query, Request
+import csv
+import io
+import uuid
+from typing import Annotated, List, Literal
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect
+from pydantic import Field
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..schemas import (
     NewsCreate, NewsCreateBulk, NewsOut,
     EnvelopeSuccess, MetaSuccess, MetaPagination,
     CategoryOut, AgencyOut
 )
-from ..deps import get_db
-from ..crud import create_news, list_news, list_categories, list_agencies
+from ..database import USE_ASYNC_DB
+from ..deps import get_db, get_read_db, get_async_db
+from ..crud import (
+    create_news, create_news_bulk, list_news, list_categories, list_agencies,
+    encode_cursor, decode_cursor, get_news_by_id, parse_fields, SUMMARY_FIELDS, nest_row,
+    list_news_async, list_categories_async, list_agencies_async, export_news, home_news,
+)
 from ..security import require_ingest_api_key
+from ..counts import count_cache
+from .. import cache, replicas, rollup, stream
+from ..ingest_queue import ingest_queue
+from ..serialize import FAST_JSON, FULL_FIELDS, FastJSONResponse, envelope, dumps
 
 router = APIRouter(prefix="/api", tags=["news"])
 
-def _paginate_links(req: Request, *, limit: int, offset: int, total: int, count: int) -> MetaPagination:
-    # Build next/prev hrefs preserving current query params
-    def url_with(new_offset: int) -> str:
+def _paginate_links(
+    req: Request,
+    *,
+    limit: int,
+    offset: int,
+    total: int | None,
+    items: list,
+    has_more: bool,
+    cursor: str | None = None,
+    keyset: bool = True,
+) -> MetaPagination:
+    # Build next/prev hrefs preserving the other query params; cursor-based
+    # unless the ordering can't be expressed as a keyset (keyset=False)
+    def url_with(**params: str) -> str:
         from urllib.parse import urlencode
         qp = dict(req.query_params)
-        qp.update({"limit": str(limit), "offset": str(max(new_offset, 0))})
+        qp.pop("offset", None)
+        qp.pop("cursor", None)
+        qp.update({"limit": str(limit), **params})
         base = str(req.url).split("?")[0]
         return f"{base}?{urlencode(qp)}"
 
+    if cursor:
+        _, _, direction = decode_cursor(cursor)
+        has_next = has_more if direction == "next" else True
+        has_prev = has_more if direction == "prev" else True
+    else:
+        has_next = has_more
+        has_prev = offset > 0
+
     next_href = ""
     prev_href = ""
-    if offset + count < total:
-        next_href = url_with(offset + limit)
-    if offset > 0:
-        prev_href = url_with(max(offset - limit, 0))
+    if not keyset:
+        if has_next:
+            next_href = url_with(offset=str(offset + limit))
+        if has_prev:
+            prev_href = url_with(offset=str(max(offset - limit, 0)))
+    else:
+        if items and has_next:
+            next_href = url_with(cursor=encode_cursor(items[-1], "next"))
+        if items and has_prev:
+            prev_href = url_with(cursor=encode_cursor(items[0], "prev"))
 
     return MetaPagination(
         next=next_href,
         prev=prev_href,
-        current_page=count,
+        current_page=len(items),
         total_items=total,
     )
-@router.post("/news", response_model=EnvelopeSuccess, dependencies=[Depends(require_ingest_api_key)])
-def ingest_news(item: NewsCreate, db: Session = Depends(get_db)):
+
+def _accepted(items: List[NewsCreate]) -> JSONResponse:
+    # Write-behind mode: validated payload is durable in the local queue; the
+    # background writer commits it to Postgres (poll /api/ingest/{id})
+    ingest_id = ingest_queue.enqueue([item.model_dump() for item in items])
+    env = EnvelopeSuccess(
+        meta=MetaSuccess(),
+        data={"ingest_id": ingest_id, "status": "queued", "items": len(items), "status_url": f"/api/ingest/{ingest_id}"},
+    )
+    return JSONResponse(status_code=202, content=env.model_dump(), headers={"Location": f"/api/ingest/{ingest_id}"})
+
+@router.post(
+    "/news",
+    response_model=EnvelopeSuccess,
+    dependencies=[Depends(require_ingest_api_key)],
+    responses={202: {"description": "Queued for write-behind ingest (NEWS_INGEST_MODE=queue)"}},
+)
+def ingest_news(item: NewsCreate, response: Response, db: Session = Depends(get_db)):
+    if ingest_queue is not None:
+        return replicas.stick(_accepted([item]))
     try:
-        news, _ = create_news(
+        news, created = create_news(
             db,
             title=item.title,
             content=item.content,
@@ -48,67 +110,377 @@ def ingest_news(item: NewsCreate, db: Session = Depends(get_db)):
             pub_date=item.pubDate,
             link=item.link,
         )
+        # pubDate as stored (undated items get the ingest time)
+        counted = [(news.category_id, news.agency_id, news.pubDate)] if created else []
         db.commit()          # <-- commit the transaction
+        count_cache.on_ingest(counted)
+        cache.invalidate()
+        replicas.stick(response)
         db.refresh(news)     # <-- reload with DB state (ids, etc.)
+        if created:
+            stream.publish([stream.payload(news)])
         return EnvelopeSuccess(meta=MetaSuccess(), data={"news": NewsOut.model_validate(news)})
-    except Exception as e:
+    except Exception:
         db.rollback()        # <-- rollback on failure
         raise
 
-@router.post("/news/bulk", response_model=EnvelopeSuccess, dependencies=[Depends(require_ingest_api_key)])
-def ingest_news_bulk(payload: NewsCreateBulk, db: Session = Depends(get_db)):
-    out: List[NewsOut] = []
+@router.post(
+    "/news/bulk",
+    response_model=EnvelopeSuccess,
+    dependencies=[Depends(require_ingest_api_key)],
+    responses={202: {"description": "Queued for write-behind ingest (NEWS_INGEST_MODE=queue)"}},
+)
+def ingest_news_bulk(payload: NewsCreateBulk, response: Response, db: Session = Depends(get_db)):
+    if ingest_queue is not None:
+        return replicas.stick(_accepted(payload.items))
     try:
-        for item in payload.items:
-            news, _ = create_news(
-                db,
-                title=item.title,
-                content=item.content,
-                image_url=item.image_url,
-                category_id=item.category_id,
-                agency_id=item.agency_id,
-                pub_date=item.pubDate,
-                link=item.link,
-            )
-            out.append(NewsOut.model_validate(news))
+        rows = create_news_bulk(db, [item.model_dump() for item in payload.items])
+        out: List[NewsOut] = [NewsOut.model_validate(news) for news, _ in rows]
+        created = [(news.category_id, news.agency_id, news.pubDate) for news, is_new in rows if is_new]
+        pushed = [stream.payload(news) for news, is_new in rows if is_new]
         db.commit()          # <-- one commit for the whole batch
+        count_cache.on_ingest(created)
+        cache.invalidate()
+        replicas.stick(response)
+        stream.publish(pushed)
         return EnvelopeSuccess(meta=MetaSuccess(), data={"news": out})
     except Exception:
         db.rollback()
         raise
 
-@router.get("/news", response_model=EnvelopeSuccess)
-def get_news(
+# Repeatable id filter: ?category_id=1&category_id=4 matches either
+Ids = List[Annotated[int, Field(ge=1)]] | None
+
+class NewsListQuery:
+    """Query parameters of GET /api/news, shared by the sync and async handlers."""
+
+    def __init__(
+        self,
+        category_id: Ids = Query(None, description="Filter by category id; repeat for several"),
+        agency_id: Ids = Query(None, description="Filter by agency id; repeat for several"),
+        category: str | None = Query(None, description="Filter by category name"),
+        agency: str | None = Query(None, description="Filter by agency name"),
+        q: str | None = Query(None, description="Search title/content"),
+        search_mode: Literal["fts", "like"] = Query("fts", description="fts: indexed, Persian-normalized full-text; like: substring scan"),
+        cluster_id: uuid.UUID | None = Query(None, description="Only stories of this near-duplicate cluster"),
+        collapse: Literal["cluster"] | None = Query(None, description="cluster: one (newest) story per near-duplicate cluster"),
+        since: int | None = Query(None, description="pubDate lower bound, unix seconds (replaces the recent-months window)"),
+        until: int | None = Query(None, description="pubDate upper bound, unix seconds (exclusive)"),
+        history: bool = Query(False, description="Include stories older than the recent months (scans the whole archive)"),
+        order: Literal["date", "relevance"] = Query("date", description="relevance ranks full-text matches (offset paging only)"),
+        highlight: bool = Query(False, description="Include a <mark>-highlighted snippet per item"),
+        limit: int = Query(50, ge=1, le=200),
+        offset: int = Query(0, ge=0, description="Offset pagination (kept for compatibility; prefer cursor)"),
+        cursor: str | None = Query(None, description="Opaque keyset cursor from meta.pagination next/prev"),
+        include_total: bool | None = Query(
+            None, description="Compute meta.pagination.total_items; defaults to on for the first page only"
+        ),
+        view: Literal["full", "summary"] = Query(
+            "full", description="summary: card fields with a DB-truncated teaser instead of content"
+        ),
+        fields: str | None = Query(
+            None, description="Comma-separated projection, e.g. title,teaser,agency (overrides view)"
+        ),
+    ):
+        self.category_id = category_id
+        self.agency_id = agency_id
+        self.category = category
+        self.agency = agency
+        self.q = q
+        self.search_mode = search_mode
+        self.cluster_id = cluster_id
+        self.collapse = collapse
+        self.since = since
+        self.until = until
+        self.history = history
+        self.order = order
+        self.highlight = highlight
+        self.limit = limit
+        self.offset = offset
+        self.cursor = cursor
+        self.include_total = include_total if include_total is not None else not (cursor or offset)
+        try:
+            self.projection = parse_fields(fields) if fields else (list(SUMMARY_FIELDS) if view == "summary" else None)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        # Fast path: even the full view is read as plain rows and never touches NewsOut
+        self.fast_full = FAST_JSON and self.projection is None
+        if self.fast_full:
+            self.projection = list(FULL_FIELDS)
+
+    def list_kwargs(self) -> dict:
+        return dict(
+            category=self.category,
+            agency=self.agency,
+            category_id=self.category_id,
+            agency_id=self.agency_id,
+            q=self.q,
+            limit=self.limit,
+            offset=self.offset,
+            cursor=self.cursor,
+            search_mode=self.search_mode,
+            cluster_id=self.cluster_id,
+            collapse=self.collapse,
+            since=self.since,
+            until=self.until,
+            history=self.history,
+            order=self.order,
+            highlight=self.highlight,
+            include_total=self.include_total,
+            fields=self.projection,
+        )
+
+def _news_page(request: Request, query: NewsListQuery, total, items, has_more):
+    pagination = _paginate_links(
+        request, limit=query.limit, offset=query.offset, total=total, items=items, has_more=has_more,
+        cursor=query.cursor,
+        keyset=not (query.q and query.order == "relevance" and query.search_mode == "fts"),
+    )
+    if FAST_JSON:
+        if query.fast_full:
+            for n in items:
+                n.setdefault("snippet", None)
+        return FastJSONResponse(envelope({"news": items}, pagination.model_dump()))
+    items_out = items if query.projection is not None else [NewsOut.model_validate(n) for n in items]
+    return EnvelopeSuccess(meta=MetaSuccess(pagination=pagination), data={"news": items_out})
+
+# Read handlers: threadpool + psycopg2 by default (replicas when configured), asyncpg when NEWS_DB_ASYNC=1
+if USE_ASYNC_DB:
+    @router.get("/news", response_model=EnvelopeSuccess)
+    async def get_news(request: Request, db: AsyncSession = Depends(get_async_db), query: NewsListQuery = Depends()):
+        try:
+            total, items, has_more = await list_news_async(db, **query.list_kwargs())
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return _news_page(request, query, total, items, has_more)
+else:
+    @router.get("/news", response_model=EnvelopeSuccess)
+    def get_news(request: Request, db: Session = Depends(get_read_db), query: NewsListQuery = Depends()):
+        try:
+            total, items, has_more = list_news(db, **query.list_kwargs())
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return _news_page(request, query, total, items, has_more)
+
+@router.get("/home", response_model=EnvelopeSuccess)
+def get_home(
+    latest: int = Query(15, ge=0, le=100, description="Newest stories overall"),
+    per_category: int = Query(6, ge=0, le=50, description="Newest stories of every category (0 omits the sections)"),
+    per_agency: int = Query(0, ge=0, le=50, description="Newest stories of every agency (0 omits the sections)"),
+    category_id: Ids = Query(None, description="Only these categories; repeat for several"),
+    agency_id: Ids = Query(None, description="Only these agencies; repeat for several"),
+    since: int | None = Query(None, description="pubDate lower bound, unix seconds (default: the recent months)"),
+    fields: str | None = Query(None, description="Comma-separated projection (default: the summary view)"),
+    db: Session = Depends(get_read_db),
+):
+    """Everything a homepage renders in one round-trip and one query."""
+    try:
+        projection = parse_fields(fields) if fields else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    data = home_news(
+        db, latest=latest, per_category=per_category, per_agency=per_agency,
+        category_id=category_id, agency_id=agency_id, since=since, fields=projection,
+    )
+    if FAST_JSON:
+        return FastJSONResponse(envelope(data))
+    return EnvelopeSuccess(meta=MetaSuccess(), data=data)
+
+@router.get(
+    "/news/stream",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}, "description": "`news` events, one story each"}},
+)
+async def stream_news(
     request: Request,
-    db: Session = Depends(get_db),
-    category_id: int | None = Query(None, ge=1, description="Filter by category id"),
-    agency_id: int | None = Query(None, ge=1, description="Filter by agency id"),
+    category_id: Ids = Query(None, description="Only these categories; repeat for several"),
+    agency_id: Ids = Query(None, description="Only these agencies; repeat for several"),
+):
+    """Server-Sent Events: a `news` event per newly ingested story (summary view).
+
+    An `evicted` event ends the stream of a client that fell NEWS_STREAM_BUFFER
+    stories behind; reload the first page of GET /api/news, then reconnect.
+    """
+    sub = stream.broadcaster.subscribe(category_id, agency_id)
+    if sub is None:
+        raise HTTPException(status_code=503, detail="Too many live clients; poll GET /api/news instead")
+
+    async def body():
+        try:
+            yield stream.SSE_HELLO
+            while True:
+                if not await sub.wait(stream.HEARTBEAT_SECONDS):
+                    if await request.is_disconnected():
+                        break
+                    yield stream.SSE_PING
+                    continue
+                items = sub.drain()
+                if items:
+                    yield stream.sse_frames(items)
+                if sub.evicted:
+                    yield stream.SSE_EVICTED
+                    break
+        finally:
+            stream.broadcaster.unsubscribe(sub)
+
+    return StreamingResponse(
+        body(), media_type="text/event-stream",
+        # No proxy buffering, or events arrive in bursts
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.websocket("/news/ws")
+async def stream_news_ws(
+    websocket: WebSocket,
+    category_id: Ids = Query(None),
+    agency_id: Ids = Query(None),
+):
+    """WebSocket twin of /api/news/stream: one JSON text message per story."""
+    sub = stream.broadcaster.subscribe(category_id, agency_id)
+    await websocket.accept()
+    if sub is None:
+        await websocket.close(code=1013, reason="Too many live clients")
+        return
+
+    async def until_disconnect():
+        # Inbound frames (pings, keepalive text) are ignored; only a disconnect ends the stream
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    closed = asyncio.ensure_future(until_disconnect())
+    try:
+        while True:
+            ready = asyncio.ensure_future(sub.wait(stream.HEARTBEAT_SECONDS))
+            await asyncio.wait({ready, closed}, return_when=asyncio.FIRST_COMPLETED)
+            if closed.done():
+                ready.cancel()
+                break
+            for _, data in sub.drain():
+                await websocket.send_text(data)
+            if sub.evicted:
+                await websocket.close(code=1013, reason="evicted: slow consumer")
+                break
+    except WebSocketDisconnect:
+        pass
+    finally:
+        closed.cancel()
+        stream.broadcaster.unsubscribe(sub)
+
+def _export_lines(rows, fmt: str, header: List[str] | None) -> bytes:
+    if fmt == "csv":
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        if header:
+            writer.writerow([k.replace("__", "_") for k in header])
+        writer.writerows([["" if v is None else v for v in r.values()] for r in rows])
+        return buf.getvalue().encode("utf-8")
+    return b"".join(dumps(nest_row(r)) + b"\n" for r in rows)
+
+@router.get("/news/export")
+async def export_news_stream(
+    request: Request,
+    category_id: Ids = Query(None, description="Filter by category id; repeat for several"),
+    agency_id: Ids = Query(None, description="Filter by agency id; repeat for several"),
     category: str | None = Query(None, description="Filter by category name"),
     agency: str | None = Query(None, description="Filter by agency name"),
-    q: str | None = Query(None, description="Search title/content (LIKE)"),
-    limit: int = Query(50, ge=1, le=200),
-    offset: int = Query(0, ge=0),
+    q: str | None = Query(None, description="Search title/content"),
+    search_mode: Literal["fts", "like"] = Query("fts"),
+    since: int | None = Query(None, description="Watermark pubDate (unix seconds)"),
+    since_id: uuid.UUID | None = Query(None, description="Watermark id; with since, resume strictly after (since, since_id)"),
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    fields: str | None = Query(None, description="Comma-separated projection (default: everything but teaser)"),
 ):
-    total, items = list_news(
-        db,
-        category=category,
-        agency=agency,
-        category_id=category_id,
-        agency_id=agency_id,
-        q=q,
-        limit=limit,
-        offset=offset,
-    )
-    pagination = _paginate_links(request, limit=limit, offset=offset, total=total, count=len(items))
-    items_out = [NewsOut.model_validate(n) for n in items]
-    return EnvelopeSuccess(meta=MetaSuccess(pagination=pagination), data={"news": items_out})
+    """Stream all matching rows, oldest first, as NDJSON or CSV."""
+    if since_id is not None and since is None:
+        raise HTTPException(status_code=400, detail="since_id requires since")
+    try:
+        projection = parse_fields(fields) if fields else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def body():
+        # Own session: request-scoped dependencies are torn down before a
+        # streaming body runs, and the server-side cursor must outlive them
+        db = replicas.read_session(request)
+        batches = export_news(
+            db, category=category, agency=agency, category_id=category_id, agency_id=agency_id,
+            q=q, search_mode=search_mode, since=since, since_id=since_id, fields=projection,
+        )
+        first = True
+        try:
+            while True:
+                # Each batch is fetched off the event loop; the next one is only
+                # requested after the previous chunk was accepted by the client
+                batch = await run_in_threadpool(next, batches, None)
+                if batch is None or await request.is_disconnected():
+                    break
+                header = list(batch[0].keys()) if first else None
+                first = False
+                yield _export_lines(batch, format, header)
+        finally:
+            await run_in_threadpool(batches.close)
+            await run_in_threadpool(db.close)
+
+    media_type = "text/csv; charset=utf-8" if format == "csv" else "application/x-ndjson"
+    filename = f"news-export.{format}"
+    return StreamingResponse(body(), media_type=media_type, headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+
+@router.get("/news/{news_id:uuid}", response_model=EnvelopeSuccess)
+def get_news_item(news_id: uuid.UUID, db: Session = Depends(get_read_db)):
+    news = get_news_by_id(db, news_id)
+    if news is None:
+        raise HTTPException(status_code=404, detail="News not found")
+    return EnvelopeSuccess(meta=MetaSuccess(), data={"news": NewsOut.model_validate(news)})
+
+if USE_ASYNC_DB:
+    @router.get("/categories", response_model=EnvelopeSuccess)
+    async def get_categories(db: AsyncSession = Depends(get_async_db)):
+        cats = await list_categories_async(db)
+        return EnvelopeSuccess(meta=MetaSuccess(), data={"categories": [CategoryOut.model_validate(c) for c in cats]})
+
+    @router.get("/agencies", response_model=EnvelopeSuccess)
+    async def get_agencies(db: AsyncSession = Depends(get_async_db)):
+        ags = await list_agencies_async(db)
+        return EnvelopeSuccess(meta=MetaSuccess(), data={"agencies": [AgencyOut.model_validate(a) for a in ags]})
+else:
+    @router.get("/categories", response_model=EnvelopeSuccess)
+    def get_categories(db: Session = Depends(get_read_db)):
+        cats = list_categories(db)
+        return EnvelopeSuccess(meta=MetaSuccess(), data={"categories": [CategoryOut.model_validate(c) for c in cats]})
+
+    @router.get("/agencies", response_model=EnvelopeSuccess)
+    def get_agencies(db: Session = Depends(get_read_db)):
+        ags = list_agencies(db)
+        return EnvelopeSuccess(meta=MetaSuccess(), data={"agencies": [AgencyOut.model_validate(a) for a in ags]})
+
+@router.get("/stats", response_model=EnvelopeSuccess)
+def get_stats(
+    group_by: str = Query("category", description="Comma-separated: category, agency, hour or day (UTC); empty for the total only"),
+    category_id: Ids = Query(None, description="Filter by category id; repeat for several"),
+    agency_id: Ids = Query(None, description="Filter by agency id; repeat for several"),
+    since: int | None = Query(None, description="pubDate lower bound (unix seconds, rounded down to the hour)"),
+    until: int | None = Query(None, description="pubDate upper bound (unix seconds, rounded down to the hour, exclusive)"),
+    db: Session = Depends(get_read_db),
+):
+    """News counts from the hourly rollup; no scan of news however large it is."""
+    try:
+        groups = rollup.parse_group_by(group_by)
+        buckets, total = rollup.histogram(
+            db, groups, category_id=category_id, agency_id=agency_id, since=since, until=until
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return EnvelopeSuccess(meta=MetaSuccess(), data={"group_by": groups, "buckets": buckets, "total": total})
 
-@router.get("/categories", response_model=EnvelopeSuccess)
-def get_categories(db: Session = Depends(get_db)):
-    cats = list_categories(db)
-    return EnvelopeSuccess(meta=MetaSuccess(), data={"categories": [CategoryOut.model_validate(c) for c in cats]})
+@router.get("/ingest", response_model=EnvelopeSuccess, tags=["ingest"], dependencies=[Depends(require_ingest_api_key)])
+def ingest_queue_depth():
+    if ingest_queue is None:
+        raise HTTPException(status_code=404, detail="Write-behind ingest is disabled (NEWS_INGEST_MODE=sync)")
+    return EnvelopeSuccess(meta=MetaSuccess(), data={"queue": ingest_queue.depth()})
 
-@router.get("/agencies", response_model=EnvelopeSuccess)
-def get_agencies(db: Session = Depends(get_db)):
-    ags = list_agencies(db)
-    return EnvelopeSuccess(meta=MetaSuccess(), data={"agencies": [AgencyOut.model_validate(a) for a in ags]})
+@router.get("/ingest/{ingest_id}", response_model=EnvelopeSuccess, tags=["ingest"], dependencies=[Depends(require_ingest_api_key)])
+def ingest_status(ingest_id: str):
+    status = ingest_queue.status(ingest_id) if ingest_queue is not None else None
+    if status is None:
+        raise HTTPException(status_code=404, detail="Ingest id not found")
+    return EnvelopeSuccess(meta=MetaSuccess(), data={"ingest": status})
@@ -37,8 +37,10 @@ class NewsOut(BaseModel):
     image_url: Optional[str] = None
     pubDate: Optional[int] = None
     link: Optional[str] = None
+    cluster_id: Optional[uuid.UUID] = None  # shared by near-duplicate stories
     category: CategoryOut
     agency: AgencyOut
+    snippet: Optional[str] = None  # highlighted excerpt, only with highlight=true
     class Config:
         from_attributes = True
 
@@ -51,7 +53,7 @@ class MetaPagination(BaseModel):
     next: str
     prev: str
     current_page: int
-    total_items: int
+    total_items: Optional[int] = None  # null when include_total is off
 
 class MetaSuccess(BaseModel):
     success: bool = True
@@ -0,0 +1,126 @@
+"""Persian-aware full-text search helpers.
+
+Title and content are indexed through a stored, generated `news.search_vector`
+built from `news_normalize()`, a SQL function that folds the spelling variants
+Persian text arrives in (Arabic vs. Persian yeh/kaf, ZWNJ, diacritics, digits)
+so that queries and documents meet on the same form.
+"""
+import html
+import re
+from typing import List, Tuple
+
+from sqlalchemy import func
+
+TS_CONFIG = "simple"
+
+# Characters folded onto their Persian/ASCII equivalent ...
+_FOLD_FROM = (
+    "يى"  # Arabic yeh, alef maksura -> Persian yeh
+    "ك"  # Arabic kaf -> Persian kaf
+    "ۀة"  # heh with yeh above, teh marbuta -> heh
+    "أإٱ"  # hamza/wasla alef forms -> alef
+    + "".join(chr(0x06F0 + i) for i in range(10))   # Persian digits
+    + "".join(chr(0x0660 + i) for i in range(10))   # Arabic-Indic digits
+)
+_FOLD_TO = "ییکههااا" + "0123456789" * 2
+# ... and characters dropped entirely: ZWNJ, tatweel, harakat/tanwin, superscript alef
+_DROP = "\u200c\u0640" + "".join(chr(c) for c in range(0x064B, 0x0660)) + "\u0670"
+
+
+def _pg_unicode_literal(s: str) -> str:
+    return "U&'" + "".join(f"\\{ord(c):04X}" for c in s) + "'"
+
+
+NORMALIZE_FN_SQL = f"""
+CREATE OR REPLACE FUNCTION news_normalize(t text) RETURNS text
+LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+  SELECT lower(translate(coalesce(t, ''),
+                         {_pg_unicode_literal(_FOLD_FROM + _DROP)},
+                         {_pg_unicode_literal(_FOLD_TO)}))
+$$
+"""
+
+SEARCH_VECTOR_SQL = (
+    f"setweight(to_tsvector('{TS_CONFIG}', news_normalize(title)), 'A') || "
+    f"setweight(to_tsvector('{TS_CONFIG}', news_normalize(content)), 'B')"
+)
+
+# Highlighted snippets: up to HEADLINE_FRAGMENTS excerpts, HEADLINE_WORDS words in all
+HEADLINE_WORDS = 35
+HEADLINE_FRAGMENTS = 2
+HEADLINE_START, HEADLINE_STOP = "<mark>", "</mark>"
+
+_TABLE = {ord(a): b for a, b in zip(_FOLD_FROM, _FOLD_TO)}
+_TABLE.update({ord(c): None for c in _DROP})
+# Word tokens of normalized text, as the `simple` parser splits them
+_WORD = re.compile(r"\w+")
+# websearch_to_tsquery syntax: -excluded terms and the OR keyword match nothing
+_EXCLUDED = re.compile(r"(?:^|\s)-\w+")
+
+
+def normalize(text: str) -> str:
+    """Python mirror of news_normalize(), for callers that need it client-side."""
+    return (text or "").translate(_TABLE).lower()
+
+
+def _normalize_mapped(text: str) -> Tuple[str, List[int]]:
+    # normalize(), plus the index in `text` of every normalized character
+    out: List[str] = []
+    origin: List[int] = []
+    for i, ch in enumerate(text):
+        folded = ch.translate(_TABLE).lower()
+        out.append(folded)
+        origin.extend([i] * len(folded))
+    return "".join(out), origin
+
+
+def headline(text: str, q: str) -> str:
+    """Excerpt of `text` with the words of search `q` wrapped in <mark>.
+
+    Matching happens on normalized text, the way the search_vector matched the
+    row, but the excerpt is cut from the original, so readers see the article's
+    own spelling. The result is HTML: the text is escaped (stored content is
+    entity-decoded plain text) and only the <mark> tags are markup.
+    """
+    text = text or ""
+    terms = set(_WORD.findall(_EXCLUDED.sub(" ", normalize(q)))) - {"or"}
+    norm, origin = _normalize_mapped(text)
+    # Token spans in `text`
+    words = [(origin[m.start()], origin[m.end() - 1] + 1, m.group() in terms) for m in _WORD.finditer(norm)]
+    if not words:
+        return html.escape(text[:HEADLINE_WORDS * 8])
+
+    hits = [i for i, (_, _, hit) in enumerate(words) if hit]
+    if not hits:
+        return html.escape(text[:words[min(HEADLINE_WORDS, len(words)) - 1][1]])
+
+    # Windows of words around the first hits, merged where they touch
+    per = max(1, HEADLINE_WORDS // HEADLINE_FRAGMENTS)
+    windows: List[List[int]] = []
+    for i in hits:
+        if len(windows) == HEADLINE_FRAGMENTS:
+            break
+        if windows and i < windows[-1][1]:
+            continue
+        lo = max(0, i - per // 3)
+        hi = min(len(words), lo + per)
+        if windows and lo <= windows[-1][1]:
+            windows[-1][1] = hi
+        else:
+            windows.append([lo, hi])
+
+    fragments = []
+    for lo, hi in windows:
+        parts = []
+        pos = words[lo][0]
+        for start, end, hit in words[lo:hi]:
+            if hit:
+                parts.append(html.escape(text[pos:start]) + HEADLINE_START + html.escape(text[start:end]) + HEADLINE_STOP)
+                pos = end
+        parts.append(html.escape(text[pos:words[hi - 1][1]]))
+        fragments.append("".join(parts))
+    return " ... ".join(fragments)
+
+
+def ts_query(q: str):
+    return func.websearch_to_tsquery(TS_CONFIG, func.news_normalize(q))
@@ -0,0 +1,141 @@
+"""Fast JSON path for the read endpoints.
+
+The default path validates every row into NewsOut, wraps it in
+EnvelopeSuccess and runs jsonable_encoder before json.dumps. For list pages
+the fast path builds the envelope from projected row dicts and encodes it in
+one call, with orjson when it is installed. The bytes on the wire are the same
+as EnvelopeSuccess(...) rendered by FastAPI's JSONResponse.
+
+Compression is negotiated per request by CompressionMiddleware: brotli when
+the client accepts it and the `brotli` package is installed, else gzip.
+"""
+import gzip
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional
+
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional
+    brotli = None
+
+FAST_JSON = os.getenv("NEWS_FAST_JSON", "1") != "0"
+COMPRESS_MIN_BYTES = int(os.getenv("NEWS_COMPRESS_MIN_BYTES", "1024"))
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 4
+
+# Projection matching NewsOut field-for-field, in NewsOut's key order
+FULL_FIELDS = ("id", "title", "content", "image_url", "pubDate", "link", "cluster_id", "category", "agency")
+
+
+def dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        # default=str covers driver types orjson doesn't know, e.g. asyncpg's UUID
+        return orjson.dumps(obj, default=str)
+    # Same settings as starlette's JSONResponse.render
+    return json.dumps(obj, ensure_ascii=False, allow_nan=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def envelope(data: Any, pagination: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Plain-dict twin of EnvelopeSuccess(meta=MetaSuccess(pagination=...), data=...)."""
+    return {"meta": {"success": True, "pagination": pagination}, "data": data}
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+CODINGS = ("br", "gzip")
+_CODING_SUFFIX = re.compile(r'-(?:br|gzip)"$')
+
+
+def coded_etag(etag: str, coding: str) -> str:
+    """ETag of the `coding`-compressed representation: "abc" -> "abc-gzip"."""
+    return f'{etag[:-1]}-{coding}"'
+
+
+def if_none_match_tags(header: Optional[str]) -> List[str]:
+    """Entity tags of an If-None-Match header, W/ prefixes dropped (weak comparison)."""
+    return [t.strip().removeprefix("W/") for t in (header or "").split(",") if t.strip()]
+
+
+def uncoded_etag(tag: str) -> str:
+    """Inverse of coded_etag(); other tags come back unchanged."""
+    return _CODING_SUFFIX.sub('"', tag)
+
+
+def _accepts(header: str, coding: str) -> bool:
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        if name.strip().lower() == coding:
+            return params.replace(" ", "") not in ("q=0", "q=0.0")
+    return False
+
+
+class CompressionMiddleware(BaseHTTPMiddleware):
+    """Compress JSON bodies; streaming types (NDJSON, SSE) pass through untouched."""
+
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+        if response.status_code == 304:
+            return self._not_modified(request, response)
+        accept = request.headers.get("accept-encoding", "")
+        ctype = response.headers.get("content-type", "")
+        if (
+            not accept
+            or not ctype.startswith("application/json")
+            or "content-encoding" in response.headers
+            or response.status_code not in (200, 201)
+        ):
+            return response
+
+        if brotli is not None and _accepts(accept, "br"):
+            coding = "br"
+        elif _accepts(accept, "gzip"):
+            coding = "gzip"
+        else:
+            return response
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        headers = {k: v for k, v in response.headers.items() if k.lower() != "content-length"}
+        headers["Vary"] = "Accept-Encoding"
+        if len(body) < COMPRESS_MIN_BYTES:
+            return Response(content=body, status_code=response.status_code, headers=headers)
+
+        if coding == "br":
+            body = brotli.compress(body, quality=BROTLI_QUALITY)
+        else:
+            body = gzip.compress(body, compresslevel=GZIP_LEVEL)
+        headers["Content-Encoding"] = coding
+        etag = headers.get("etag")
+        if etag and etag.endswith('"'):
+            # A different representation needs a different strong validator
+            headers["etag"] = coded_etag(etag, coding)
+        return Response(content=body, status_code=response.status_code, headers=headers)
+
+    @staticmethod
+    def _not_modified(request: Request, response: Response) -> Response:
+        # The 304 must carry the validator of the representation the client
+        # holds, i.e. the suffixed one it revalidated with
+        etag = response.headers.get("etag")
+        if etag and etag.endswith('"'):
+            sent = if_none_match_tags(request.headers.get("if-none-match"))
+            for coding in CODINGS:
+                if coded_etag(etag, coding) in sent:
+                    response.headers["etag"] = coded_etag(etag, coding)
+                    response.headers["vary"] = "Accept-Encoding"
+                    break
+        return response
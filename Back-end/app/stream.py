@@ -0,0 +1,273 @@
+"""Live push of newly ingested stories (GET /api/news/stream, /api/news/ws).
+
+The ingest paths turn each created row into a summary payload before they
+commit and call publish() after the commit. The in-process Broadcaster
+encodes each story once and hands it to every subscriber whose
+category/agency filter matches, on the event loop; clients then wait on
+memory instead of re-polling GET /api/news.
+
+Every subscriber has a bounded buffer (NEWS_STREAM_BUFFER stories). One that
+falls that far behind is evicted: its stream gets an `evicted` event and
+ends, and the client reloads the first page before reconnecting, so a slow
+tab never holds more than that. NEWS_STREAM_MAX_CLIENTS caps subscribers
+per process.
+
+Fan-out (NEWS_STREAM_FANOUT):
+  local     stories reach the clients of the process that ingested them
+            (default; enough for one worker)
+  postgres  publish() sends pg_notify on NEWS_STREAM_CHANNEL and every
+            worker's listener thread feeds its own broadcaster, so clients
+            see ingest from any worker, the write-behind queue included
+"""
+import asyncio
+import json
+import logging
+import os
+import select
+import threading
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import text
+
+from .counts import Ids, id_set
+from .crud import TEASER_CHARS
+
+STREAM_FANOUT = os.getenv("NEWS_STREAM_FANOUT", "local")
+STREAM_CHANNEL = os.getenv("NEWS_STREAM_CHANNEL", "news_stream")
+STREAM_BUFFER = int(os.getenv("NEWS_STREAM_BUFFER", "256"))
+STREAM_MAX_CLIENTS = int(os.getenv("NEWS_STREAM_MAX_CLIENTS", "1000"))
+HEARTBEAT_SECONDS = float(os.getenv("NEWS_STREAM_HEARTBEAT", "15"))
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+_NOTIFY_MAX_BYTES = 7900
+
+log = logging.getLogger("news-stream")
+
+
+def payload(news) -> Dict[str, Any]:
+    """Summary-view dict of a created News row; call before commit expires it."""
+    return {
+        "id": str(news.id),
+        "title": news.title,
+        "teaser": news.content[:TEASER_CHARS],
+        "image_url": news.image_url,
+        "pubDate": news.pubDate,
+        "link": news.link,
+        "cluster_id": str(news.cluster_id) if news.cluster_id else None,
+        "category": {"id": news.category.id, "name": news.category.name},
+        "agency": {
+            "id": news.agency.id,
+            "name": news.agency.name,
+            "website": news.agency.website,
+            "image_url": news.agency.image_url,
+        },
+    }
+
+
+class Subscriber:
+    def __init__(self, category_ids: Optional[Tuple[int, ...]], agency_ids: Optional[Tuple[int, ...]]):
+        self.category_ids = category_ids
+        self.agency_ids = agency_ids
+        self.buffer: deque = deque()
+        self.evicted = False
+        self._ready = asyncio.Event()
+
+    def matches(self, category_id: int, agency_id: int) -> bool:
+        return (self.category_ids is None or category_id in self.category_ids) and (
+            self.agency_ids is None or agency_id in self.agency_ids
+        )
+
+    async def wait(self, timeout: float) -> bool:
+        """True once stories (or an eviction) are pending, False on timeout."""
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def drain(self) -> List[Tuple[str, str]]:
+        self._ready.clear()
+        items = list(self.buffer)
+        self.buffer.clear()
+        return items
+
+
+class Broadcaster:
+    def __init__(self, buffer: int = STREAM_BUFFER, max_clients: int = STREAM_MAX_CLIENTS):
+        self.buffer = buffer
+        self.max_clients = max_clients
+        self.evictions = 0
+        self._subscribers: set = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def subscribe(self, category_id: Ids = None, agency_id: Ids = None) -> Optional[Subscriber]:
+        """Register a client (on the event loop); None when the process is at NEWS_STREAM_MAX_CLIENTS."""
+        if len(self._subscribers) >= self.max_clients:
+            return None
+        self._loop = asyncio.get_running_loop()
+        sub = Subscriber(id_set(category_id), id_set(agency_id))
+        self._subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscriber) -> None:
+        self._subscribers.discard(sub)
+
+    def clients(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, items: List[Dict[str, Any]]) -> None:
+        """Queue stories for the matching subscribers; safe to call from any thread."""
+        loop = self._loop
+        if not items or loop is None or not self._subscribers:
+            return
+        # Encoded once, whatever the number of clients
+        encoded = [
+            (item["category"]["id"], item["agency"]["id"], item["id"], json.dumps(item, ensure_ascii=False))
+            for item in items
+        ]
+        try:
+            loop.call_soon_threadsafe(self._deliver, encoded)
+        except RuntimeError:
+            # Loop already closed (shutdown)
+            pass
+
+    def _deliver(self, encoded) -> None:
+        for sub in list(self._subscribers):
+            pending = [(news_id, data) for category_id, agency_id, news_id, data in encoded
+                       if sub.matches(category_id, agency_id)]
+            if not pending:
+                continue
+            if len(sub.buffer) + len(pending) > self.buffer:
+                # Slow consumer: drop it rather than buffer without bound
+                sub.buffer.clear()
+                sub.evicted = True
+                self._subscribers.discard(sub)
+                self.evictions += 1
+            else:
+                sub.buffer.extend(pending)
+            sub._ready.set()
+
+
+broadcaster = Broadcaster()
+
+
+def publish(items: List[Dict[str, Any]]) -> None:
+    """Push created stories to live clients; call after the ingest commit."""
+    if not items:
+        return
+    if STREAM_FANOUT != "postgres":
+        broadcaster.publish(items)
+        return
+    try:
+        _notify(items)
+    except Exception:
+        # Live push is best effort; the stories are committed either way
+        log.exception("pg_notify for %d stories failed", len(items))
+
+
+def _chunks(items: List[Dict[str, Any]]) -> Iterable[str]:
+    # JSON arrays of stories, each under the NOTIFY payload limit
+    batch: List[str] = []
+    size = 2
+    for item in items:
+        encoded = json.dumps(item, ensure_ascii=False)
+        n = len(encoded.encode()) + 1
+        if n + 2 > _NOTIFY_MAX_BYTES:
+            log.warning("Story %s too large to NOTIFY; not pushed", item["id"])
+            continue
+        if batch and size + n > _NOTIFY_MAX_BYTES:
+            yield "[" + ",".join(batch) + "]"
+            batch, size = [], 2
+        batch.append(encoded)
+        size += n
+    if batch:
+        yield "[" + ",".join(batch) + "]"
+
+
+def _notify(items: List[Dict[str, Any]]) -> None:
+    from .database import engine
+
+    params = [{"channel": STREAM_CHANNEL, "payload": chunk} for chunk in _chunks(items)]
+    if not params:
+        return
+    with engine.connect() as conn:
+        conn.execute(text("SELECT pg_notify(:channel, :payload)"), params)
+        conn.commit()
+
+
+# ---------- Cross-worker listener (NEWS_STREAM_FANOUT=postgres) ----------
+
+class NotifyListener(threading.Thread):
+    """LISTENs on STREAM_CHANNEL over a dedicated connection and feeds the broadcaster."""
+
+    def __init__(self):
+        super().__init__(name="news-stream-listener", daemon=True)
+        self._stop_event = threading.Event()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def run(self) -> None:
+        from .database import engine
+
+        backoff = 1.0
+        while not self._stop_event.is_set():
+            conn = None
+            try:
+                conn = engine.raw_connection()
+                # Held for the process lifetime: not returned to the pool
+                conn.detach()
+                dbapi = conn.dbapi_connection
+                dbapi.autocommit = True
+                dbapi.cursor().execute(f'LISTEN "{STREAM_CHANNEL}"')
+                backoff = 1.0
+                while not self._stop_event.is_set():
+                    if select.select([dbapi], [], [], 1.0)[0]:
+                        dbapi.poll()
+                        while dbapi.notifies:
+                            note = dbapi.notifies.pop(0)
+                            try:
+                                broadcaster.publish(json.loads(note.payload))
+                            except ValueError:
+                                log.warning("Ignoring malformed %s payload", STREAM_CHANNEL)
+            except Exception:
+                log.exception("Stream listener failed; reconnecting in %.0fs", backoff)
+                self._stop_event.wait(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+
+
+_listener: Optional[NotifyListener] = None
+
+
+def start_listener() -> None:
+    global _listener
+    if STREAM_FANOUT != "postgres" or _listener is not None:
+        return
+    _listener = NotifyListener()
+    _listener.start()
+
+
+def stop_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener.join(timeout=5)
+        _listener = None
+
+
+# ---------- Wire formats ----------
+
+def sse_frames(items: List[Tuple[str, str]]) -> bytes:
+    return "".join(f"event: news\nid: {news_id}\ndata: {data}\n\n" for news_id, data in items).encode()
+
+
+# retry: how long EventSource waits before reconnecting
+SSE_HELLO = b"retry: 5000\n: connected\n\n"
+SSE_PING = b": ping\n\n"
+SSE_EVICTED = b'event: evicted\ndata: {"reason": "slow consumer"}\n\n'
@@ -0,0 +1,116 @@
+"""Per-item cost of bulk ingest: create_news loop vs create_news_bulk.
+
+Runs against DATABASE_URL (seeded categories/agencies required). Every run is
+rolled back, so the table is left untouched.
+
+    cd Back-end && python -m bench.bulk_ingest --sizes 10 100 1000 --repeat 3
+"""
+import argparse
+import json
+import time
+import uuid
+
+from sqlalchemy import event
+
+from app.database import SessionLocal, engine
+from app.crud import create_news, create_news_bulk
+
+_queries = 0
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _count(conn, cursor, statement, parameters, context, executemany):
+    global _queries
+    _queries += 1
+
+
+def make_items(n: int, dup_ratio: float = 0.1):
+    run = uuid.uuid4().hex[:8]
+    n_dup = int(n * dup_ratio)
+    items = []
+    for i in range(n - n_dup):
+        items.append({
+            "title": f"خبر آزمایشی {run} شماره {i}",
+            "content": "متن آزمایشی " * 40,
+            "image_url": None if i % 3 else f"https://example.com/{run}/{i}.jpg",
+            "category_id": 1 + i % 6,
+            "agency_id": 1 + i % 9,
+            "pubDate": 1_700_000_000 + i,
+            "link": f"https://example.com/{run}/{i}",
+        })
+    # Repeat a slice of the batch to exercise the in-batch dedup/backfill path
+    items.extend(dict(it, image_url=f"https://example.com/{run}/dup.jpg") for it in items[:n_dup])
+    return items
+
+
+def run_loop(items):
+    db = SessionLocal()
+    try:
+        for it in items:
+            create_news(
+                db,
+                title=it["title"],
+                content=it["content"],
+                image_url=it["image_url"],
+                category_id=it["category_id"],
+                agency_id=it["agency_id"],
+                pub_date=it["pubDate"],
+                link=it["link"],
+            )
+        db.flush()
+    finally:
+        db.rollback()
+        db.close()
+
+
+def run_bulk(items):
+    db = SessionLocal()
+    try:
+        create_news_bulk(db, items)
+        db.flush()
+    finally:
+        db.rollback()
+        db.close()
+
+
+def measure(fn, items, repeat: int):
+    global _queries
+    best = float("inf")
+    queries = 0
+    for _ in range(repeat):
+        _queries = 0
+        t0 = time.perf_counter()
+        fn(items)
+        best = min(best, time.perf_counter() - t0)
+        queries = _queries
+    return best, queries
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--json", action="store_true", help="emit one JSON object per line")
+    args = ap.parse_args()
+
+    if not args.json:
+        print(f"{'items':>6} {'path':>5} {'total ms':>10} {'ms/item':>9} {'queries':>8}")
+    for n in args.sizes:
+        items = make_items(n)
+        for name, fn in (("loop", run_loop), ("bulk", run_bulk)):
+            secs, queries = measure(fn, items, args.repeat)
+            row = {
+                "items": len(items),
+                "path": name,
+                "total_ms": round(secs * 1000, 2),
+                "ms_per_item": round(secs * 1000 / len(items), 4),
+                "queries": queries,
+            }
+            if args.json:
+                print(json.dumps(row))
+            else:
+                print(f"{row['items']:>6} {name:>5} {row['total_ms']:>10} {row['ms_per_item']:>9} {queries:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Concurrency ramp against one running API worker (threadpool vs. asyncpg).
+
+Opens N concurrent clients that each loop on a GET for a fixed time and
+reports throughput, latency percentiles and failures per level. Run it once
+per mode against a single worker and compare where latency breaks down:
+
+    NEWS_DB_ASYNC=0 uvicorn app.main:app --workers 1 --port 8000
+    NEWS_DB_ASYNC=1 uvicorn app.main:app --workers 1 --port 8001
+    python -m bench.concurrency --base http://localhost:8000 --levels 10 50 100 200 400
+    python -m bench.concurrency --base http://localhost:8001 --levels 10 50 100 200 400
+
+Set NEWS_CACHE_BACKEND=off on the server, or every request after the first is
+a cache hit, and NEWS_RATE_LIMIT=0, or all clients share one rate limit.
+With the admission gate on (NEWS_DB_CONCURRENCY), overload shows up as
+fast 503s in the failures instead of rising latency. Needs `httpx` (pip install httpx).
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import httpx
+
+DEFAULT_PATH = "/api/news?limit=50&view=summary&include_total=true&search_mode=like&q=%D8%AF%D9%84%D8%A7%D8%B1"
+
+
+def percentile(values, pct: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+async def client_loop(client: httpx.AsyncClient, url: str, deadline: float, latencies: list, errors: list):
+    while time.perf_counter() < deadline:
+        t0 = time.perf_counter()
+        try:
+            resp = await client.get(url)
+            if resp.status_code == 200:
+                latencies.append((time.perf_counter() - t0) * 1000)
+            else:
+                errors.append(resp.status_code)
+        except httpx.HTTPError as e:
+            errors.append(type(e).__name__)
+
+
+async def run_level(base: str, path: str, clients: int, seconds: float, timeout: float) -> dict:
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    latencies: list = []
+    errors: list = []
+    async with httpx.AsyncClient(base_url=base, limits=limits, timeout=timeout) as client:
+        deadline = time.perf_counter() + seconds
+        t0 = time.perf_counter()
+        await asyncio.gather(*(client_loop(client, path, deadline, latencies, errors) for _ in range(clients)))
+        elapsed = time.perf_counter() - t0
+    return {
+        "clients": clients,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 1),
+        "p95_ms": round(percentile(latencies, 95), 1),
+        "p99_ms": round(percentile(latencies, 99), 1),
+        "mean_ms": round(statistics.fmean(latencies), 1) if latencies else 0.0,
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--base", default="http://localhost:8000")
+    ap.add_argument("--path", default=DEFAULT_PATH)
+    ap.add_argument("--levels", type=int, nargs="+", default=[10, 50, 100, 200, 400])
+    ap.add_argument("--seconds", type=float, default=15.0)
+    ap.add_argument("--timeout", type=float, default=10.0)
+    ap.add_argument("--json", action="store_true", help="emit one JSON object per line")
+    args = ap.parse_args()
+
+    for level in args.levels:
+        row = asyncio.run(run_level(args.base, args.path, level, args.seconds, args.timeout))
+        if args.json:
+            print(json.dumps(row))
+        else:
+            print(
+                f"{row['clients']:>5} clients  {row['rps']:>8} req/s  p50 {row['p50_ms']:>7}  "
+                f"p95 {row['p95_ms']:>7}  p99 {row['p99_ms']:>7} ms  errors {row['errors']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
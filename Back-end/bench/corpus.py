@@ -0,0 +1,154 @@
+"""Synthetic Persian news corpus for the benchmarks.
+
+Rows are spread over the categories (1-6) and agencies (1-9) seeded by
+init_news.sql, with Zipf-distributed words so common terms are common and
+rare ones are rare, like real headlines. Loading goes through COPY, which
+is what makes millions of rows practical; every row's link starts with
+bench:// so --cleanup removes exactly what was added.
+
+    cd Back-end && python -m bench.corpus --rows 2000000
+    cd Back-end && python -m bench.corpus --cleanup
+
+The generated search_vector is filled by Postgres. Near-duplicate clusters
+are not (COPY bypasses crud); run `python -m app.clustering rebuild` after
+loading if a benchmark needs them. The /api/stats rollup is recounted after
+loading and cleanup.
+"""
+import argparse
+import io
+import itertools
+import random
+import time
+import uuid
+from typing import Iterator, List
+
+from sqlalchemy import delete, text
+
+from app import models, partitions, rollup
+from app.database import SessionLocal, engine
+
+BENCH_LINK_PREFIX = "bench://"
+
+WORDS = (
+    "مجلس دولت اقتصاد بازار ارز دلار تورم بورس نفت صادرات واردات انتخابات وزیر رئیس جمهور "
+    "تیم فوتبال لیگ برتر استقلال پرسپولیس جام جهانی مربی بازیکن گل قهرمانی "
+    "دانشگاه مدرسه آموزش دانشجو کنکور بهداشت بیمارستان کرونا واکسن آب برق گاز "
+    "فیلم سینما جشنواره کتاب موسیقی تئاتر هنرمند نمایشگاه فناوری اینترنت هوش مصنوعی "
+    "استارتاپ موبایل ماهواره فضا پژوهش تهران مشهد اصفهان شیراز تبریز خبرگزاری گزارش "
+    "قیمت افزایش کاهش سال امروز هفته ماه مردم کشور ایران جهان منطقه شهر استان "
+    "طرح قانون لایحه بودجه یارانه مالیات بانک مرکزی سکه طلا خودرو مسکن اجاره "
+    "سازمان شرکت کارخانه تولید کارگر حقوق بازنشستگان بیمه درمان دارو پزشک پرستار "
+    "محیط زیست آلودگی هوا باران سیل زلزله خشکسالی کشاورزی گندم برنج "
+    "دیدار مذاکره توافق تحریم سفیر سفر نشست همایش کنفرانس بیانیه واکنش"
+).split()
+
+# Zipf weights: the k-th word is 1/k as likely as the first
+_CUM_WEIGHTS = list(itertools.accumulate(1.0 / (k + 1) for k in range(len(WORDS))))
+
+CATEGORY_IDS = range(1, 7)
+AGENCY_IDS = range(1, 10)
+
+COPY_COLUMNS = '(id, title, content, image_url, category_id, agency_id, "pubDate", link)'
+
+
+def sentence(rng: random.Random, n: int) -> str:
+    return " ".join(rng.choices(WORDS, cum_weights=_CUM_WEIGHTS, k=n))
+
+
+def generate(rows: int, seed: int = 42, days: int = 365) -> Iterator[List]:
+    """Yield [id, title, content, image_url, category_id, agency_id, pubDate, link] rows."""
+    rng = random.Random(seed)
+    run = uuid.uuid4().hex[:8]
+    now = int(time.time())
+    for i in range(rows):
+        yield [
+            str(uuid.uuid4()),
+            # The suffix keeps (lower(title), category_id) unique
+            f"{sentence(rng, rng.randint(6, 12))} {run}-{i}",
+            sentence(rng, rng.randint(80, 300)),
+            f"https://img.example.com/{run}/{i}.jpg" if rng.random() < 0.7 else None,
+            rng.choice(CATEGORY_IDS),
+            rng.choice(AGENCY_IDS),
+            now - rng.randint(0, days * 86400),
+            f"{BENCH_LINK_PREFIX}{run}/{i}",
+        ]
+
+
+def _copy_chunk(rows: List[List]) -> io.StringIO:
+    # COPY text format; the synthetic text never contains tabs, newlines or backslashes
+    buf = io.StringIO()
+    for row in rows:
+        buf.write("\t".join(r"\N" if v is None else str(v) for v in row))
+        buf.write("\n")
+    buf.seek(0)
+    return buf
+
+
+def load(rows: int, batch: int = 50_000, seed: int = 42, days: int = 365) -> None:
+    # Month partitions for the whole spread, so rows don't pile up in the default one
+    db = SessionLocal()
+    try:
+        partitions.ensure(db, since=int(time.time()) - days * 86400)
+        db.commit()
+    finally:
+        db.close()
+
+    raw = engine.raw_connection()
+    try:
+        cur = raw.cursor()
+        done = 0
+        t0 = time.perf_counter()
+        it = generate(rows, seed=seed, days=days)
+        while True:
+            chunk = list(itertools.islice(it, batch))
+            if not chunk:
+                break
+            cur.copy_expert(f"COPY news {COPY_COLUMNS} FROM STDIN", _copy_chunk(chunk))
+            raw.commit()
+            done += len(chunk)
+            print(f"loaded {done}/{rows} ({done / (time.perf_counter() - t0):.0f} rows/s)", flush=True)
+        cur.execute("ANALYZE news")
+        raw.commit()
+    finally:
+        raw.close()
+    _recount()
+
+
+def _recount() -> None:
+    db = SessionLocal()
+    try:
+        rollup.rebuild(db)
+        db.commit()
+    finally:
+        db.close()
+
+
+def cleanup() -> None:
+    db = SessionLocal()
+    try:
+        db.execute(delete(models.News).where(models.News.link.startswith(BENCH_LINK_PREFIX)))
+        db.commit()
+        db.execute(text("ANALYZE news"))
+        db.commit()
+    finally:
+        db.close()
+    _recount()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--batch", type=int, default=50_000)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--days", type=int, default=365, help="spread pubDate over this many past days")
+    ap.add_argument("--cleanup", action="store_true", help="delete all synthetic rows and exit")
+    args = ap.parse_args()
+
+    if args.cleanup:
+        cleanup()
+        return
+    load(args.rows, batch=args.batch, seed=args.seed, days=args.days)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Indexed full-text search vs. the LIKE scan on a synthetic Persian corpus.
+
+    cd Back-end && python -m bench.search --seed 200000   # once; rows are tagged bench://
+    cd Back-end && python -m bench.search --repeat 5
+    cd Back-end && python -m bench.search --cleanup
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+import uuid
+
+from app.crud import create_news_bulk, list_news
+from app.database import SessionLocal
+
+from .corpus import BENCH_LINK_PREFIX, cleanup, sentence
+
+QUERIES = ["پرسپولیس", "دلار", "هوش مصنوعی", "جشنواره فیلم", "واکسن کرونا", "كتاب"]  # last one uses Arabic kaf
+
+
+def seed(rows: int, batch: int = 1000) -> None:
+    rng = random.Random(42)
+    run = uuid.uuid4().hex[:8]
+    now = int(time.time())
+    db = SessionLocal()
+    try:
+        for start in range(0, rows, batch):
+            items = [
+                {
+                    "title": f"{sentence(rng, 8)} {run}-{i}",
+                    "content": sentence(rng, 250),
+                    "image_url": None,
+                    "category_id": rng.randint(1, 6),
+                    "agency_id": rng.randint(1, 9),
+                    "pubDate": now - rng.randint(0, 365 * 86400),
+                    "link": f"{BENCH_LINK_PREFIX}{run}/{i}",
+                }
+                for i in range(start, min(start + batch, rows))
+            ]
+            create_news_bulk(db, items)
+            db.commit()
+            db.expunge_all()
+            print(f"seeded {min(start + batch, rows)}/{rows}", flush=True)
+    finally:
+        db.close()
+
+
+def run(repeat: int, as_json: bool) -> None:
+    db = SessionLocal()
+    try:
+        for q in QUERIES:
+            for mode, order in (("like", "date"), ("fts", "date"), ("fts", "relevance")):
+                timings = []
+                total = 0
+                for _ in range(repeat):
+                    t0 = time.perf_counter()
+                    total, _, _ = list_news(db, q=q, limit=20, search_mode=mode, order=order)
+                    timings.append((time.perf_counter() - t0) * 1000)
+                    db.expunge_all()
+                row = {
+                    "q": q,
+                    "mode": mode,
+                    "order": order,
+                    "matches": total,
+                    "median_ms": round(statistics.median(timings), 2),
+                    "min_ms": round(min(timings), 2),
+                }
+                if as_json:
+                    print(json.dumps(row, ensure_ascii=False))
+                else:
+                    print(f"{q:>14} {mode:>4} {order:>9} {total:>8} {row['median_ms']:>10} ms")
+    finally:
+        db.close()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--seed", type=int, default=0, help="insert N synthetic rows first")
+    ap.add_argument("--cleanup", action="store_true", help="delete all synthetic rows and exit")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--json", action="store_true", help="emit one JSON object per line")
+    args = ap.parse_args()
+
+    if args.cleanup:
+        cleanup()
+        return
+    if args.seed:
+        seed(args.seed)
+    run(args.repeat, args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+"""End-to-end API benchmark: list, filter, search, deep pagination, home, stats, bulk ingest.
+
+Drives the real FastAPI app in-process (routing, validation, serialization,
+SQL) against DATABASE_URL, one request at a time, and records per scenario
+p50/p95/p99 latency, requests/second, SQL statements per request and errors.
+The response cache is switched off so every request reaches Postgres.
+
+    cd Back-end && python -m bench.corpus --rows 2000000          # once
+    cd Back-end && python -m bench.suite --out bench-$(git rev-parse --short HEAD).json
+    cd Back-end && python -m bench.suite --compare bench-old.json bench-new.json
+
+Results are one JSON document: run metadata (commit, row count, settings)
+plus one object per scenario, so two runs can be diffed with --compare.
+Bulk-ingest rows carry bench:// links; `python -m bench.corpus --cleanup`
+removes them along with the corpus.
+"""
+import os
+
+# Before the app is imported: measure the database path, not cache hits
+os.environ.setdefault("NEWS_CACHE_BACKEND", "off")
+os.environ.setdefault("NEWS_INGEST_MODE", "sync")
+# One client issues every request; per-client rate limits would turn the run into 429s
+os.environ.setdefault("NEWS_RATE_LIMIT", "0")
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app import partitions
+from app.database import SessionLocal, engine
+from app.main import app
+from app.security import API_KEY_HEADER_NAME
+
+from .corpus import BENCH_LINK_PREFIX, sentence
+
+QUERIES = ["پرسپولیس", "دلار", "هوش مصنوعی", "جشنواره فیلم", "واکسن کرونا", "بانک مرکزی"]
+
+_queries = 0
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _count(conn, cursor, statement, parameters, context, executemany):
+    global _queries
+    _queries += 1
+
+
+# A scenario yields (method, url, json body) forever; `last` is the previous
+# response body so stateful scenarios (cursor walks) can follow links.
+Request = Tuple[str, str, Optional[Dict[str, Any]]]
+Scenario = Callable[[random.Random, Dict[str, Any]], Iterator[Request]]
+
+
+def _list(rng, last):
+    while True:
+        yield "GET", "/api/news?limit=50", None
+
+
+def _list_summary(rng, last):
+    while True:
+        yield "GET", "/api/news?limit=50&view=summary&include_total=false", None
+
+
+def _list_history(rng, last):
+    # Same page over every partition instead of the recent ones
+    while True:
+        yield "GET", "/api/news?limit=50&include_total=false&history=true", None
+
+
+def _filter_category(rng, last):
+    while True:
+        yield "GET", f"/api/news?limit=50&category_id={rng.randint(1, 6)}", None
+
+
+def _filter_category_agency(rng, last):
+    while True:
+        yield "GET", f"/api/news?limit=50&category_id={rng.randint(1, 6)}&agency_id={rng.randint(1, 9)}", None
+
+
+def _stats(rng, last):
+    groups = ["category", "agency", "category,agency", "hour", "category,day"]
+    while True:
+        since = int(time.time()) - rng.randint(1, 30) * 86400
+        yield "GET", f"/api/stats?group_by={rng.choice(groups)}&since={since}", None
+
+
+def _filter_categories(rng, last):
+    while True:
+        ids = "&".join(f"category_id={c}" for c in rng.sample(range(1, 7), 2))
+        yield "GET", f"/api/news?limit=50&{ids}", None
+
+
+def _home(rng, last):
+    while True:
+        yield "GET", "/api/home?latest=15&per_category=6&per_agency=3", None
+
+
+def _search(mode: str, order: str) -> Scenario:
+    def scenario(rng, last):
+        while True:
+            q = rng.choice(QUERIES)
+            yield "GET", f"/api/news?limit=20&q={q}&search_mode={mode}&order={order}&include_total=false", None
+    return scenario
+
+
+def _deep_cursor(rng, last):
+    # Walk 200 pages down via meta.pagination.next, then start over
+    while True:
+        url = "/api/news?limit=50&include_total=false"
+        for _ in range(200):
+            yield "GET", url, None
+            nxt = (last.get("body") or {}).get("meta", {}).get("pagination", {}).get("next")
+            if not nxt:
+                break
+            parts = urlsplit(nxt)
+            url = f"{parts.path}?{parts.query}"
+
+
+def _deep_offset(rng, last):
+    while True:
+        yield "GET", f"/api/news?limit=50&include_total=false&offset={rng.randint(5_000, 10_000)}", None
+
+
+def _bulk_ingest(rng, last):
+    run = uuid.uuid4().hex[:8]
+    n = 0
+    now = int(time.time())
+    while True:
+        items = []
+        for _ in range(100):
+            items.append({
+                "title": f"{sentence(rng, 9)} {run}-{n}",
+                "content": sentence(rng, 150),
+                "image_url": None,
+                "category_id": rng.randint(1, 6),
+                "agency_id": rng.randint(1, 9),
+                "pubDate": now - rng.randint(0, 86400),
+                "link": f"{BENCH_LINK_PREFIX}suite/{run}/{n}",
+            })
+            n += 1
+        yield "POST", "/api/news/bulk", {"items": items}
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "list": _list,
+    "list_summary": _list_summary,
+    "list_history": _list_history,
+    "filter_category": _filter_category,
+    "filter_category_agency": _filter_category_agency,
+    "filter_categories": _filter_categories,
+    "home": _home,
+    "search_fts": _search("fts", "date"),
+    "search_fts_relevance": _search("fts", "relevance"),
+    "search_like": _search("like", "date"),
+    "deep_cursor": _deep_cursor,
+    "deep_offset": _deep_offset,
+    "stats": _stats,
+    "bulk_ingest": _bulk_ingest,
+}
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+def run_scenario(client: TestClient, name: str, requests: int, warmup: int, seed: int) -> Dict[str, Any]:
+    global _queries
+    rng = random.Random(seed)
+    last: Dict[str, Any] = {}
+    gen = SCENARIOS[name](rng, last)
+    headers = {API_KEY_HEADER_NAME: os.getenv("NEWS_INGEST_API_KEY", "")}
+    latencies: List[float] = []
+    queries: List[int] = []
+    errors = 0
+    elapsed = 0.0
+    for i in range(warmup + requests):
+        method, url, body = next(gen)
+        _queries = 0
+        t0 = time.perf_counter()
+        resp = client.request(method, url, json=body, headers=headers)
+        dt = time.perf_counter() - t0
+        last["body"] = resp.json() if resp.headers.get("content-type", "").startswith("application/json") else None
+        if i < warmup:
+            continue
+        elapsed += dt
+        if resp.status_code >= 400:
+            errors += 1
+            continue
+        latencies.append(dt * 1000)
+        queries.append(_queries)
+    return {
+        "scenario": name,
+        "requests": requests,
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "mean_ms": round(statistics.fmean(latencies), 2) if latencies else 0.0,
+        "queries_per_request": round(statistics.fmean(queries), 2) if queries else 0.0,
+    }
+
+
+def run_meta(args) -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        commit = None
+    db = SessionLocal()
+    try:
+        rows = partitions.estimated_rows(db)
+    finally:
+        db.close()
+    return {
+        "commit": commit,
+        "timestamp": int(time.time()),
+        "python": platform.python_version(),
+        "news_rows_estimate": rows,
+        "requests": args.requests,
+        "warmup": args.warmup,
+        "seed": args.seed,
+        "env": {k: v for k, v in os.environ.items() if k.startswith("NEWS_") and "KEY" not in k},
+    }
+
+
+def compare(base_path: str, new_path: str) -> None:
+    base = {r["scenario"]: r for r in json.load(open(base_path))["results"]}
+    new = {r["scenario"]: r for r in json.load(open(new_path))["results"]}
+    print(f"{'scenario':<24} {'p50 ms':>16} {'p95 ms':>16} {'req/s':>16} {'queries':>12}")
+    for name in [n for n in new if n in base]:
+        b, n = base[name], new[name]
+
+        def cell(key: str, width: int) -> str:
+            delta = (n[key] - b[key]) / b[key] * 100 if b[key] else 0.0
+            return f"{n[key]:>8} ({delta:+5.1f}%)".rjust(width)
+
+        print(f"{name:<24} {cell('p50_ms', 16)} {cell('p95_ms', 16)} {cell('rps', 16)} "
+              f"{b['queries_per_request']:>5}->{n['queries_per_request']:<5}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    ap.add_argument("--requests", type=int, default=200, help="measured requests per scenario")
+    ap.add_argument("--warmup", type=int, default=20)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--out", help="write the JSON result document here (default: stdout)")
+    ap.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"), help="diff two result documents and exit")
+    args = ap.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    client = TestClient(app)
+    results = []
+    for name in args.scenarios:
+        row = run_scenario(client, name, args.requests, args.warmup, args.seed)
+        results.append(row)
+        print(
+            f"{name:<24} {row['rps']:>8} req/s  p50 {row['p50_ms']:>8}  p95 {row['p95_ms']:>8}  "
+            f"p99 {row['p99_ms']:>8} ms  q/req {row['queries_per_request']:>5}  errors {row['errors']}",
+            file=sys.stderr,
+        )
+    doc = json.dumps({"meta": run_meta(args), "results": results}, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(doc + "\n")
+    else:
+        print(doc)
+
+
+if __name__ == "__main__":
+    main()
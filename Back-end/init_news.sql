@@ -45,7 +45,57 @@ CREATE TABLE IF NOT EXISTS news (
 CREATE INDEX IF NOT EXISTS idx_news_uuid        ON news (uuid);
 CREATE INDEX IF NOT EXISTS idx_news_category_id ON news (category_id);
 CREATE INDEX IF NOT EXISTS idx_news_agency_id   ON news (agency_id);
-CREATE INDEX IF NOT EXISTS idx_news_link        ON news (link);
+-- Dedup lookups (crud.find_duplicate_news / create_news_bulk). Not unique:
+-- writers serialize on these keys with advisory locks (see app/partitions.py)
+CREATE INDEX IF NOT EXISTS ix_news_link           ON news (link);
+CREATE INDEX IF NOT EXISTS ix_news_title_category ON news (lower(title), category_id);
+-- Keyset pagination (crud.list_news cursor) and per-section top-N (crud.home_news)
+CREATE INDEX IF NOT EXISTS ix_news_pubdate_id          ON news (pubDate, id);
+CREATE INDEX IF NOT EXISTS ix_news_category_pubdate_id ON news (category_id, pubDate, id);
+CREATE INDEX IF NOT EXISTS ix_news_agency_pubdate_id   ON news (agency_id, pubDate, id);
+
+-- Full-text search: Persian-normalized, weighted tsvector (see app/search.py)
+CREATE OR REPLACE FUNCTION news_normalize(t text) RETURNS text
+LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+  SELECT lower(translate(coalesce(t, ''),
+                         U&'\064A\0649\0643\06C0\0629\0623\0625\0671\06F0\06F1\06F2\06F3\06F4\06F5\06F6\06F7\06F8\06F9\0660\0661\0662\0663\0664\0665\0666\0667\0668\0669\200C\0640\064B\064C\064D\064E\064F\0650\0651\0652\0653\0654\0655\0656\0657\0658\0659\065A\065B\065C\065D\065E\065F\0670',
+                         U&'\06CC\06CC\06A9\0647\0647\0627\0627\0627\0030\0031\0032\0033\0034\0035\0036\0037\0038\0039\0030\0031\0032\0033\0034\0035\0036\0037\0038\0039'))
+$$;
+
+ALTER TABLE news ADD COLUMN IF NOT EXISTS search_vector tsvector
+  GENERATED ALWAYS AS (setweight(to_tsvector('simple', news_normalize(title)), 'A') || setweight(to_tsvector('simple', news_normalize(content)), 'B')) STORED;
+CREATE INDEX IF NOT EXISTS ix_news_search_vector ON news USING gin (search_vector);
+
+-- Near-duplicate clustering (see app/clustering.py). After adding the columns
+-- to an existing database, fill them with: python -m app.clustering rebuild
+ALTER TABLE news ADD COLUMN IF NOT EXISTS minhash bytea;
+ALTER TABLE news ADD COLUMN IF NOT EXISTS cluster_id uuid;
+CREATE INDEX IF NOT EXISTS ix_news_cluster_pubdate_id ON news (cluster_id, pubDate, id);
+CREATE TABLE IF NOT EXISTS news_lsh (
+  band     smallint NOT NULL,
+  bucket   integer  NOT NULL,
+  news_id  uuid     NOT NULL,  -- no FK: news is partitioned, retention clears these
+  PRIMARY KEY (band, bucket, news_id)
+);
+CREATE INDEX IF NOT EXISTS ix_news_lsh_news_id ON news_lsh (news_id);
+
+-- Hourly counts per category/agency for GET /api/stats (see app/rollup.py),
+-- maintained by the ingest transactions. Fill it for existing rows with:
+--   python -m app.rollup rebuild
+CREATE TABLE IF NOT EXISTS news_rollup (
+  category_id integer NOT NULL,
+  agency_id   integer NOT NULL,
+  hour        integer NOT NULL,  -- start of the UTC hour of pubDate, unix seconds
+  count       integer NOT NULL,
+  PRIMARY KEY (category_id, agency_id, hour)
+);
+CREATE INDEX IF NOT EXISTS ix_news_rollup_hour ON news_rollup (hour);
+
+-- Monthly partitions on pubDate (see app/partitions.py). On a fresh database
+-- the API creates `news` partitioned, with PRIMARY KEY (id, "pubDate"), and
+-- keeps upcoming month partitions in place. Convert an existing table (rows
+-- are copied; undated ones get the migration time) with:
+--   python -m app.partitions migrate
 
 -- =====================
 -- Seed data
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# `app` is imported from Back-end/; nothing here connects to Postgres
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,124 @@
+import asyncio
+
+import pytest
+from starlette.requests import Request
+
+from app import admission
+from app.admission import Gate, RateLimiter, client_key, cost
+
+
+def make_request(query: str = "", path: str = "/api/news", headers=None) -> Request:
+    return Request({
+        "type": "http", "method": "GET", "path": path, "query_string": query.encode(),
+        "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+        "client": ("10.0.0.1", 1234),
+    })
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(admission.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_bucket_allows_the_burst_then_asks_to_wait(clock):
+    limiter = RateLimiter(rate=2, burst=5)
+    assert [limiter.take("a", 1) for _ in range(5)] == [0] * 5
+    assert limiter.take("a", 1) == pytest.approx(0.5)
+
+
+def test_bucket_refills_at_the_rate_up_to_the_burst(clock):
+    limiter = RateLimiter(rate=2, burst=5)
+    assert limiter.take("a", 5) == 0
+    clock[0] += 1
+    assert limiter.take("a", 2) == 0
+    assert limiter.take("a", 1) > 0
+    clock[0] += 60
+    assert limiter.take("a", 5) == 0
+
+
+def test_buckets_are_per_client(clock):
+    limiter = RateLimiter(rate=1, burst=2)
+    assert limiter.take("a", 2) == 0
+    assert limiter.take("a", 1) > 0
+    assert limiter.take("b", 2) == 0
+
+
+def test_request_dearer_than_the_burst_still_passes_on_a_full_bucket(clock):
+    limiter = RateLimiter(rate=1, burst=3)
+    assert limiter.take("a", 10) == 0
+    assert limiter.take("a", 1) > 0
+
+
+def test_forgotten_clients_start_full(clock):
+    limiter = RateLimiter(rate=1, burst=2, max_clients=1)
+    limiter.take("a", 2)
+    limiter.take("b", 1)
+    assert limiter.take("a", 2) == 0
+
+
+@pytest.mark.parametrize("query, path, expected", [
+    ("", "/api/news", 1 + admission.TOTAL_COST),
+    ("include_total=false", "/api/news", 1),
+    ("cursor=abc", "/api/news", 1),
+    ("offset=50", "/api/news", 1),
+    ("offset=50&include_total=true", "/api/news", 1 + admission.TOTAL_COST),
+    ("q=x&include_total=false", "/api/news", 1 + admission.SEARCH_COST),
+    ("q=x&search_mode=like&include_total=false", "/api/news", 1 + admission.LIKE_COST),
+    ("offset=5000", "/api/news", 1 + 5),
+    ("offset=999999999", "/api/news", 1 + admission.MAX_OFFSET_COST),
+    ("limit=200&include_total=false", "/api/news", 1 + 2),
+    ("limit=abc&include_total=false", "/api/news", 1),
+    ("", "/api/home", 1),
+    ("", "/api/news/export", admission.EXPORT_COST),
+])
+def test_cost(query, path, expected):
+    assert cost(make_request(query, path)) == expected
+
+
+def test_client_key_prefers_a_known_api_key(monkeypatch):
+    monkeypatch.setattr(admission, "RATE_API_KEYS", frozenset({"k1"}))
+    assert client_key(make_request(headers={"X-API-Key": "k1"})) == "key:k1"
+    assert client_key(make_request()) == "ip:10.0.0.1"
+
+
+def test_unknown_api_keys_fall_back_to_the_ip(monkeypatch):
+    monkeypatch.setattr(admission, "RATE_API_KEYS", frozenset({"k1"}))
+    assert client_key(make_request(headers={"X-API-Key": "made-up"})) == "ip:10.0.0.1"
+
+
+def test_forwarded_for_is_ignored_unless_trusted(monkeypatch):
+    request = make_request(headers={"X-Forwarded-For": "1.2.3.4, 10.0.0.1"})
+    assert client_key(request) == "ip:10.0.0.1"
+    monkeypatch.setattr(admission, "TRUST_PROXY", True)
+    assert client_key(request) == "ip:1.2.3.4"
+
+
+def test_gate_queues_then_sheds():
+    async def scenario():
+        gate = Gate(limit=1, queue=1, timeout=0.05)
+        assert await gate.acquire() is None
+        waiter = asyncio.ensure_future(gate.acquire())
+        await asyncio.sleep(0)
+        assert gate.waiting == 1
+        assert await gate.acquire() == "queue_full"
+        assert await waiter == "timeout"
+        gate.release()
+        assert await gate.acquire() is None
+        assert (gate.active, gate.waiting) == (1, 0)
+
+    asyncio.run(scenario())
+
+
+def test_gate_hands_a_released_slot_to_the_waiter():
+    async def scenario():
+        gate = Gate(limit=1, queue=1, timeout=1)
+        await gate.acquire()
+        waiter = asyncio.ensure_future(gate.acquire())
+        await asyncio.sleep(0)
+        gate.release()
+        assert await waiter is None
+        assert gate.active == 1
+
+    asyncio.run(scenario())
@@ -0,0 +1,75 @@
+import pytest
+from starlette.requests import Request
+
+from app import cache
+from app.cache import CachedResponse, MemoryBackend, cache_key, etag_matches, make_etag
+
+
+def make_request(query: str, path: str = "/api/news") -> Request:
+    return Request({
+        "type": "http", "method": "GET", "scheme": "http", "server": ("testserver", 80),
+        "path": path, "query_string": query.encode(), "headers": [],
+    })
+
+
+def test_cache_key_ignores_param_order_and_empty_values():
+    assert cache_key(make_request("limit=10&category_id=2&q=")) == cache_key(make_request("category_id=2&limit=10"))
+
+
+def test_cache_key_keeps_repeated_params():
+    assert cache_key(make_request("category_id=1&category_id=4")) != cache_key(make_request("category_id=4"))
+
+
+def test_make_etag_is_a_stable_strong_tag():
+    etag = make_etag(b"body")
+    assert etag == make_etag(b"body") != make_etag(b"other")
+    assert etag.startswith('"') and etag.endswith('"')
+
+
+@pytest.mark.parametrize("if_none_match, expected", [
+    (None, False),
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"abc-gzip"', True),
+    ('W/"abc-br"', True),
+    ('"zzz", "abc-gzip"', True),
+    ("*", True),
+    ('"abcd-gzip"', False),
+    ('"abc-deflate"', False),
+])
+def test_etag_matches(if_none_match, expected):
+    assert etag_matches(if_none_match, '"abc"') is expected
+
+
+def entry(generation: int = 0) -> CachedResponse:
+    return CachedResponse(generation, '"e"', "application/json", b"{}")
+
+
+def test_memory_backend_expires_entries(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    backend = MemoryBackend(ttl=30, max_entries=10)
+    backend.set("k", entry())
+    assert backend.get("k") is not None
+    now[0] += 31
+    assert backend.get("k") is None
+
+
+def test_memory_backend_invalidate_drops_older_generations():
+    backend = MemoryBackend(ttl=30, max_entries=10)
+    backend.set("k", entry(backend.generation()))
+    backend.invalidate()
+    assert backend.get("k") is None
+    # An entry filled by a request that started before the invalidation is stale too
+    backend.set("k", entry(0))
+    assert backend.get("k") is None
+
+
+def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryBackend(ttl=30, max_entries=2)
+    backend.set("a", entry())
+    backend.set("b", entry())
+    backend.get("a")
+    backend.set("c", entry())
+    assert backend.get("a") is not None
+    assert backend.get("b") is None
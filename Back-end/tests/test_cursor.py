@@ -0,0 +1,42 @@
+import uuid
+
+import pytest
+
+from app.crud import decode_cursor, encode_cursor
+
+
+class Row:
+    def __init__(self, pub_date, news_id):
+        self.pubDate = pub_date
+        self.id = news_id
+
+
+def test_round_trip_from_model_and_projected_row():
+    news_id = uuid.uuid4()
+    assert decode_cursor(encode_cursor(Row(1700000000, news_id))) == (1700000000, news_id, "next")
+    assert decode_cursor(encode_cursor({"pubDate": 1700000000, "id": news_id}, "prev")) == (
+        1700000000, news_id, "prev",
+    )
+
+
+def test_null_pub_date_round_trips():
+    news_id = uuid.uuid4()
+    assert decode_cursor(encode_cursor(Row(None, news_id))) == (None, news_id, "next")
+
+
+def test_cursor_is_url_safe_without_padding():
+    cursor = encode_cursor(Row(1700000000, uuid.uuid4()))
+    assert "=" not in cursor and "+" not in cursor and "/" not in cursor
+
+
+@pytest.mark.parametrize("cursor", [
+    "",
+    "not-a-cursor",
+    # ["1700000000", <uuid>, "next"]: pubDate must be an int
+    "WyIxNzAwMDAwMDAwIiwiMDAwMDAwMDAtMDAwMC0wMDAwLTAwMDAtMDAwMDAwMDAwMDAwIiwibmV4dCJd",
+    # [1700000000, <uuid>, "sideways"]
+    "WzE3MDAwMDAwMDAsIjAwMDAwMDAwLTAwMDAtMDAwMC0wMDAwLTAwMDAwMDAwMDAwMCIsInNpZGV3YXlzIl0",
+])
+def test_invalid_cursors_raise_value_error(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor)
@@ -0,0 +1,57 @@
+import pytest
+from sqlalchemy import exc as sa_exc
+
+from app.ingest_queue import IngestQueue, IngestWriter
+
+
+def db_error(cls, **kw):
+    return cls("INSERT ...", {}, Exception("boom"), **kw)
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return IngestQueue(str(tmp_path / "queue.sqlite3"))
+
+
+def writer(queue, fail):
+    """A writer whose Postgres write raises fail(batch_ids) when it returns an exception."""
+    w = IngestWriter(queue)
+
+    def write(claimed):
+        err = fail([batch_id for batch_id, _ in claimed])
+        if err is not None:
+            raise err
+        queue.mark_done({batch_id: len(batch) for batch_id, batch in claimed})
+
+    w._write = write
+    return w
+
+
+def test_transient_errors_requeue_the_whole_group(queue):
+    a, b = queue.enqueue([{"n": 1}]), queue.enqueue([{"n": 2}])
+    w = writer(queue, lambda ids: db_error(sa_exc.OperationalError))
+    assert w.drain(queue.claim()) is False
+    assert queue.status(a)["status"] == queue.status(b)["status"] == "queued"
+
+
+def test_invalidated_connection_is_transient(queue):
+    a = queue.enqueue([{"n": 1}])
+    w = writer(queue, lambda ids: db_error(sa_exc.DBAPIError, connection_invalidated=True))
+    assert w.drain(queue.claim()) is False
+    assert queue.status(a)["status"] == "queued"
+
+
+def test_only_the_invalid_batch_is_marked_failed(queue):
+    good, bad = queue.enqueue([{"n": 1}]), queue.enqueue([{"n": 2}])
+    w = writer(queue, lambda ids: db_error(sa_exc.IntegrityError) if bad in ids else None)
+    assert w.drain(queue.claim()) is True
+    assert queue.status(good)["status"] == "done"
+    assert queue.status(bad)["status"] == "failed"
+
+
+def test_unknown_errors_keep_the_batch(queue):
+    good, odd = queue.enqueue([{"n": 1}]), queue.enqueue([{"n": 2}])
+    w = writer(queue, lambda ids: KeyError("title") if odd in ids else None)
+    assert w.drain(queue.claim()) is False
+    assert queue.status(good)["status"] == "done"
+    assert queue.status(odd)["status"] == "queued"
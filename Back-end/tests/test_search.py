@@ -0,0 +1,34 @@
+from app.search import headline, normalize
+
+
+def test_normalize_folds_persian_variants():
+    assert normalize("كيك‌ها ۱۲") == normalize("کیکها 12") == "کیکها 12"
+
+
+def test_headline_marks_matches_in_the_original_spelling():
+    text = "قيمت دلار امروز ۱۲۳ هزار تومان شد"
+    assert headline(text, "قیمت 123") == "<mark>قيمت</mark> دلار امروز <mark>۱۲۳</mark> هزار تومان شد"
+
+
+def test_headline_ignores_excluded_terms_and_or():
+    assert headline("gold or dollar", "dollar or -gold") == "gold or <mark>dollar</mark>"
+
+
+def test_headline_matches_whole_words_only():
+    assert headline("Worldwide news", "world") == "Worldwide news"
+
+
+def test_headline_cuts_fragments_around_distant_matches():
+    text = " ".join(["alpha"] + [f"w{i}" for i in range(100)] + ["omega"])
+    snippet = headline(text, "alpha omega")
+    assert snippet.startswith("<mark>alpha</mark>")
+    assert snippet.endswith("<mark>omega</mark>")
+    assert " ... " in snippet and "w50" not in snippet
+
+
+def test_headline_escapes_the_text_around_marks():
+    text = "price <script>alert(1)</script> dollar & rial"
+    assert headline(text, "dollar") == (
+        "price &lt;script&gt;alert(1)&lt;/script&gt; <mark>dollar</mark> &amp; rial"
+    )
+    assert "<script>" not in headline(text, "missing")
@@ -0,0 +1,33 @@
+from starlette.applications import Starlette
+from starlette.responses import Response
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.serialize import CompressionMiddleware, coded_etag, dumps, uncoded_etag
+
+
+def test_coded_etag_round_trip():
+    assert coded_etag('"abc"', "gzip") == '"abc-gzip"'
+    assert uncoded_etag('"abc-gzip"') == uncoded_etag('"abc-br"') == uncoded_etag('"abc"') == '"abc"'
+
+
+def test_dumps_stringifies_unknown_driver_types():
+    class DriverUUID:  # stands in for asyncpg.pgproto.UUID, which isn't a uuid.UUID
+        def __str__(self):
+            return "f6326e6e-fbb4-476d-a804-413c4e3e92db"
+
+    assert dumps({"id": DriverUUID()}) == b'{"id":"f6326e6e-fbb4-476d-a804-413c4e3e92db"}'
+
+
+def test_not_modified_echoes_the_compressed_variant():
+    async def endpoint(request):
+        return Response(status_code=304, headers={"ETag": '"abc"'})
+
+    app = Starlette(routes=[Route("/", endpoint)])
+    app.add_middleware(CompressionMiddleware)
+    client = TestClient(app)
+    resp = client.get("/", headers={"Accept-Encoding": "gzip", "If-None-Match": '"abc-gzip"'})
+    assert resp.status_code == 304
+    assert resp.headers["etag"] == '"abc-gzip"'
+    resp = client.get("/", headers={"Accept-Encoding": "identity", "If-None-Match": '"abc"'})
+    assert resp.headers["etag"] == '"abc"'
@@ -66,9 +66,13 @@ function buildQueryString(params) {
   const searchParams = new URLSearchParams();
 
   Object.entries(params).forEach(([key, value]) => {
-    if (value !== null && value !== undefined && value !== '') {
-      searchParams.append(key, value);
-    }
+    // Arrays become repeated keys (?category_id=1&category_id=4)
+    const values = Array.isArray(value) ? value : [value];
+    values.forEach(v => {
+      if (v !== null && v !== undefined && v !== '') {
+        searchParams.append(key, v);
+      }
+    });
   });
 
   const queryString = searchParams.toString();
@@ -116,6 +120,21 @@ export function extractAgenciesList(response) {
   return [];
 }
 
+/**
+ * Pull the keyset cursor out of meta.pagination.next, if the API sent one
+ * @param {object} response
+ * @returns {string|null}
+ */
+export function extractNextCursor(response) {
+  const nextHref = response?.meta?.pagination?.next || response?.data?.meta?.pagination?.next;
+  if (!nextHref) return null;
+  try {
+    return new URL(nextHref, window.location.origin).searchParams.get('cursor');
+  } catch {
+    return null;
+  }
+}
+
 function parseTimestamp(input) {
   if (input == null) return Math.floor(Date.now() / 1000);
   if (typeof input === 'number') {
@@ -135,7 +154,7 @@ function parseTimestamp(input) {
 export function normalizeNewsItem(item) {
   const id = item?.id ?? item?._id ?? item?.uuid ?? item?.slug ?? item?.guid ?? (item?.link || item?.url) ?? Math.random().toString(36).slice(2);
   const title = item?.title ?? item?.name ?? item?.headline ?? '';
-  const content = item?.content ?? item?.summary ?? item?.description ?? '';
+  const content = item?.content ?? item?.teaser ?? item?.summary ?? item?.description ?? '';
   const image_url = item?.image_url ?? item?.imageUrl ?? item?.image ?? item?.thumbnail ?? item?.cover ?? null;
   const link = item?.link ?? item?.url ?? '#';
   const pubRaw = item?.pubDate ?? item?.published_at ?? item?.publishedAt ?? item?.created_at ?? item?.createdAt ?? item?.timestamp;
@@ -182,13 +201,22 @@ export function normalizeNewsItem(item) {
 /**
  * Get news with optional filtering and pagination
  * @param {object} params - Query parameters
- * @param {number} params.category_id - Filter by category id
- * @param {number} params.agency_id - Filter by agency id
+ * @param {number|number[]} params.category_id - Filter by category id (an array matches any of them)
+ * @param {number|number[]} params.agency_id - Filter by agency id (an array matches any of them)
+ * @param {number} params.since - pubDate lower bound (unix seconds)
+ * @param {number} params.until - pubDate upper bound (unix seconds, exclusive)
  * @param {string} params.category - Filter by category name
  * @param {string} params.agency - Filter by agency name
  * @param {string} params.q - Search title/content
  * @param {number} params.limit - Limit results (max 200, default 50)
  * @param {number} params.offset - Offset for pagination (default 0)
+ * @param {string} params.cursor - Keyset cursor from meta.pagination.next (takes precedence over offset)
+ * @param {boolean} params.include_total - Ask for meta.pagination.total_items (first page only by default)
+ * @param {string} params.view - 'summary' returns card fields with a short teaser instead of content
+ * @param {string} params.fields - Comma-separated projection (overrides view)
+ * @param {string} params.collapse - 'cluster' returns one story per near-duplicate cluster
+ * @param {string} params.cluster_id - List every story of one near-duplicate cluster
+ * @param {boolean} params.history - Also list stories older than the last few months (slower)
  * @returns {Promise<object>}
  */
 export async function getNews(params = {}) {
@@ -196,6 +224,50 @@ export async function getNews(params = {}) {
   return apiRequest(`/api/news${queryString}`);
 }
 
+/**
+ * Get a homepage in one request: newest stories plus the newest per category/agency
+ * @param {object} params - Query parameters
+ * @param {number} params.latest - Newest stories overall (default 15)
+ * @param {number} params.per_category - Stories per category section (default 6, 0 omits them)
+ * @param {number} params.per_agency - Stories per agency section (default 0)
+ * @param {number[]} params.category_id - Only these categories
+ * @param {number[]} params.agency_id - Only these agencies
+ * @returns {Promise<object>} data.latest, data.categories / data.agencies as [{ id, name, news }]
+ */
+export async function getHome(params = {}) {
+  const queryString = buildQueryString(params);
+  return apiRequest(`/api/home${queryString}`);
+}
+
+/**
+ * Subscribe to newly ingested stories (Server-Sent Events)
+ * @param {object} params - Query parameters
+ * @param {number|number[]} params.category_id - Only these categories
+ * @param {number|number[]} params.agency_id - Only these agencies
+ * @param {function} onNews - Called with each story (summary view)
+ * @param {function} onEvicted - Called when the server dropped this client as too slow; reload, then subscribe again
+ * @returns {function} Call to unsubscribe
+ */
+export function streamNews(params = {}, onNews, onEvicted) {
+  const base = API_BASE_URL || '';
+  const source = new EventSource(`${base}/api/news/stream${buildQueryString(params)}`);
+  source.addEventListener('news', (e) => onNews(JSON.parse(e.data)));
+  source.addEventListener('evicted', () => {
+    source.close();
+    if (onEvicted) onEvicted();
+  });
+  return () => source.close();
+}
+
+/**
+ * Get a single news item with its full content
+ * @param {string} id - News UUID
+ * @returns {Promise<object>}
+ */
+export async function getNewsItem(id) {
+  return apiRequest(`/api/news/${encodeURIComponent(id)}`);
+}
+
 /**
  * Get all categories
  * @returns {Promise<object>}
@@ -212,6 +284,21 @@ export async function getAgencies() {
   return apiRequest('/api/agencies');
 }
 
+/**
+ * Get news counts from the hourly rollup
+ * @param {object} params - Query parameters
+ * @param {string} params.group_by - Comma-separated: category, agency, hour or day (default 'category')
+ * @param {number|number[]} params.category_id - Filter by category id (an array matches any of them)
+ * @param {number|number[]} params.agency_id - Filter by agency id (an array matches any of them)
+ * @param {number} params.since - pubDate lower bound (unix seconds, rounded down to the hour)
+ * @param {number} params.until - pubDate upper bound (unix seconds, rounded down to the hour, exclusive)
+ * @returns {Promise<object>} data.buckets, e.g. [{ category_id, hour, count }], and data.total
+ */
+export async function getStats(params = {}) {
+  const queryString = buildQueryString(params);
+  return apiRequest(`/api/stats${queryString}`);
+}
+
 /**
  * Health check
  * @returns {Promise<object>}
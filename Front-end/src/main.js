@@ -6,6 +6,7 @@ import {
   extractNewsList,
   extractCategoriesList,
   extractAgenciesList,
+  extractNextCursor,
   normalizeNewsItem
 } from './api.js';
 import {
@@ -43,6 +44,7 @@ class NewsApp {
     // Pagination state for infinite scroll
     this.latestLimit = 10;
     this.latestOffset = 0;
+    this.latestCursor = null;
     this.hasMoreLatest = true;
     this.isAppending = false;
     this.infiniteObserver = null;
@@ -65,7 +67,7 @@ class NewsApp {
     this.setLoading(true);
     try {
       // Fetch once and split: first 5 as featured, next 10 as latest
-      const combinedResponse = await getNews({ limit: 15, offset: 0 });
+      const combinedResponse = await getNews({ limit: 15, offset: 0, include_total: false, view: 'summary' });
       const allNews = extractNewsList(combinedResponse).map(normalizeNewsItem);
       // Featured: first 5 items that have an image
       const withImages = allNews.filter(n => Boolean(n.image_url));
@@ -79,6 +81,7 @@ class NewsApp {
       this.latestLimit = 10;
       // We requested 15 initially. Next page should start at offset 15 to avoid duplicates
       this.latestOffset = 15;
+      this.latestCursor = extractNextCursor(combinedResponse);
       // Assume more pages exist if initial request hit its limit
       this.hasMoreLatest = true;
 
@@ -396,10 +399,11 @@ class NewsApp {
       this.setLoading(true);
       // Reset pagination for new filter set
       const limit = this.latestLimit || 10;
-      const response = await getNews({ ...filters, limit, offset: 0 });
+      const response = await getNews({ ...filters, limit, offset: 0, include_total: false, view: 'summary' });
       const items = extractNewsList(response).map(normalizeNewsItem);
       this.latestNews = items;
       this.latestOffset = items.length;
+      this.latestCursor = extractNextCursor(response);
       // Prefer API pagination.next if present; fallback to length===limit
       const nextHref = response?.meta?.pagination?.next || response?.data?.meta?.pagination?.next;
       this.hasMoreLatest = Boolean(nextHref) || items.length === limit;
@@ -418,11 +422,14 @@ class NewsApp {
     try {
       const limit = this.latestLimit || 10;
       const offset = this.latestOffset || 0;
-      const response = await getNews({ ...this.activeFilters, limit, offset });
+      // Keyset cursor keeps deep pages as cheap as the first; offset is the fallback
+      const page = this.latestCursor ? { cursor: this.latestCursor } : { offset };
+      const response = await getNews({ ...this.activeFilters, limit, ...page, view: 'summary' });
       const items = extractNewsList(response).map(normalizeNewsItem);
 
       // Update pagination state
       this.latestOffset = offset + items.length;
+      this.latestCursor = extractNextCursor(response);
       const nextHref = response?.meta?.pagination?.next || response?.data?.meta?.pagination?.next;
       this.hasMoreLatest = Boolean(nextHref) || items.length === limit;
 
@@ -505,11 +512,11 @@ class NewsApp {
     const apiFilters = {};
 
     if (this.selectedFilters.agencies.length > 0) {
-      apiFilters.agency_id = this.selectedFilters.agencies[0].id;
+      apiFilters.agency_id = this.selectedFilters.agencies.map(a => a.id);
     }
 
     if (this.selectedFilters.categories.length > 0) {
-      apiFilters.category_id = this.selectedFilters.categories[0].id;
+      apiFilters.category_id = this.selectedFilters.categories.map(c => c.id);
     }
 
     // Store the filters
@@ -766,14 +773,12 @@ class NewsApp {
     const apiFilters = {};
 
     if (this.selectedFilters.agencies.length > 0) {
-      // For multiple agencies, we might need to make multiple requests or use agency_id parameter
-      // For now, let's use the first selected agency
-      apiFilters.agency_id = this.selectedFilters.agencies[0].id;
+      // The API ORs repeated ids, so every selected agency is honoured
+      apiFilters.agency_id = this.selectedFilters.agencies.map(a => a.id);
     }
 
     if (this.selectedFilters.categories.length > 0) {
-      // For multiple categories, use the first selected category
-      apiFilters.category_id = this.selectedFilters.categories[0].id;
+      apiFilters.category_id = this.selectedFilters.categories.map(c => c.id);
     }
 
     // Store the filters
@@ -1,10 +1,20 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import argparse
+import cProfile
+import hashlib
+import io
 import json
+import os
+import pstats
+import random
 import time
 import logging
 import re
+import threading
+from contextlib import contextmanager
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
 from html import unescape
 from pathlib import Path
@@ -15,20 +25,72 @@ from zoneinfo import ZoneInfo
 import feedparser
 from feedparser import CharacterEncodingOverride
 import requests
+from requests.adapters import HTTPAdapter
 from dateutil import parser as dtparse
 
 # -----------------------
 # CONFIG
 # -----------------------
 API_URL = "http://localhost:8000/api/news"
+BULK_API_URL = f"{API_URL}/bulk"
 API_KEY = "super-secret-key"  # change if needed
 REQUEST_TIMEOUT = 20
+# Posting: items go to /api/news/bulk in chunks over one keep-alive session.
+POST_BATCH_SIZE = 50
+POST_RETRIES = 3
+POST_BACKOFF = 0.5  # seconds, doubled on every retry
 MAX_ITEMS_PER_FEED = 200
 
+# Concurrent fetching: feeds are downloaded in parallel, with at most
+# FETCH_PER_HOST requests in flight against a single agency host.
+CONCURRENT_FETCH = True
+FETCH_CONCURRENCY = 16
+FETCH_PER_HOST = 2
+FEED_TIMEOUT = 15  # seconds, whole download of one feed (connect + body)
+# Parsing runs in a process pool so it doesn't compete with downloads for the GIL.
+# Set to 0 to parse inline in the main thread.
+PARSE_WORKERS = 4
+USER_AGENT = "injast-news-pull/1.0 (+https://injast.life)"
+
 # Assume Iran local for naive datetimes, convert to UTC
 TZ_TEHRAN = ZoneInfo("Asia/Tehran")
 
-CACHE_FILE = Path("./posted_links.json")
+# Each feed has a high-water mark: the newest pubDate posted from it. Items
+# are accepted from HWM_SLACK before the mark (late/out-of-order entries; the
+# seen-link store drops repeats), but never from further back than
+# MAX_LOOKBACK. A feed without a mark starts at FETCH_WINDOW ago.
+FETCH_WINDOW = timedelta(hours=1)
+HWM_SLACK = timedelta(hours=1)
+MAX_LOOKBACK = timedelta(days=1)  # must stay below SEEN_TTL
+
+# Seen-link store: append-only "<epoch>\t<link>" log, entries expire after
+# SEEN_TTL (anything older than the fetch window can't be re-posted anyway,
+# the rest is margin for feed clock skew). The log is compacted on load once
+# it holds more than SEEN_COMPACT_RATIO dead lines per live one.
+SEEN_LOG_FILE = Path("./seen_links.log")
+SEEN_TTL = timedelta(days=2)
+SEEN_COMPACT_RATIO = 1.0
+# Optional Bloom filter in front of the in-memory index (bits; 0 disables).
+SEEN_BLOOM_BITS = 0
+# Pre-log cache, imported once into SEEN_LOG_FILE and renamed to *.migrated
+LEGACY_CACHE_FILE = Path("./posted_links.json")
+
+# Per-feed schedule state (high-water mark, publish rate, error streak)
+FEED_SCHEDULE_FILE = Path("./feed_schedule.json")
+# Daemon mode (--daemon): each feed is polled about every TARGET_ITEMS_PER_POLL
+# new items at its observed publish rate, within [MIN, MAX]_POLL_INTERVAL.
+# Failing feeds back off exponentially up to MAX_ERROR_BACKOFF.
+MIN_POLL_INTERVAL = 60.0       # seconds
+MAX_POLL_INTERVAL = 30 * 60.0
+DEFAULT_POLL_INTERVAL = 5 * 60.0
+TARGET_ITEMS_PER_POLL = 2.0
+RATE_SMOOTHING = 0.3           # EWMA weight of the latest observation
+MAX_ERROR_BACKOFF = 2 * 3600.0
+# Per-feed HTTP validators (ETag / Last-Modified / body hash) for conditional GETs
+FEED_STATE_FILE = Path("./feed_validators.json")
+# JSON report of the last run: per-feed stage timings, entry counters, bytes
+# (None disables; --report overrides)
+RUN_REPORT_FILE: Optional[Path] = Path("./fetch_report.json")
 
 # All your feeds
 CATEGORIES: List[Dict[str, Any]] = [
@@ -126,20 +188,419 @@ log = logging.getLogger("news-pull")
 # -----------------------
 # UTILS
 # -----------------------
-def load_cache() -> set:
-    if CACHE_FILE.exists():
+class BloomFilter:
+    """Fixed-size Bloom filter; `in` is False only for links never added."""
+
+    def __init__(self, bits: int, hashes: int = 7):
+        self.bits = bits
+        self.hashes = hashes
+        self._array = bytearray((bits + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.bits for i in range(self.hashes))
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self._array[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._array[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class SeenLinkStore:
+    """Links already posted, with TTL eviction and crash-safe appends.
+
+    Membership is a dict lookup (plus an optional Bloom filter for cheap
+    negatives). New links are appended to the log and fsynced by flush(); a
+    crash loses at most the links of the run in progress, never the history.
+    expire() drops links past the TTL and compacts the log, so a long-lived
+    daemon stays as bounded as a fresh load.
+    """
+
+    def __init__(self, path: Path, ttl: timedelta = SEEN_TTL, bloom_bits: int = SEEN_BLOOM_BITS,
+                 legacy_path: Optional[Path] = LEGACY_CACHE_FILE):
+        self.path = path
+        self.ttl = ttl.total_seconds()
+        self._seen: Dict[str, float] = {}
+        self._pending: List[Tuple[str, float]] = []
+        self._bloom_bits = bloom_bits
+        self._bloom = BloomFilter(bloom_bits) if bloom_bits else None
+        self._log_lines = 0
+        self._lock = threading.Lock()
+        if not path.exists() and legacy_path is not None and legacy_path.exists():
+            self._migrate(legacy_path)
+        self._load()
+
+    def _migrate(self, legacy_path: Path) -> None:
         try:
-            return set(json.loads(CACHE_FILE.read_text(encoding="utf-8")))
-        except Exception:
-            return set()
-    return set()
+            links = json.loads(legacy_path.read_text(encoding="utf-8"))
+        except Exception as e:
+            log.warning("Ignoring unreadable legacy cache %s: %s", legacy_path, e)
+            return
+        # The old file has no timestamps: treat everything as seen now
+        now = time.time()
+        self._write_atomic((link, now) for link in links)
+        os.replace(legacy_path, legacy_path.with_suffix(legacy_path.suffix + ".migrated"))
+        log.info("Migrated %d links from %s to %s", len(links), legacy_path, self.path)
 
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        cutoff = time.time() - self.ttl
+        lines = 0
+        torn = False
+        with self.path.open("r", encoding="utf-8") as f:
+            for line in f:
+                lines += 1
+                if not line.endswith("\n"):
+                    torn = True  # crash mid-append; rewrite so the next append starts clean
+                    continue
+                ts, sep, link = line[:-1].partition("\t")
+                if not sep:
+                    continue
+                try:
+                    seen_at = float(ts)
+                except ValueError:
+                    continue
+                if seen_at >= cutoff and link:
+                    self._remember(link, seen_at)
+        self._log_lines = lines
+        if torn or self._bloated():
+            self._write_atomic(self._seen.items())
 
-def save_cache(cache: set) -> None:
-    try:
-        CACHE_FILE.write_text(json.dumps(sorted(list(cache)), ensure_ascii=False), encoding="utf-8")
-    except Exception as e:
-        log.warning("Failed to save cache: %s", e)
+    def _bloated(self) -> bool:
+        return self._log_lines - len(self._seen) > SEEN_COMPACT_RATIO * max(len(self._seen), 1)
+
+    def _remember(self, link: str, seen_at: float) -> None:
+        self._seen[link] = seen_at
+        if self._bloom is not None:
+            self._bloom.add(link)
+
+    def _write_atomic(self, entries) -> None:
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            lines = 0
+            for link, seen_at in entries:
+                f.write(f"{seen_at:.0f}\t{link}\n")
+                lines += 1
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self._log_lines = lines
+
+    def __contains__(self, link: str) -> bool:
+        if self._bloom is not None and link not in self._bloom:
+            return False
+        seen_at = self._seen.get(link)
+        return seen_at is not None and seen_at >= time.time() - self.ttl
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def add(self, link: str) -> None:
+        with self._lock:
+            now = time.time()
+            self._remember(link, now)
+            self._pending.append((link, now))
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._pending:
+                return
+            try:
+                with self.path.open("a", encoding="utf-8") as f:
+                    f.write("".join(f"{seen_at:.0f}\t{link}\n" for link, seen_at in self._pending))
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._log_lines += len(self._pending)
+                self._pending.clear()
+            except Exception as e:
+                log.warning("Failed to append seen links: %s", e)
+
+    def expire(self) -> int:
+        """Forget links past the TTL, rebuild the Bloom filter and compact the log; returns links dropped."""
+        with self._lock:
+            cutoff = time.time() - self.ttl
+            expired = [link for link, seen_at in self._seen.items() if seen_at < cutoff]
+            if expired:
+                for link in expired:
+                    del self._seen[link]
+                # A Bloom filter can't delete: refill one with the live links only
+                if self._bloom_bits:
+                    self._bloom = BloomFilter(self._bloom_bits)
+                    for link in self._seen:
+                        self._bloom.add(link)
+            if self._bloated():
+                try:
+                    # Pending links are in _seen, so the rewrite persists them too
+                    self._write_atomic(list(self._seen.items()))
+                    self._pending.clear()
+                except Exception as e:
+                    log.warning("Failed to compact %s: %s", self.path, e)
+            return len(expired)
+
+
+class FeedValidatorStore:
+    """Persistent per-feed validators used to skip unchanged feeds.
+
+    New validators are only staged while a run is in progress; they are
+    committed once every new link from that feed body has been posted, so a
+    failed post is retried on the next run instead of being hidden behind a 304.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._state: Dict[str, Dict[str, str]] = {}
+        self._staged: Dict[str, Tuple[Dict[str, str], List[str]]] = {}
+        self._lock = threading.Lock()
+        if path.exists():
+            try:
+                self._state = json.loads(path.read_text(encoding="utf-8"))
+            except Exception as e:
+                log.warning("Ignoring unreadable feed state %s: %s", path, e)
+
+    def get(self, feed_url: str) -> Dict[str, str]:
+        with self._lock:
+            return dict(self._state.get(feed_url, {}))
+
+    def stage(self, feed_url: str, validators: Dict[str, str], links: List[str]) -> None:
+        with self._lock:
+            self._staged[feed_url] = (validators, links)
+
+    def commit_posted(self, posted_cache: "SeenLinkStore") -> None:
+        with self._lock:
+            for feed_url, (validators, links) in self._staged.items():
+                if all(link in posted_cache for link in links):
+                    self._state[feed_url] = validators
+            self._staged.clear()
+
+    def save(self) -> None:
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        try:
+            with self._lock:
+                tmp.write_text(json.dumps(self._state, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except Exception as e:
+            log.warning("Failed to save feed state: %s", e)
+
+
+class FeedSchedule:
+    """Per-feed polling state: high-water mark, publish rate, error streak, next poll.
+
+    Like FeedValidatorStore, a new high-water mark is only staged during a
+    run and committed once every link it covers has been posted, so a failed
+    post is picked up again by the next poll.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._state: Dict[str, Dict[str, Any]] = {}
+        self._staged: Dict[str, Tuple[int, List[str]]] = {}
+        self._lock = threading.Lock()
+        if path.exists():
+            try:
+                self._state = json.loads(path.read_text(encoding="utf-8"))
+            except Exception as e:
+                log.warning("Ignoring unreadable feed schedule %s: %s", path, e)
+
+    def _feed(self, feed_url: str) -> Dict[str, Any]:
+        return self._state.setdefault(feed_url, {
+            "high_water": None, "rate": 0.0, "interval": DEFAULT_POLL_INTERVAL,
+            "errors": 0, "last_poll": None, "next_poll": 0.0,
+        })
+
+    def window_start(self, feed_url: str, now_utc: datetime) -> datetime:
+        with self._lock:
+            high_water = self._state.get(feed_url, {}).get("high_water")
+        if high_water is None:
+            return now_utc - FETCH_WINDOW
+        return max(datetime.fromtimestamp(high_water, timezone.utc) - HWM_SLACK, now_utc - MAX_LOOKBACK)
+
+    def due(self, feeds: List[Tuple[str, int, int]], now: float) -> List[Tuple[str, int, int]]:
+        with self._lock:
+            return [f for f in feeds if self._state.get(f[0], {}).get("next_poll", 0.0) <= now]
+
+    def seconds_until_due(self, feeds: List[Tuple[str, int, int]], now: float) -> float:
+        with self._lock:
+            return max(0.0, min(self._state.get(f[0], {}).get("next_poll", 0.0) for f in feeds) - now)
+
+    def observe(self, feed_url: str, items: List[Dict[str, Any]], now: float) -> None:
+        """Record a successful poll that yielded `items` not seen before."""
+        with self._lock:
+            st = self._feed(feed_url)
+            if st["last_poll"] is not None and now > st["last_poll"]:
+                observed = len(items) * 3600.0 / (now - st["last_poll"])  # items/hour
+                prev = st["rate"]
+                st["rate"] = observed if not prev else RATE_SMOOTHING * observed + (1 - RATE_SMOOTHING) * prev
+            if st["rate"] > 0:
+                interval = TARGET_ITEMS_PER_POLL * 3600.0 / st["rate"]
+            else:
+                interval = st["interval"] * 1.5  # quiet feed: drift towards the max
+            st["interval"] = min(MAX_POLL_INTERVAL, max(MIN_POLL_INTERVAL, interval))
+            st["errors"] = 0
+            st["last_poll"] = now
+            st["next_poll"] = now + st["interval"]
+            if items:
+                self._staged[feed_url] = (max(it["pubDate"] for it in items), [it["link"] for it in items])
+
+    def failed(self, feed_url: str, now: float) -> None:
+        with self._lock:
+            st = self._feed(feed_url)
+            st["errors"] += 1
+            backoff = min(MAX_ERROR_BACKOFF, st["interval"] * 2 ** st["errors"])
+            st["next_poll"] = now + backoff * random.uniform(0.9, 1.1)
+
+    def commit_posted(self, posted_cache: "SeenLinkStore") -> None:
+        with self._lock:
+            for feed_url, (newest, links) in self._staged.items():
+                if all(link in posted_cache for link in links):
+                    st = self._feed(feed_url)
+                    st["high_water"] = max(newest, st["high_water"] or 0)
+            self._staged.clear()
+
+    def save(self) -> None:
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        try:
+            with self._lock:
+                tmp.write_text(json.dumps(self._state, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except Exception as e:
+            log.warning("Failed to save feed schedule: %s", e)
+
+
+class FeedStats:
+    """Counters and per-stage seconds for one feed in one run.
+
+    Plain attributes only: a parse worker fills one in and ships it back to
+    the main process together with the items.
+    """
+
+    def __init__(self):
+        self.status = "ok"  # ok | unchanged | error
+        self.error: Optional[str] = None
+        self.bytes = 0
+        self.seconds: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+
+    def add_time(self, stage: str, seconds: float) -> None:
+        self.seconds[stage] = self.seconds.get(stage, 0.0) + seconds
+
+    def incr(self, counter: str, n: int = 1) -> None:
+        if n:
+            self.counts[counter] = self.counts.get(counter, 0) + n
+
+    @contextmanager
+    def timed(self, stage: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(stage, time.perf_counter() - t0)
+
+    def merge(self, other: "FeedStats") -> None:
+        self.bytes += other.bytes
+        for stage, seconds in other.seconds.items():
+            self.add_time(stage, seconds)
+        for counter, n in other.counts.items():
+            self.incr(counter, n)
+
+    def as_dict(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {
+            "status": self.status,
+            "bytes": self.bytes,
+            "counts": dict(sorted(self.counts.items())),
+            "seconds": {k: round(v, 4) for k, v in sorted(self.seconds.items())},
+        }
+        if self.error:
+            out["error"] = self.error
+        return out
+
+
+class RunReport:
+    """Everything one run_cycle measured, per feed and in total.
+
+    Feed stages: host_wait (queued behind FETCH_PER_HOST), fetch (download),
+    parse (feedparser), dates (parse_date_to_utc), clean (strip_html /
+    best_content / best_image). Run stages: post, persist. Feed stage seconds
+    are summed over feeds, so with concurrent fetching they exceed wall time.
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self._t0 = time.perf_counter()
+        self.wall_seconds: Optional[float] = None
+        self.feeds: Dict[str, FeedStats] = {}
+        self.run = FeedStats()
+        self._feed_of_link: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def feed(self, feed_url: str) -> FeedStats:
+        with self._lock:
+            stats = self.feeds.get(feed_url)
+            if stats is None:
+                stats = self.feeds[feed_url] = FeedStats()
+            return stats
+
+    def record_new(self, feed_url: str, items: List[Dict[str, Any]]) -> None:
+        self.feed(feed_url).incr("new", len(items))
+        with self._lock:
+            for it in items:
+                self._feed_of_link[it["link"]] = feed_url
+
+    def record_posted(self, posted: List[str], failed: List[Tuple[str, str]]) -> None:
+        for link in posted:
+            self.feed(self._feed_of_link[link]).incr("posted")
+        for link, _ in failed:
+            self.feed(self._feed_of_link[link]).incr("post_failed")
+        self.run.incr("posted", len(posted))
+        self.run.incr("post_failed", len(failed))
+
+    def finish(self) -> None:
+        self.wall_seconds = time.perf_counter() - self._t0
+
+    def totals(self) -> FeedStats:
+        total = FeedStats()
+        for stats in self.feeds.values():
+            total.merge(stats)
+        return total
+
+    def as_dict(self) -> Dict[str, Any]:
+        total = self.totals()
+        statuses: Dict[str, int] = {}
+        for stats in self.feeds.values():
+            statuses[stats.status] = statuses.get(stats.status, 0) + 1
+        return {
+            "started_at": datetime.fromtimestamp(self.started, timezone.utc).isoformat(),
+            "wall_seconds": round(self.wall_seconds or 0.0, 3),
+            "concurrent_fetch": CONCURRENT_FETCH,
+            "parse_workers": PARSE_WORKERS,
+            "feeds": len(self.feeds),
+            "feed_status": statuses,
+            "bytes_downloaded": total.bytes,
+            "counts": dict(sorted(total.counts.items())),
+            "feed_stage_seconds": {k: round(v, 3) for k, v in sorted(total.seconds.items())},
+            "run_stage_seconds": {k: round(v, 3) for k, v in sorted(self.run.seconds.items())},
+            "per_feed": {url: stats.as_dict() for url, stats in sorted(self.feeds.items())},
+        }
+
+    def log_summary(self) -> None:
+        total = self.totals()
+        stages = ", ".join(f"{k} {v:.2f}s" for k, v in sorted(total.seconds.items()))
+        run_stages = ", ".join(f"{k} {v:.2f}s" for k, v in sorted(self.run.seconds.items()))
+        log.info("Run %.2fs: %d feeds, %.1f KiB downloaded; feed stages (summed): %s; %s",
+                 self.wall_seconds or 0.0, len(self.feeds), total.bytes / 1024, stages or "-", run_stages or "-")
+        log.info("Entries: %s", ", ".join(f"{k}={v}" for k, v in sorted(total.counts.items())) or "-")
+
+    def write(self, path: Path) -> None:
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        try:
+            tmp.write_text(json.dumps(self.as_dict(), ensure_ascii=False, indent=2), encoding="utf-8")
+            os.replace(tmp, path)
+        except Exception as e:
+            log.warning("Failed to write run report: %s", e)
 
 
 TAG_RE = re.compile(r"<[^>]+>")
@@ -195,66 +656,239 @@ def best_content(entry: Any) -> str:
     return ""
 
 
-def post_item(payload: Dict[str, Any]) -> Tuple[bool, str]:
-    headers = {"Content-Type": "application/json", "X-API-Key": API_KEY}
-    try:
-        resp = requests.post(API_URL, headers=headers, json=payload, timeout=REQUEST_TIMEOUT)
+def make_post_session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Content-Type": "application/json", "X-API-Key": API_KEY})
+    return session
+
+
+def _is_retryable(status_code: int) -> bool:
+    # Overload and gateway errors; a plain 500 is more likely a bad item than a blip
+    return status_code in (429, 502, 503, 504)
+
+
+# Rejections that name bad items: a smaller chunk can get the good ones through
+_SPLITTABLE_STATUSES = (400, 413, 422)
+
+
+class PostAborted(Exception):
+    """The API is unreachable, overloaded or refusing the key; later chunks would fail the same way."""
+
+
+def post_chunk(session: requests.Session, items: List[Dict[str, Any]]) -> Tuple[bool, int, str]:
+    """POST one chunk to the bulk endpoint, retrying transient failures with backoff.
+
+    Returns (ok, status, message). Raises PostAborted on transport errors and
+    429/502/503/504 once retries are spent, and on 401/403.
+    """
+    msg = ""
+    for attempt in range(POST_RETRIES + 1):
+        if attempt:
+            time.sleep(POST_BACKOFF * (2 ** (attempt - 1)))
+        try:
+            resp = session.post(BULK_API_URL, json={"items": items}, timeout=REQUEST_TIMEOUT)
+        except requests.RequestException as e:
+            msg = str(e)
+            continue
         if 200 <= resp.status_code < 300:
-            return True, str(resp.status_code)
+            return True, resp.status_code, str(resp.status_code)
+        try:
+            detail = resp.json()
+        except Exception:
+            detail = resp.text
+        msg = f"HTTP {resp.status_code}: {detail}"
+        if resp.status_code in (401, 403):
+            raise PostAborted(msg)
+        if not _is_retryable(resp.status_code):
+            return False, resp.status_code, msg
+    raise PostAborted(msg)
+
+
+def post_items(session: requests.Session, items: List[Dict[str, Any]]) -> Tuple[List[str], List[Tuple[str, str]]]:
+    """Post items in POST_BATCH_SIZE chunks; rejected chunks are bisected so only the bad items are dropped.
+
+    400/413/422 bisect down to the offending items. A 500 may be one poison
+    item too (an FK violation, an unexpected null), so the chunk is split
+    once: if a half goes through, the failing half is bisected further; if
+    both halves fail with 5xx the server is failing as a whole and posting
+    stops, as it does when the API is down or throttling (PostAborted).
+    Nothing more is sent that run: the remaining items are reported failed
+    and, never recorded as posted, are retried next cycle.
+
+    Returns (posted links, [(failed link, message)]).
+    """
+    posted: List[str] = []
+    failed: List[Tuple[str, str]] = []
+
+    def _handle(chunk: List[Dict[str, Any]], ok: bool, status: int, msg: str) -> None:
+        if ok:
+            posted.extend(it["link"] for it in chunk)
+        elif len(chunk) > 1 and status in _SPLITTABLE_STATUSES:
+            mid = len(chunk) // 2
+            _send(chunk[:mid])
+            _send(chunk[mid:])
+        elif len(chunk) > 1 and status >= 500:
+            mid = len(chunk) // 2
+            halves = [chunk[:mid], chunk[mid:]]
+            results = [post_chunk(session, half) for half in halves]
+            if all(not half_ok and half_status >= 500 for half_ok, half_status, _ in results):
+                raise PostAborted(msg)
+            for half, result in zip(halves, results):
+                _handle(half, *result)
         else:
-            try:
-                detail = resp.json()
-            except Exception:
-                detail = resp.text
-            return False, f"HTTP {resp.status_code}: {detail}"
-    except requests.RequestException as e:
-        return False, str(e)
+            failed.extend((it["link"], msg) for it in chunk)
+
+    def _send(chunk: List[Dict[str, Any]]) -> None:
+        _handle(chunk, *post_chunk(session, chunk))
+
+    try:
+        for start in range(0, len(items), max(1, POST_BATCH_SIZE)):
+            _send(items[start:start + POST_BATCH_SIZE])
+    except PostAborted as e:
+        done = set(posted) | {link for link, _ in failed}
+        msg = f"not sent, posting stopped: {e}"
+        failed.extend((it["link"], msg) for it in items if it["link"] not in done)
+        log.warning("Posting stopped for this run: %s", e)
+    return posted, failed
+
+
+# -----------------------
+# FETCHING
+# -----------------------
+class HostLimiter:
+    """Caps the number of concurrent requests per host."""
+
+    def __init__(self, per_host: int):
+        self.per_host = max(1, per_host)
+        self._lock = threading.Lock()
+        self._sems: Dict[str, threading.BoundedSemaphore] = {}
+
+    def for_url(self, url: str) -> threading.BoundedSemaphore:
+        host = (urlparse(url).hostname or "").lower()
+        with self._lock:
+            sem = self._sems.get(host)
+            if sem is None:
+                sem = self._sems[host] = threading.BoundedSemaphore(self.per_host)
+            return sem
+
+
+def make_fetch_session(pool_size: int) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"User-Agent": USER_AGENT})
+    return session
+
+
+def fetch_feed(session: requests.Session, feed_url: str, validators: Optional[Dict[str, str]] = None,
+               timeout: float = FEED_TIMEOUT, stats: Optional[FeedStats] = None) -> Tuple[Optional[bytes], Dict[str, str]]:
+    """Conditionally download a feed body, enforcing `timeout` over the whole transfer.
+
+    Returns (None, validators) when the server answers 304 or the body hash is
+    unchanged; otherwise (body, headers) where headers carry the new validators.
+    """
+    validators = validators or {}
+    req_headers = {}
+    if validators.get("etag"):
+        req_headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        req_headers["If-Modified-Since"] = validators["last_modified"]
+
+    deadline = time.monotonic() + timeout
+    with session.get(feed_url, headers=req_headers, timeout=timeout, stream=True) as resp:
+        if resp.status_code == 304:
+            return None, validators
+        resp.raise_for_status()
+        chunks: List[bytes] = []
+        for chunk in resp.iter_content(chunk_size=64 * 1024):
+            chunks.append(chunk)
+            if stats is not None:
+                stats.bytes += len(chunk)
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"feed download exceeded {timeout}s")
+        raw = b"".join(chunks)
+        headers = {
+            "content-type": resp.headers.get("Content-Type", ""),
+            "content-location": resp.url,
+            "etag": resp.headers.get("ETag", ""),
+            "last_modified": resp.headers.get("Last-Modified", ""),
+            "sha256": hashlib.sha256(raw).hexdigest(),
+        }
+        if validators.get("sha256") == headers["sha256"]:
+            return None, headers
+        return raw, headers
+
+
+def feed_validators(headers: Dict[str, str]) -> Dict[str, str]:
+    return {k: headers[k] for k in ("etag", "last_modified", "sha256") if headers.get(k)}
 
 
 # -----------------------
 # MAIN LOGIC
 # -----------------------
-def process_feed(feed_url: str, category_id: int, agency_id: int, now_utc: datetime,
-                 posted_cache: set) -> List[Dict[str, Any]]:
-    out: List[Dict[str, Any]] = []
-    parsed = feedparser.parse(feed_url)
+def parse_feed(source: Any, feed_url: str, response_headers: Optional[Dict[str, str]] = None) -> Tuple[Any, Optional[str]]:
+    """Run feedparser and return (parsed, warning); harmless charset overrides yield no warning."""
+    parsed = feedparser.parse(source, response_headers=response_headers)
+    warning = None
     if parsed.bozo and parsed.bozo_exception:
         # Silence harmless charset warnings like: document declared as us-ascii, but parsed as utf-8
         if isinstance(parsed.bozo_exception, CharacterEncodingOverride):
             log.debug("Ignored charset override warning for %s", feed_url)
         else:
-            log.warning("Feed parse warning for %s: %s", feed_url, parsed.bozo_exception)
+            warning = str(parsed.bozo_exception)
+    return parsed, warning
+
 
+def extract_items(parsed: Any, category_id: int, agency_id: int, now_utc: datetime, since: datetime,
+                  posted_cache: Any, stats: Optional[FeedStats] = None) -> List[Dict[str, Any]]:
+    out: List[Dict[str, Any]] = []
+    stats = stats if stats is not None else FeedStats()
     entries = parsed.entries[:MAX_ITEMS_PER_FEED]
-    one_hour_ago = now_utc - timedelta(hours=1)
+    stats.incr("entries", len(entries))
+    stats.incr("over_limit", len(parsed.entries) - len(entries))
+    perf = time.perf_counter
+    date_seconds = clean_seconds = 0.0
 
     for e in entries:
         link = (getattr(e, "link", None) or "").strip()
         if not link:
+            stats.incr("no_link")
             continue
         try:
             _ = urlparse(link)
         except Exception:
+            stats.incr("no_link")
             continue
 
         if link in posted_cache:
+            stats.incr("already_seen")
             continue
 
+        t0 = perf()
         dt_utc = None
         for key in ("published", "updated", "pubDate", "dc_date"):
             if key in e:
                 dt_utc = parse_date_to_utc(getattr(e, key))
                 if dt_utc:
                     break
+        date_seconds += perf() - t0
         if not dt_utc:
+            stats.incr("no_date")
             continue
 
-        if not (one_hour_ago <= dt_utc <= now_utc):
+        if not (since <= dt_utc <= now_utc):
+            stats.incr("out_of_window")
             continue
 
+        t0 = perf()
         title = strip_html(getattr(e, "title", "") or "").strip()
         content = best_content(e)
         image_url = best_image(e)
+        clean_seconds += perf() - t0
 
         payload = {
             "title": title[:512],
@@ -267,47 +901,276 @@ def process_feed(feed_url: str, category_id: int, agency_id: int, now_utc: datet
             "link": link,
         }
         out.append(payload)
+    stats.add_time("dates", date_seconds)
+    stats.add_time("clean", clean_seconds)
     return out
 
 
-def main() -> None:
-    now_utc = datetime.now(timezone.utc)
-    posted_cache = load_cache()
-    to_post: List[Dict[str, Any]] = []
+def parse_and_extract(raw: bytes, headers: Dict[str, str], feed_url: str, category_id: int, agency_id: int,
+                      now_utc: datetime, since: datetime) -> Tuple[List[Dict[str, Any]], Optional[str], FeedStats]:
+    """Parse-pool entry point: takes the raw body, returns plain payload dicts.
+
+    The seen-link filter is applied by the caller so the cache never has to be
+    shipped to worker processes. The returned FeedStats covers parse, dates
+    and clean.
+    """
+    stats = FeedStats()
+    with stats.timed("parse"):
+        parsed, warning = parse_feed(raw, feed_url, headers)
+    return extract_items(parsed, category_id, agency_id, now_utc, since, set(), stats), warning, stats
+
+
+def filter_seen(items: List[Dict[str, Any]], posted_cache: Any, stats: FeedStats) -> List[Dict[str, Any]]:
+    fresh = [it for it in items if it["link"] not in posted_cache]
+    stats.incr("already_seen", len(items) - len(fresh))
+    return fresh
+
 
+def process_feed(session: requests.Session, store: FeedValidatorStore, feed_url: str, category_id: int,
+                 agency_id: int, now_utc: datetime, since: datetime, posted_cache: SeenLinkStore,
+                 stats: Optional[FeedStats] = None) -> Optional[List[Dict[str, Any]]]:
+    """Fetch, parse and filter one feed; returns None when the feed is unchanged."""
+    stats = stats if stats is not None else FeedStats()
+    with stats.timed("fetch"):
+        raw, headers = fetch_feed(session, feed_url, store.get(feed_url), stats=stats)
+    if raw is None:
+        stats.status = "unchanged"
+        store.stage(feed_url, feed_validators(headers), [])
+        return None
+    items, warning, parse_stats = parse_and_extract(raw, headers, feed_url, category_id, agency_id, now_utc, since)
+    stats.merge(parse_stats)
+    if warning:
+        log.warning("Feed parse warning for %s: %s", feed_url, warning)
+    items = filter_seen(items, posted_cache, stats)
+    store.stage(feed_url, feed_validators(headers), [it["link"] for it in items])
+    return items
+
+
+def iter_feeds():
     for cat in CATEGORIES:
         cid = int(cat["category_id"])
         for src in cat["links"]:
-            url = src["link"]
-            aid = int(src["agent_id"])
+            yield src["link"], cid, int(src["agent_id"])
+
+
+def collect_sequential(now_utc: datetime, posted_cache: SeenLinkStore, store: FeedValidatorStore,
+                       schedule: FeedSchedule, feeds: Optional[List[Tuple[str, int, int]]] = None,
+                       report: Optional[RunReport] = None) -> List[Dict[str, Any]]:
+    report = report if report is not None else RunReport()
+    to_post: List[Dict[str, Any]] = []
+    session = make_fetch_session(1)
+    try:
+        for url, cid, aid in feeds if feeds is not None else iter_feeds():
+            stats = report.feed(url)
             try:
-                items = process_feed(url, cid, aid, now_utc, posted_cache)
+                since = schedule.window_start(url, now_utc)
+                items = process_feed(session, store, url, cid, aid, now_utc, since, posted_cache, stats)
+                schedule.observe(url, items or [], time.time())
+                if items is None:
+                    log.debug("Feed %s unchanged", url)
+                    continue
                 if items:
                     log.info("Feed %s -> %d new item(s)", url, len(items))
+                report.record_new(url, items)
                 to_post.extend(items)
             except Exception as e:
+                stats.status, stats.error = "error", str(e)
+                schedule.failed(url, time.time())
                 log.error("Failed processing %s: %s", url, e)
+    finally:
+        session.close()
+    return to_post
+
+
+def collect_concurrent(now_utc: datetime, posted_cache: SeenLinkStore, store: FeedValidatorStore,
+                       schedule: FeedSchedule, feeds: Optional[List[Tuple[str, int, int]]] = None,
+                       parse_pool: Optional[ProcessPoolExecutor] = None,
+                       report: Optional[RunReport] = None) -> List[Dict[str, Any]]:
+    """Download all feeds in parallel and pipe each body into the parse pool as it lands.
+
+    Wall time is bounded by the slowest feed (capped by FEED_TIMEOUT) rather than
+    the sum of all feeds. A caller-owned `parse_pool` is reused and left running.
+    """
+    report = report if report is not None else RunReport()
+    session = make_fetch_session(FETCH_CONCURRENCY)
+    limiter = HostLimiter(FETCH_PER_HOST)
+
+    def _download(url: str) -> Tuple[Optional[bytes], Dict[str, str]]:
+        stats = report.feed(url)
+        t0 = time.perf_counter()
+        with limiter.for_url(url):
+            stats.add_time("host_wait", time.perf_counter() - t0)
+            with stats.timed("fetch"):
+                return fetch_feed(session, url, store.get(url), stats=stats)
+
+    to_post: List[Dict[str, Any]] = []
+
+    validators: Dict[str, Dict[str, str]] = {}
+
+    def _accept(url: str, items: List[Dict[str, Any]], warning: Optional[str], parse_stats: FeedStats) -> None:
+        stats = report.feed(url)
+        stats.merge(parse_stats)
+        if warning:
+            log.warning("Feed parse warning for %s: %s", url, warning)
+        items = filter_seen(items, posted_cache, stats)
+        store.stage(url, validators[url], [it["link"] for it in items])
+        schedule.observe(url, items, time.time())
+        if items:
+            log.info("Feed %s -> %d new item(s)", url, len(items))
+        report.record_new(url, items)
+        to_post.extend(items)
+
+    def _failed(url: str, e: Exception) -> None:
+        stats = report.feed(url)
+        stats.status, stats.error = "error", str(e)
+        schedule.failed(url, time.time())
+        log.error("Failed processing %s: %s", url, e)
+
+    owns_pool = parse_pool is None and PARSE_WORKERS > 0
+    if owns_pool:
+        parse_pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS)
+    try:
+        parses: Dict[Future, str] = {}
+        with ThreadPoolExecutor(max_workers=FETCH_CONCURRENCY, thread_name_prefix="feed") as fetch_pool:
+            downloads: Dict[Future, Tuple[str, int, int]] = {
+                fetch_pool.submit(_download, url): (url, cid, aid)
+                for url, cid, aid in (feeds if feeds is not None else iter_feeds())
+            }
+            for fut in as_completed(downloads):
+                url, cid, aid = downloads[fut]
+                try:
+                    raw, headers = fut.result()
+                    if raw is None:
+                        report.feed(url).status = "unchanged"
+                        store.stage(url, feed_validators(headers), [])
+                        schedule.observe(url, [], time.time())
+                        log.debug("Feed %s unchanged", url)
+                        continue
+                    validators[url] = feed_validators(headers)
+                    since = schedule.window_start(url, now_utc)
+                    if parse_pool is not None:
+                        parses[parse_pool.submit(parse_and_extract, raw, headers, url, cid, aid, now_utc, since)] = url
+                    else:
+                        _accept(url, *parse_and_extract(raw, headers, url, cid, aid, now_utc, since))
+                except Exception as e:
+                    _failed(url, e)
+
+        for fut in as_completed(parses):
+            url = parses[fut]
+            try:
+                _accept(url, *fut.result())
+            except Exception as e:
+                _failed(url, e)
+    finally:
+        if owns_pool:
+            parse_pool.shutdown()
+        session.close()
+    return to_post
+
+
+def run_cycle(posted_cache: SeenLinkStore, store: FeedValidatorStore, schedule: FeedSchedule,
+              feeds: Optional[List[Tuple[str, int, int]]] = None,
+              parse_pool: Optional[ProcessPoolExecutor] = None,
+              report_path: Optional[Path] = RUN_REPORT_FILE) -> RunReport:
+    """Poll `feeds` (default: all), post what's new and persist every store."""
+    report = RunReport()
+    now_utc = datetime.now(timezone.utc)
+    if CONCURRENT_FETCH:
+        to_post = collect_concurrent(now_utc, posted_cache, store, schedule, feeds, parse_pool, report)
+    else:
+        to_post = collect_sequential(now_utc, posted_cache, store, schedule, feeds, report)
 
     dedup_by_link: Dict[str, Dict[str, Any]] = {}
     for item in to_post:
         dedup_by_link[item["link"]] = item
 
-    posted = 0
-    for link, payload in dedup_by_link.items():
-        ok, msg = post_item(payload)
-        if ok:
-            posted += 1
+    posted_links: List[str] = []
+    if dedup_by_link:
+        session = make_post_session()
+        try:
+            with report.run.timed("post"):
+                posted_links, failed = post_items(session, list(dedup_by_link.values()))
+        finally:
+            session.close()
+        report.record_posted(posted_links, failed)
+        for link in posted_links:
             posted_cache.add(link)
             log.info("Posted ✅ %s", link)
-            time.sleep(0.2)
-        else:
+        for link, msg in failed:
             log.warning("Post failed ❌ %s -> %s", link, msg)
 
-    save_cache(posted_cache)
-    log.info("Done. Posted %d/%d new items.", posted, len(dedup_by_link))
+    with report.run.timed("persist"):
+        posted_cache.flush()
+        # Without this a --daemon run would only ever grow the store
+        posted_cache.expire()
+        store.commit_posted(posted_cache)
+        store.save()
+        schedule.commit_posted(posted_cache)
+        schedule.save()
+    report.finish()
+    log.info("Done. Posted %d/%d new items.", len(posted_links), len(dedup_by_link))
+    report.log_summary()
+    if report_path is not None:
+        report.write(report_path)
+    return report
 
 
-if __name__ == "__main__":
-    main()
+def run_daemon(posted_cache: SeenLinkStore, store: FeedValidatorStore, schedule: FeedSchedule,
+               report_path: Optional[Path] = RUN_REPORT_FILE) -> None:
+    """Poll each feed when its own interval comes due, until interrupted."""
+    feeds = list(iter_feeds())
+    parse_pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS) if PARSE_WORKERS > 0 else None
+    log.info("Daemon started: %d feeds", len(feeds))
+    try:
+        while True:
+            due = schedule.due(feeds, time.time())
+            if due:
+                log.info("Polling %d due feed(s)", len(due))
+                run_cycle(posted_cache, store, schedule, due, parse_pool, report_path)
+            time.sleep(max(1.0, schedule.seconds_until_due(feeds, time.time())))
+    except KeyboardInterrupt:
+        log.info("Daemon stopped")
+    finally:
+        if parse_pool is not None:
+            parse_pool.shutdown()
 
 
+def main() -> None:
+    global CONCURRENT_FETCH, PARSE_WORKERS
+
+    ap = argparse.ArgumentParser(description="Pull RSS feeds and post new items to the news API")
+    ap.add_argument("--daemon", action="store_true", help="keep running, polling each feed on its own adaptive interval")
+    ap.add_argument("--report", metavar="PATH", type=Path, default=RUN_REPORT_FILE,
+                    help=f"write the JSON run report here (default: {RUN_REPORT_FILE})")
+    ap.add_argument("--profile", metavar="PATH",
+                    help="run under cProfile, sequentially and with inline parsing so every stage is "
+                         "visible to the profiler; dump pstats to PATH and log the top functions")
+    args = ap.parse_args()
+
+    posted_cache = SeenLinkStore(SEEN_LOG_FILE)
+    store = FeedValidatorStore(FEED_STATE_FILE)
+    schedule = FeedSchedule(FEED_SCHEDULE_FILE)
+
+    profiler = None
+    if args.profile:
+        # cProfile only sees the thread that enabled it, not fetch threads or parse workers
+        CONCURRENT_FETCH = False
+        PARSE_WORKERS = 0
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        if args.daemon:
+            run_daemon(posted_cache, store, schedule, args.report)
+        else:
+            run_cycle(posted_cache, store, schedule, report_path=args.report)
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+            out = io.StringIO()
+            pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(30)
+            log.info("Profile written to %s\n%s", args.profile, out.getvalue())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import pytest
+import requests
+
+import news_fetch
+from news_fetch import post_items
+
+
+class FakeResponse:
+    def __init__(self, status_code: int):
+        self.status_code = status_code
+        self.text = ""
+
+    def json(self):
+        return {"detail": self.status_code}
+
+
+class FakeSession:
+    """Answers each bulk POST with handler(items); records the chunk sizes."""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.chunks = []
+
+    def post(self, url, json, timeout):
+        self.chunks.append(len(json["items"]))
+        return self.handler(json["items"])
+
+
+def items(n: int):
+    return [{"link": f"https://example.com/{i}"} for i in range(n)]
+
+
+@pytest.fixture(autouse=True)
+def fast_posting(monkeypatch):
+    monkeypatch.setattr(news_fetch, "POST_BACKOFF", 0)
+    monkeypatch.setattr(news_fetch, "POST_BATCH_SIZE", 50)
+
+
+def test_rejected_chunk_is_bisected_down_to_the_bad_item():
+    bad = "https://example.com/7"
+    session = FakeSession(lambda chunk: FakeResponse(422 if any(it["link"] == bad for it in chunk) else 200))
+    posted, failed = post_items(session, items(120))
+    assert len(posted) == 119 and bad not in posted
+    assert [link for link, _ in failed] == [bad]
+
+
+@pytest.mark.parametrize("status", [429, 502, 503, 504])
+def test_outage_stops_posting_without_bisecting(status):
+    session = FakeSession(lambda chunk: FakeResponse(status))
+    posted, failed = post_items(session, items(120))
+    assert posted == []
+    assert len(failed) == 120
+    # First chunk only, with its retries, all at full size
+    assert session.chunks == [50] * (news_fetch.POST_RETRIES + 1)
+
+
+def test_server_error_on_one_item_is_isolated():
+    bad = "https://example.com/7"
+    session = FakeSession(lambda chunk: FakeResponse(500 if any(it["link"] == bad for it in chunk) else 200))
+    posted, failed = post_items(session, items(120))
+    assert len(posted) == 119
+    assert [link for link, _ in failed] == [bad]
+
+
+def test_server_error_on_every_chunk_stops_after_one_split():
+    session = FakeSession(lambda chunk: FakeResponse(500))
+    posted, failed = post_items(session, items(120))
+    assert posted == [] and len(failed) == 120
+    assert session.chunks == [50, 25, 25]
+
+
+def test_connection_error_keeps_what_was_posted():
+    calls = []
+
+    def handler(chunk):
+        calls.append(chunk)
+        if len(calls) > 1:
+            raise requests.ConnectionError("refused")
+        return FakeResponse(200)
+
+    posted, failed = post_items(FakeSession(handler), items(120))
+    assert len(posted) == 50
+    assert len(failed) == 70
+    assert all("posting stopped" in msg for _, msg in failed)
+
+
+def test_rejected_api_key_is_not_retried():
+    session = FakeSession(lambda chunk: FakeResponse(403))
+    posted, failed = post_items(session, items(120))
+    assert posted == [] and len(failed) == 120
+    assert session.chunks == [50]
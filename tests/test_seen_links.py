@@ -0,0 +1,57 @@
+from datetime import timedelta
+
+import pytest
+
+import news_fetch
+from news_fetch import SeenLinkStore
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_700_000_000.0]
+    monkeypatch.setattr(news_fetch.time, "time", lambda: now[0])
+    return now
+
+
+def open_store(path, ttl_seconds: int = 100) -> SeenLinkStore:
+    return SeenLinkStore(path, ttl=timedelta(seconds=ttl_seconds), bloom_bits=1 << 12, legacy_path=None)
+
+
+def test_seen_links_survive_a_reload(tmp_path, clock):
+    store = open_store(tmp_path / "seen.log")
+    store.add("a")
+    store.flush()
+    assert "a" in open_store(tmp_path / "seen.log")
+
+
+def test_links_past_the_ttl_are_forgotten_on_load(tmp_path, clock):
+    store = open_store(tmp_path / "seen.log")
+    store.add("old")
+    store.flush()
+    clock[0] += 101
+    assert "old" not in store
+    assert len(open_store(tmp_path / "seen.log")) == 0
+
+
+def test_expire_drops_links_and_compacts_the_log(tmp_path, clock):
+    path = tmp_path / "seen.log"
+    store = open_store(path)
+    for i in range(50):
+        store.add(f"old{i}")
+    store.flush()
+    clock[0] += 101
+    store.add("new")
+    store.flush()
+
+    assert store.expire() == 50
+    assert len(store) == 1
+    assert "new" in store and "old0" not in store
+    assert path.read_text().splitlines() == [f"{clock[0]:.0f}\tnew"]
+
+
+def test_torn_last_line_is_dropped(tmp_path, clock):
+    path = tmp_path / "seen.log"
+    path.write_text(f"{clock[0]:.0f}\ta\n{clock[0]:.0f}\tb")
+    store = open_store(path)
+    assert "a" in store and "b" not in store
+    assert path.read_text().endswith("\n")